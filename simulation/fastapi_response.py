@@ -1,4 +1,21 @@
-from fastapi.responses import JSONResponse
+import asyncio
+import contextlib
+import io
+import os
+
+import orjson
+
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+# Import utils
+from utils.aio import run_blocking
+from utils.helpers.other import to_http_date
+
+# S3 bodies are read in large chunks, so a download costs few
+# executor round trips
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", str(1024 * 1024)))
+# Comment sent on idle event streams, so proxies don't close them
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
 
 
 def json_response(lambda_response: dict):
@@ -8,10 +25,134 @@ def json_response(lambda_response: dict):
         lambda_response (dict): response object from lambda
 
     Returns:
-        JSONResponse: json response from fastapi
+        Response: json response from fastapi
     """
+    body = lambda_response.get("body")
+
+    # Body created by ResponseBuilder is serialized already, send it as is
+    if isinstance(body, (bytes, str)):
+        return Response(
+            content=body,
+            status_code=lambda_response.get("statusCode"),
+            headers=lambda_response.get("headers"),
+            media_type="application/json",
+        )
+
     return JSONResponse(
-        content=lambda_response.get("body"),
+        content=body,
         status_code=lambda_response.get("statusCode"),
         headers=lambda_response.get("headers"),
     )
+
+
+async def iter_s3_body(body, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Iterate body of an S3 object. Blocking reads run on the AWS I/O
+    executor, chunks are forwarded as they are read.
+
+    Args:
+        body (StreamingBody | BinaryIO): body of S3 object
+        chunk_size (int, optional): size of a chunk. Defaults to STREAM_CHUNK_SIZE.
+    """
+    try:
+        # Body from cache is in memory already, there is nothing to wait for
+        if isinstance(body, io.BytesIO):
+            yield body.getvalue()
+            return
+
+        while True:
+            chunk = await run_blocking(body.read, chunk_size)
+
+            if not chunk:
+                break
+
+            yield chunk
+    finally:
+        body.close()
+
+
+def s3_object_response(s3_response: dict):
+    """Generate fastapi streaming response from response of S3 get_object.
+    Partial content (ranged get) is answered with 206.
+
+    Args:
+        s3_response (dict): response of S3 get_object
+
+    Returns:
+        StreamingResponse: streaming response from fastapi
+    """
+    headers = {"Accept-Ranges": "bytes"}
+
+    if s3_response.get("ContentLength") is not None:
+        headers["Content-Length"] = str(s3_response["ContentLength"])
+    if s3_response.get("ETag"):
+        headers["ETag"] = s3_response["ETag"]
+    if s3_response.get("LastModified"):
+        headers["Last-Modified"] = to_http_date(s3_response["LastModified"])
+    if s3_response.get("ContentRange"):
+        headers["Content-Range"] = s3_response["ContentRange"]
+
+    return StreamingResponse(
+        iter_s3_body(s3_response["Body"]),
+        status_code=206 if s3_response.get("ContentRange") else 200,
+        headers=headers,
+        media_type=s3_response.get("ContentType") or "application/octet-stream",
+    )
+
+
+async def iter_events(events, heartbeat: float = SSE_HEARTBEAT_SECONDS):
+    """Format events as Server-Sent Events, with a heartbeat comment when no
+    event was sent for `heartbeat` seconds
+
+    Args:
+        events (AsyncIterator[tuple]): (id, name, data) of events, data is
+            serialized as json
+        heartbeat (float, optional): seconds between heartbeats. Defaults to SSE_HEARTBEAT_SECONDS.
+    """
+    iterator = aiter(events)
+    next_event = asyncio.ensure_future(anext(iterator))
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_event}, timeout=heartbeat)
+
+            if not done:
+                yield b": heartbeat\n\n"
+                continue
+
+            try:
+                event_id, name, data = next_event.result()
+            except StopAsyncIteration:
+                break
+
+            yield (
+                f"id: {event_id}\nevent: {name}\n".encode("utf-8")
+                + b"data: "
+                + orjson.dumps(data)
+                + b"\n\n"
+            )
+            next_event = asyncio.ensure_future(anext(iterator))
+    finally:
+        # The pending anext must end before the generator can be closed
+        if not next_event.done():
+            next_event.cancel()
+
+            with contextlib.suppress(asyncio.CancelledError):
+                await next_event
+
+        await iterator.aclose()
+
+
+def event_stream_response(events):
+    """Generate fastapi Server-Sent Events response
+
+    Args:
+        events (AsyncIterator[tuple]): (id, name, data) of events
+
+    Returns:
+        StreamingResponse: text/event-stream response from fastapi
+    """
+    return StreamingResponse(
+        iter_events(events),
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        media_type="text/event-stream",
+    )
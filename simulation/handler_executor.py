@@ -44,8 +44,6 @@ async def execute_handler(handler_name: str, event: dict, context: dict):
         else:
             response = maybe_awaitable_response
 
-        response["body"] = json.loads(response["body"])
-
         return response
     except Exception as e:
         print(e, traceback.format_exc(), flush=True)
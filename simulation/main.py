@@ -1,8 +1,7 @@
 # Import built-in packages
-import json
 import sys
 import os
-from typing import Union, Annotated
+from typing import Union, Annotated, Literal
 
 # Import the ./packages to sys path, because we need python recognize
 # all of packages inside ./packages
@@ -12,14 +11,19 @@ sys.path.insert(0, os.path.join(BASE_DIR, "..", "src"))
 
 
 # Import external packages
+import orjson
 from fastapi import FastAPI, HTTPException, Request, Body, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 # Import helper
 from handler_executor import execute_handler
-from fastapi_response import json_response
+from fastapi_response import (
+    json_response,
+    s3_object_response,
+    event_stream_response,
+)
 from lambda_params import create_lambda_event, add_claims_to_request_ctx
 from openapi_config import create_custom_openapi_schema
 
@@ -39,25 +43,38 @@ from runtime.lambda_handlers import (
     list_rulesets,
     get_ruleset_info,
     activate_ruleset,
+    activate_rulesets,
     inactivate_ruleset,
     upload_ruleset,
     sign_in,
     refresh_tokens,
     list_etl_jobs,
+    list_etl_jobs_overview,
     list_etl_job_runs,
     get_etl_job,
     run_etl_job,
     get_job_run,
     update_inline_ruleset,
+    get_dashboard_summary,
 )
 
 # Import services
-from services.data_contract import get_datacontract
-from services.ruleset import get_ruleset
+from services.data_contract import get_datacontract, get_datacontract_url
+from services.ruleset import (
+    get_ruleset,
+    get_ruleset_url,
+    iter_activate_rulesets,
+    summarize_activations,
+)
 
 # Import utils
+import utils.exceptions as Exps
+from utils.helpers.other import convert_keys_to_camel_case
+from utils.aio import run_blocking
+from utils.response_builder import ResponseBuilder
 from utils.roles import Roles
 from utils.dc_state import DataContractState
+from utils.glue_watcher import get_job_run_watcher
 
 load_dotenv()
 
@@ -78,6 +95,10 @@ tags_metadata = [
         "name": "Auth",
         "description": "Các thao tác liên quan tới xác thực & uỷ quyền",
     },
+    {
+        "name": "Dashboard",
+        "description": "Các số liệu tổng hợp cho dashboard",
+    },
 ]
 
 app = FastAPI(
@@ -151,8 +172,6 @@ async def handle_sign_in(
 
     response = await sign_in.handler(create_lambda_event(data=body), {})
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -171,8 +190,6 @@ async def handle_refresh_token(
 
     response = await refresh_tokens.handler(create_lambda_event(data=body), {})
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -197,8 +214,6 @@ async def handle_generate_draft_datacontract(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -223,8 +238,6 @@ async def handle_upload_draft_datacontract(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -237,6 +250,11 @@ async def handle_list_datacontracts(
     state: str,
     limit: str = "10",
     startKey: str = "",
+    fields: str = "",
+    team: str = "",
+    owner: str = "",
+    since: str = "",
+    order: Literal["asc", "desc"] = "asc",
     claims: dict = authorization_dependency(Roles.Employee),
 ):
     # handler_name = "list_datacontracts"
@@ -247,14 +265,21 @@ async def handle_list_datacontracts(
 
     response = await list_datacontracts.handler(
         create_lambda_event(
-            query={"limit": limit, "start_key": startKey, "state": state},
+            query={
+                "limit": limit,
+                "start_key": startKey,
+                "state": state,
+                "fields": fields,
+                "team": team,
+                "owner": owner,
+                "since": since,
+                "order": order,
+            },
             request_context=add_claims_to_request_ctx({}, claims),
         ),
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -274,8 +299,6 @@ async def handle_get_datacontract_info(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -287,6 +310,9 @@ async def handle_get_datacontract_info(
 async def handle_get_datacontract(
     datacontract_name: str,
     state: str,
+    request: Request,
+    delivery: Literal["content", "url", "redirect"] = "content",
+    ttl: int | None = None,
     claims: dict = authorization_dependency(Roles.Employee),
 ):
     # handler_name = "get_datacontract"
@@ -297,15 +323,40 @@ async def handle_get_datacontract(
     #     {},
     # )
 
-    response = get_datacontract(
-        {
-            "path_params": {"name": datacontract_name},
-            "query": {"state": state},
-            "meta": {"claims": claims},
-        }
-    )
+    # Client downloads content from S3 directly with a presigned url
+    if delivery != "content":
+        try:
+            response = get_datacontract_url(
+                {
+                    "path_params": {"name": datacontract_name},
+                    "query": {"state": state, "ttl": ttl},
+                    "meta": {"claims": claims},
+                }
+            )
+        except Exps.AppException as error:
+            return json_response(ResponseBuilder().create_error_response(error))
+
+        if delivery == "redirect":
+            return RedirectResponse(response["url"], status_code=307)
+
+        return json_response(
+            ResponseBuilder(data=convert_keys_to_camel_case(response)).create_response()
+        )
+
+    try:
+        response = await run_blocking(
+            get_datacontract,
+            {
+                "path_params": {"name": datacontract_name},
+                "query": {"state": state},
+                "headers": dict(request.headers),
+                "meta": {"claims": claims},
+            },
+        )
+    except Exps.AppException as error:
+        return json_response(ResponseBuilder().create_error_response(error))
 
-    return StreamingResponse(response)
+    return s3_object_response(response)
 
 
 @app.post(
@@ -335,8 +386,6 @@ async def handle_approve_datacontract(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -367,8 +416,6 @@ async def handle_reject_datacontract(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -393,8 +440,6 @@ async def handle_generate_ruleset(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -421,8 +466,6 @@ async def handle_upload_ruleset(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -435,6 +478,11 @@ async def handle_list_rulesets(
     state: str,
     limit: str = "10",
     startKey: str = "",
+    fields: str = "",
+    team: str = "",
+    owner: str = "",
+    since: str = "",
+    order: Literal["asc", "desc"] = "asc",
     claims: dict = authorization_dependency(Roles.Employee),
 ):
     # handler_name = "list_rulesets"
@@ -445,14 +493,21 @@ async def handle_list_rulesets(
 
     response = list_rulesets.handler(
         create_lambda_event(
-            query={"limit": limit, "start_key": startKey, "state": state},
+            query={
+                "limit": limit,
+                "start_key": startKey,
+                "state": state,
+                "fields": fields,
+                "team": team,
+                "owner": owner,
+                "since": since,
+                "order": order,
+            },
             request_context=add_claims_to_request_ctx({}, claims),
         ),
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -479,8 +534,6 @@ async def handle_get_ruleset_info(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -492,6 +545,9 @@ async def handle_get_ruleset_info(
 async def handle_get_ruleset(
     ruleset_name: str,
     state: str,
+    request: Request,
+    delivery: Literal["content", "url", "redirect"] = "content",
+    ttl: int | None = None,
     claims: dict = authorization_dependency(Roles.Employee),
 ):
     # handler_name = "get_datacontract"
@@ -502,15 +558,40 @@ async def handle_get_ruleset(
     #     {},
     # )
 
-    response = get_ruleset(
-        {
-            "path_params": {"name": ruleset_name},
-            "query": {"state": state},
-            "meta": {"claims": claims},
-        }
-    )
+    # Client downloads content from S3 directly with a presigned url
+    if delivery != "content":
+        try:
+            response = get_ruleset_url(
+                {
+                    "path_params": {"name": ruleset_name},
+                    "query": {"state": state, "ttl": ttl},
+                    "meta": {"claims": claims},
+                }
+            )
+        except Exps.AppException as error:
+            return json_response(ResponseBuilder().create_error_response(error))
+
+        if delivery == "redirect":
+            return RedirectResponse(response["url"], status_code=307)
+
+        return json_response(
+            ResponseBuilder(data=convert_keys_to_camel_case(response)).create_response()
+        )
 
-    return StreamingResponse(response)
+    try:
+        response = await run_blocking(
+            get_ruleset,
+            {
+                "path_params": {"name": ruleset_name},
+                "query": {"state": state},
+                "headers": dict(request.headers),
+                "meta": {"claims": claims},
+            },
+        )
+    except Exps.AppException as error:
+        return json_response(ResponseBuilder().create_error_response(error))
+
+    return s3_object_response(response)
 
 
 @app.post(
@@ -550,11 +631,61 @@ async def handle_activate_ruleset(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
+@app.post("/rulesets/activations", tags=["Ruleset"])
+async def handle_activate_rulesets(
+    body: Annotated[
+        dict,
+        Body(
+            example={
+                "activations": [
+                    {
+                        "jobName": "string",
+                        "rulesetName": "string",
+                        "version": "string",
+                        "currentActiveRulesetName": "string",
+                        "currentActiveRulesetVersion": "string",
+                    }
+                ],
+                "concurrency": 4,
+            }
+        ),
+    ],
+    stream: bool = False,
+    claims: dict = authorization_dependency(Roles.Employee),
+):
+    if not stream:
+        response = await activate_rulesets.handler(
+            create_lambda_event(
+                data=body,
+                request_context=add_claims_to_request_ctx({}, claims),
+            ),
+            {},
+        )
+
+        return json_response(response)
+
+    # Progress of every job is sent as soon as its activation ends
+    async def events():
+        results = []
+
+        try:
+            async for outcome in iter_activate_rulesets(
+                {"body": body, "meta": {"claims": claims}}
+            ):
+                results.append(outcome)
+                yield len(results), "progress", outcome
+        except Exps.AppException as error:
+            yield len(results) + 1, "error", error.to_plain()
+            return
+
+        yield len(results) + 1, "summary", summarize_activations(results)
+
+    return event_stream_response(events())
+
+
 @app.post(
     "/rulesets/{ruleset_name}/inactivation",
     tags=["Ruleset"],
@@ -573,7 +704,7 @@ async def handle_inactivate_ruleset(
     #     {},
     # )
 
-    response = inactivate_ruleset.handler(
+    response = await inactivate_ruleset.handler(
         create_lambda_event(
             params={"ruleset_name": ruleset_name},
             data=body,
@@ -582,8 +713,6 @@ async def handle_inactivate_ruleset(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -591,17 +720,40 @@ async def handle_inactivate_ruleset(
 async def handle_list_jobs(
     limit: str = "10",
     next_token: str | None = None,
+    refresh: bool = False,
     claims: dict = authorization_dependency(Roles.Employee),
 ):
     response = await list_etl_jobs.handler(
         create_lambda_event(
-            query={"limit": limit, "next_token": next_token},
+            query={
+                "limit": limit,
+                "next_token": next_token,
+                "refresh": str(refresh).lower(),
+            },
             request_context=add_claims_to_request_ctx({}, claims),
         ),
         {},
     )
 
-    response["body"] = json.loads(response["body"])
+    return json_response(response)
+
+
+@app.get("/glue-jobs/overview", tags=["Glue ETL Job"])
+async def handle_list_jobs_overview(
+    limit: str = "10",
+    next_token: str | None = None,
+    job_names: str | None = None,
+    claims: dict = authorization_dependency(Roles.Employee),
+):
+    # Declared before /glue-jobs/{job_name}, otherwise "overview" is taken
+    # as a job name
+    response = await list_etl_jobs_overview.handler(
+        create_lambda_event(
+            query={"limit": limit, "next_token": next_token, "job_names": job_names},
+            request_context=add_claims_to_request_ctx({}, claims),
+        ),
+        {},
+    )
 
     return json_response(response)
 
@@ -611,7 +763,9 @@ async def handle_list_jobs(
     tags=["Glue ETL Job"],
 )
 async def handle_get_glue_job(
-    job_name: str, claims: dict = authorization_dependency(Roles.Employee)
+    job_name: str,
+    refresh: bool = False,
+    claims: dict = authorization_dependency(Roles.Employee),
 ):
     # handler_name = "get_ruleset"
 
@@ -622,13 +776,12 @@ async def handle_get_glue_job(
     response = await get_etl_job.handler(
         create_lambda_event(
             params={"job_name": job_name},
+            query={"refresh": str(refresh).lower()},
             request_context=add_claims_to_request_ctx({}, claims),
         ),
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -656,7 +809,11 @@ async def handle_start_run_glue_job(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
+    # The run is polled from now on, its first watcher gets its state
+    # without waiting for a cold poll
+    if response.get("statusCode") == 200:
+        job_run_id = orjson.loads(response.get("body"))["data"]["jobRunId"]
+        get_job_run_watcher().track(job_name, job_run_id)
 
     return json_response(response)
 
@@ -685,8 +842,6 @@ async def handle_update_inline_ruleset_in_job(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -706,8 +861,6 @@ async def handle_get_job_runs(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
-
     return json_response(response)
 
 
@@ -734,7 +887,60 @@ async def handle_get_job_run(
         {},
     )
 
-    response["body"] = json.loads(response["body"])
+    return json_response(response)
+
+
+@app.get(
+    "/glue-jobs/{job_name}/run-status/{job_run_id}/watch",
+    tags=["Glue ETL Job"],
+)
+async def handle_watch_job_run(
+    job_name: str,
+    job_run_id: str,
+    mode: Literal["sse", "long-poll"] = "sse",
+    version: int = 0,
+    timeout: float = 25,
+    claims: dict = authorization_dependency(Roles.Employee),
+):
+    # Every client of a run shares one poll loop of the watcher, Glue is
+    # polled once whatever the number of dashboards open on the run
+    watcher = get_job_run_watcher()
+
+    if mode == "long-poll":
+        try:
+            version, job_run = await watcher.wait_for_change(
+                job_name, job_run_id, since_version=version, timeout=min(timeout, 60)
+            )
+        except Exps.AppException as error:
+            return json_response(ResponseBuilder().create_error_response(error))
+
+        rb = ResponseBuilder(data=job_run)
+        rb.set_metadata({"version": version})
+
+        return json_response(rb.create_response())
+
+    async def events():
+        seen = 0
+
+        try:
+            async for seen, job_run in watcher.watch(job_name, job_run_id):
+                yield seen, "state", job_run
+        except Exps.AppException as error:
+            yield seen, "error", error.to_plain()
+        except Exception as error:
+            yield seen, "error", Exps.UnknownException(str(error)).to_plain()
+
+    return event_stream_response(events())
+
+
+@app.get("/dashboard/summary", tags=["Dashboard"])
+async def handle_get_dashboard_summary(
+    claims: dict = authorization_dependency(Roles.Employee),
+):
+    response = await get_dashboard_summary.handler(
+        create_lambda_event(request_context=add_claims_to_request_ctx({}, claims)),
+        {},
+    )
 
     return json_response(response)
 
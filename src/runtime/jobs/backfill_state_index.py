@@ -0,0 +1,60 @@
+# Back-fill team_state / owner_state of existing items of mapping tables, so
+# they appear in the team#state and owner#state GSIs.
+#
+# Run from ./src:
+#   python -m runtime.jobs.backfill_state_index [--dry-run] [--max-rcu 50]
+# or invoke `handler` as a Lambda with {"dry_run": true, "max_rcu": 50}.
+
+# Import built-in libraries
+import argparse
+import logging
+import traceback
+
+# Import utils
+from utils.constants import (
+    DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
+    RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+)
+from utils.logger import get_logger
+from utils.state_index import backfill_state_index
+
+
+def run(dry_run: bool = False, max_rcu: float | None = None):
+    """Back-fill both mapping tables
+
+    Returns:
+        dict: table name -> scanned, updated, skipped and failed counts
+    """
+    return {
+        table_name: backfill_state_index(
+            table_name=table_name, dry_run=dry_run, max_rcu=max_rcu
+        )
+        for table_name in (
+            DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
+            RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+        )
+    }
+
+
+def handler(event, context):
+    logger = get_logger()
+
+    try:
+        return run(
+            dry_run=bool(event.get("dry_run", False)), max_rcu=event.get("max_rcu")
+        )
+    except Exception as error:
+        logger.error(
+            f"Uknown error | [backfill_state_index]: {error} {traceback.format_exc()}"
+        )
+        raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Back-fill state index attributes")
+    parser.add_argument("--dry-run", action="store_true", help="only count items")
+    parser.add_argument("--max-rcu", type=float, default=None, help="RCUs per second")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(run(dry_run=args.dry_run, max_rcu=args.max_rcu))
@@ -0,0 +1,6 @@
+# Import utils
+from utils.aws_clients import warm_up_clients
+
+# Create shared AWS clients once per Lambda container (at init),
+# so the first request doesn't pay for credential and model loading.
+warm_up_clients()
@@ -0,0 +1,37 @@
+# Import built-in libraries
+import traceback
+
+# Import 3rd-party libraries
+
+# Import utils
+import utils.exceptions as Exps
+from utils.logger import get_logger
+from utils.response_builder import ResponseBuilder
+
+# Import services
+from services.dashboard import get_summary
+
+
+async def handler(event, context):
+    rb = ResponseBuilder()
+    logger = get_logger()
+
+    try:
+        response = await get_summary({})
+
+        # Return response
+        rb.set_status_code(200)
+        rb.set_data(response)
+
+        return rb.create_response()
+    except Exps.AppException as error:
+        logger.error(f"Error | [get_dashboard_summary]: {error}")
+        return rb.create_error_response(error)
+
+    except Exception as error:
+        logger.error(
+            f"Uknown error | [get_dashboard_summary]: {error} {traceback.format_exc()}"
+        )
+        return rb.create_error_response(Exps.UnknownException(str(error)))
+    finally:
+        logger.debug("End execution of [get_dashboard_summary]")
@@ -1,4 +1,5 @@
 # Import built-in libraries
+import base64
 import traceback, os
 
 # Import 3rd-party libraries
@@ -6,10 +7,11 @@ import traceback, os
 # Import utils
 import utils.exceptions as Exps
 from utils.helpers import request as request_helpers
+from utils.helpers.other import convert_keys_to_camel_case, to_http_date
 from utils.logger import get_logger
 from utils.response_builder import ResponseBuilder
 
-from services.data_contract import get_datacontract
+from services.data_contract import get_datacontract, get_datacontract_url
 
 
 async def handler(event, context):
@@ -22,12 +24,57 @@ async def handler(event, context):
         path_params = request_helpers.get_path_params_from_event(event)
         query = request_helpers.get_query_from_event(event)
         body = request_helpers.get_body_from_event(event)
+        headers = request_helpers.get_headers_from_event(event)
 
-        response = get_datacontract({"path_params": path_params, "query": query})
+        delivery = (query or {}).get("delivery", "content")
+
+        # Client downloads content from S3 directly with a presigned url
+        if delivery in ("url", "redirect"):
+            response = get_datacontract_url(
+                {"path_params": path_params, "query": query}
+            )
+
+            if delivery == "redirect":
+                rb.set_headers({**rb.headers, "Location": response["url"]})
+                rb.set_status_code(307)
+            else:
+                rb.set_status_code(200)
+
+            rb.set_data(convert_keys_to_camel_case(response))
+
+            return rb.create_response()
+
+        response = get_datacontract(
+            {"path_params": path_params, "query": query, "headers": headers}
+        )
+
+        # Ranges can be resumed with If-Range (ETag or Last-Modified of the object)
+        range_headers = {"Accept-Ranges": response.get("AcceptRanges") or "bytes"}
+        if response.get("ETag"):
+            range_headers["ETag"] = response["ETag"]
+        if response.get("LastModified"):
+            range_headers["Last-Modified"] = to_http_date(response["LastModified"])
+
+        # Partial content is raw bytes of the object (a range may cut a
+        # multi-byte character), it is returned as is, base64-encoded
+        if response.get("ContentRange"):
+            return {
+                "statusCode": 206,
+                "headers": {
+                    **rb.headers,
+                    **range_headers,
+                    "Content-Type": response.get("ContentType")
+                    or "application/octet-stream",
+                    "Content-Range": response["ContentRange"],
+                },
+                "body": base64.b64encode(response["Body"].read()).decode("ascii"),
+                "isBase64Encoded": True,
+            }
 
         # Return response
+        rb.set_headers({**rb.headers, **range_headers})
         rb.set_status_code(200)
-        rb.set_data(response)
+        rb.set_data(response["Body"].read().decode("utf-8"))
 
         return rb.create_response()
 
@@ -21,9 +21,13 @@ async def handler(event, context):
         # Extract request data
         claims = request_helpers.get_claims_from_event(event)
         path_params = request_helpers.get_path_params_from_event(event)
+        query = request_helpers.get_query_from_event(event) or {}
         body = request_helpers.get_body_from_event(event)
 
-        response = get_job(job_name=path_params.get("job_name"))
+        response = get_job(
+            job_name=path_params.get("job_name"),
+            refresh=query.get("refresh") == "true",
+        )
 
         # Return response
         rb.set_status_code(200)
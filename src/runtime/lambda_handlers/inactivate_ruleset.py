@@ -13,7 +13,7 @@ from utils.response_builder import ResponseBuilder
 from services.ruleset import inactivate_ruleset
 
 
-def handler(event, context):
+async def handler(event, context):
     rb = ResponseBuilder()
     logger = get_logger()
 
@@ -23,7 +23,7 @@ def handler(event, context):
         path_params = request_helpers.get_path_params_from_event(event)
         body = request_helpers.get_body_from_event(event)
 
-        response = inactivate_ruleset({"path_params": path_params, "body": body})
+        response = await inactivate_ruleset({"path_params": path_params, "body": body})
 
         # Return response
         rb.set_status_code(200)
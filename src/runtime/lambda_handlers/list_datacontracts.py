@@ -6,6 +6,7 @@ import traceback
 # Import utils
 import utils.exceptions as Exps
 from utils.helpers import request as request_helpers
+from utils.helpers.other import convert_keys_to_camel_case
 from utils.logger import get_logger
 from utils.response_builder import ResponseBuilder
 
@@ -23,11 +24,12 @@ async def handler(event, context):
         query = request_helpers.get_query_from_event(event)
         body = request_helpers.get_body_from_event(event)
 
-        response = list_datacontracts({"path_params": path_params, "query": query})
+        result = list_datacontracts({"path_params": path_params, "query": query})
 
         # Return response
         rb.set_status_code(200)
-        rb.set_data(response)
+        rb.set_data(result.get("data_contracts", []))
+        rb.set_metadata(convert_keys_to_camel_case(result.get("meta", {})))
 
         return rb.create_response()
     except Exps.AppException as error:
@@ -0,0 +1,43 @@
+# Import built-in libraries
+import traceback
+
+# Import utils
+import utils.exceptions as Exps
+from utils.helpers import request as request_helpers
+from utils.helpers.other import convert_keys_to_camel_case
+from utils.logger import get_logger
+from utils.response_builder import ResponseBuilder
+
+from services.job import list_etl_jobs_overview
+
+
+async def handler(event, context):
+    rb = ResponseBuilder()
+    logger = get_logger()
+
+    try:
+        # Extract request data
+        claims = request_helpers.get_claims_from_event(event)
+        query = request_helpers.get_query_from_event(event)
+
+        result = await list_etl_jobs_overview({"query": query})
+
+        # Return response
+        rb.set_status_code(200)
+        rb.set_data(result.get("jobs", []))
+        rb.set_metadata(convert_keys_to_camel_case(result.get("meta", {})))
+
+        return rb.create_response()
+
+    except Exps.AppException as error:
+        logger.error(f"Error | [list_etl_jobs_overview]: {error}")
+        return rb.create_error_response(error)
+
+    except Exception as error:
+        logger.error(
+            f"Unknown error | [list_etl_jobs_overview]: {error} {traceback.format_exc()}"
+        )
+        return rb.create_error_response(Exps.UnknownException(str(error)))
+
+    finally:
+        logger.debug("End execution of [list_etl_jobs_overview]")
@@ -6,6 +6,7 @@ import traceback
 # Import utils
 import utils.exceptions as Exps
 from utils.helpers import request as request_helpers
+from utils.helpers.other import convert_keys_to_camel_case
 from utils.logger import get_logger
 from utils.response_builder import ResponseBuilder
 
@@ -24,11 +25,12 @@ def handler(event, context):
         query = request_helpers.get_query_from_event(event)
         body = request_helpers.get_body_from_event(event)
 
-        response = list_rulesets({"query": query})
+        result = list_rulesets({"query": query})
 
         # Return response
         rb.set_status_code(200)
-        rb.set_data(response)
+        rb.set_data(result.get("rulesets", []))
+        rb.set_metadata(convert_keys_to_camel_case(result.get("meta", {})))
 
         return rb.create_response()
     except Exps.AppException as error:
@@ -23,7 +23,7 @@ async def handler(event, context):
         path_params = request_helpers.get_path_params_from_event(event)
         body = request_helpers.get_body_from_event(event)
 
-        response = reject_datacontract(
+        response = await reject_datacontract(
             {"path_params": path_params, "body": body, "meta": {"claims": claims}}
         )
 
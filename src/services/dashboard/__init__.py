@@ -0,0 +1,5 @@
+from .get_summary import get_summary
+
+__all__ = [
+    "get_summary",
+]
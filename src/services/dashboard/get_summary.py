@@ -0,0 +1,66 @@
+# Import built-in libraries
+import asyncio
+
+# Import 3rd-party libraries
+
+# Import from utils
+from utils.constants import (
+    DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
+    DATACONTRACT_DYNAMODB_STATE_GSI_NAME,
+    RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+    RULESET_DYNAMODB_STATE_GSI_NAME,
+)
+from utils.dc_state import DataContractState
+from utils.rl_state import RulesetState
+from utils.dynamodb_async import count_items
+from utils.helpers.other import convert_keys_to_camel_case
+
+
+async def _count_by_state(table_name, index_name, states):
+    counts = await asyncio.gather(
+        *[
+            count_items(
+                table_name=table_name,
+                index_name=index_name,
+                partition_query={"key": "state", "value": state},
+            )
+            for state in states
+        ]
+    )
+    summary = dict(zip(states, counts))
+    summary["total"] = sum(counts)
+
+    return summary
+
+
+async def get_summary(params):
+    """
+    Count data contracts and rulesets in each state (for the dashboard),
+    only counts are read from the state GSIs, not items
+
+    Args:
+        params (dict): Parameters of this function.
+
+    Returns:
+        dict: number of data contracts and rulesets by state
+    """
+    data_contracts, rulesets = await asyncio.gather(
+        _count_by_state(
+            DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
+            DATACONTRACT_DYNAMODB_STATE_GSI_NAME,
+            [
+                DataContractState.Pending,
+                DataContractState.Approved,
+                DataContractState.Rejected,
+            ],
+        ),
+        _count_by_state(
+            RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+            RULESET_DYNAMODB_STATE_GSI_NAME,
+            [RulesetState.Active, RulesetState.Inactive],
+        ),
+    )
+
+    return convert_keys_to_camel_case(
+        {"data_contracts": data_contracts, "rulesets": rulesets}
+    )
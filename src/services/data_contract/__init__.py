@@ -1,6 +1,7 @@
 from .generate import generate_draft_datacontract
 from .list_datacontracts import list_datacontracts
 from .get_datacontract import get_datacontract
+from .get_datacontract_url import get_datacontract_url
 from .get_datacontract_info import get_datacontract_info
 from .approve_datacontract import approve_datacontract
 from .reject_datacontract import reject_datacontract
@@ -10,6 +11,7 @@ __all__ = [
     "generate_draft_datacontract",
     "list_datacontracts",
     "get_datacontract",
+    "get_datacontract_url",
     "get_datacontract_info",
     "approve_datacontract",
     "reject_datacontract",
@@ -6,7 +6,6 @@ import sys
 import requests
 
 # Import services
-from services.data_contract import get_datacontract
 from services.ruleset import upload_ruleset, generate_ruleset
 
 # Import from utils
@@ -16,12 +15,14 @@ from utils.constants import (
 )
 from utils.dc_state import DataContractState
 from utils.rl_state import RulesetState
-from utils.dynamodb import update_item
-from utils.s3 import move_file, upload_fileobj
+from utils.aio import run_blocking
+from utils.s3_async import get_cached_file_content
+from utils.state_transition import transition_item
 from utils.helpers.boolean import check_empty_or_throw_error
+from utils.helpers.number import parse_int_or_throw_error
 
 
-def approve_datacontract(params):
+async def approve_datacontract(params):
     """
     Approve a pending data contract
 
@@ -39,6 +40,10 @@ def approve_datacontract(params):
 
     object_name = path_params.get("datacontract_name", "")
     version = body.get("version", "")
+    # Revision read by the client, the item isn't read again before writing
+    revision = parse_int_or_throw_error(
+        body.get("revision"), "revision", None, minimum=0
+    )
 
     check_empty_or_throw_error(
         version,
@@ -49,43 +54,40 @@ def approve_datacontract(params):
     default_ext = "yaml"
     old_state = DataContractState.Pending
     new_state = DataContractState.Approved
-    source_object_key = f"{old_state}/{object_name}.{default_ext}"
     dest_object_key = f"{new_state}/{object_name}.{default_ext}"
 
-    # Move object from /pending to /approved
-    move_file(
-        bucket_name=DATACONTRACT_BUCKET_NAME,
-        source_key=source_object_key,
-        dest_bucket_name=DATACONTRACT_BUCKET_NAME,
-        dest_key=dest_object_key,
-    )
-
-    # Update corresponding dynamodb item (by name - pk and version - sk)
-    updated_item = update_item(
+    # Update dynamodb item (by name - pk and version - sk) only if it is
+    # still pending, a concurrent approval gets ConflictException instead of
+    # generating a second ruleset. Then move object from /pending to
+    # /approved, the contract is set back to pending if it can't be moved.
+    updated_item = await transition_item(
         table_name=DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
-        partition_query={"key": "name", "value": object_name},
-        sort_query={"key": "version", "value": version},
-        data={"state": new_state},
+        bucket_name=DATACONTRACT_BUCKET_NAME,
+        name=object_name,
+        version=version,
+        old_state=old_state,
+        new_state=new_state,
+        ext=default_ext,
+        revision=revision,
     )
 
     # Get content of data contract
-    data_contract_raw = get_datacontract(
-        {
-            "path_params": {"name": object_name},
-            "query": {"state": new_state},
-            "meta": meta,
-        }
+    data_contract_raw = await get_cached_file_content(
+        bucket_name=DATACONTRACT_BUCKET_NAME, object_key=dest_object_key
     )
-    data_contract_content = data_contract_raw.read().decode("utf-8")
+    data_contract_content = data_contract_raw.decode("utf-8")
 
-    # Generate ruleset
-    ruleset_content = generate_ruleset({"body": {"content": data_contract_content}})
+    # Generate ruleset (Bedrock call is blocking)
+    ruleset_content = await run_blocking(
+        generate_ruleset, {"body": {"content": data_contract_content}}
+    )
 
     # Upload ruleset
     ruleset_name = f"{object_name} Ruleset"
     ruleset_version = "1.0.0"
 
-    upload_ruleset(
+    await run_blocking(
+        upload_ruleset,
         {
             "body": {
                 "name": ruleset_name,
@@ -93,7 +95,7 @@ def approve_datacontract(params):
                 "version": ruleset_version,
             },
             "meta": meta,
-        }
+        },
     )
 
     return {"dataContractInfo": updated_item, "rulesetName": ruleset_name}
@@ -4,6 +4,7 @@
 
 # Import from utils
 from utils.s3 import get_file
+from utils.s3_cache import get_file as get_cached_file
 from utils.constants import DATACONTRACT_BUCKET_NAME
 
 
@@ -14,15 +15,18 @@ def get_datacontract(params):
         params (dict): parameters of this function
 
     Returns:
-        Any: streaming response
+        dict: response of S3 get_object, content is in `Body` (file-like).
+            It has `ContentRange` when `range` header is set.
     """
     path_params, query, body, headers, meta = (
         params.get("path_params"),
         params.get("query"),
         params.get("body"),
-        params.get("headers"),
+        params.get("headers") or {},
         params.get("meta", {}),
     )
+    # Names of HTTP headers are case-insensitive
+    headers = {name.lower(): value for name, value in headers.items()}
 
     default_ext = "yaml"
     name = path_params.get("name")
@@ -30,6 +34,15 @@ def get_datacontract(params):
 
     object_key = f"{state}/{name}.{default_ext}"
 
-    file = get_file(bucket_name=DATACONTRACT_BUCKET_NAME, object_key=object_key)
+    range_header = headers.get("range")
 
-    return file.get("Body")
+    # Partial content (resumed download) is read from S3 directly
+    if range_header:
+        return get_file(
+            bucket_name=DATACONTRACT_BUCKET_NAME,
+            object_key=object_key,
+            range=range_header,
+            if_range=headers.get("if-range", ""),
+        )
+
+    return get_cached_file(bucket_name=DATACONTRACT_BUCKET_NAME, object_key=object_key)
@@ -0,0 +1,61 @@
+# Import built-in libraries
+
+# Import 3rd-party libraries
+
+# Import from utils
+import utils.exceptions as Exps
+from utils.s3 import get_presigned_url
+from utils.constants import DATACONTRACT_BUCKET_NAME
+from utils.dc_state import DataContractState
+from utils.helpers.boolean import check_empty_or_throw_error
+
+_STATES = (
+    DataContractState.Pending,
+    DataContractState.Approved,
+    DataContractState.Rejected,
+)
+
+
+def get_datacontract_url(params):
+    """Get a short-lived presigned url to download content of data contract.
+    The url is signed for the key of this data contract only.
+
+    Args:
+        params (dict): parameters of this function
+
+    Returns:
+        dict: url and expires_in (seconds)
+    """
+    path_params, query, body, headers, meta = (
+        params.get("path_params"),
+        params.get("query"),
+        params.get("body"),
+        params.get("headers"),
+        params.get("meta", {}),
+    )
+
+    default_ext = "yaml"
+    name = path_params.get("name", "")
+    state = query.get("state", "")
+    expires_in = query.get("ttl")
+
+    check_empty_or_throw_error(name, "name", "Name of data contract is required")
+
+    # Key is built from a known state and a plain name, so the url can't
+    # point to another object of the bucket
+    if state not in _STATES:
+        raise Exps.BadRequestException(f"State of data contract is invalid: {state}")
+
+    if "/" in name or ".." in name:
+        raise Exps.BadRequestException(f"Name of data contract is invalid: {name}")
+
+    if expires_in is not None and not str(expires_in).isdigit():
+        raise Exps.BadRequestException("ttl must be a number of seconds")
+
+    object_key = f"{state}/{name}.{default_ext}"
+
+    return get_presigned_url(
+        bucket_name=DATACONTRACT_BUCKET_NAME,
+        object_key=object_key,
+        expires_in=int(expires_in) if expires_in is not None else None,
+    )
@@ -6,10 +6,13 @@
 from utils.constants import (
     DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
     DATACONTRACT_DYNAMODB_STATE_GSI_NAME,
+    DATACONTRACT_DYNAMODB_TEAM_STATE_GSI_NAME,
+    DATACONTRACT_DYNAMODB_OWNER_STATE_GSI_NAME,
+    LIST_MAX_LIMIT,
 )
-from utils.s3 import list_files
-from utils.dynamodb import query_items_with_gsi
-from utils.helpers.other import convert_keys_to_camel_case
+from utils.state_index import query_by_state
+from utils.helpers.number import parse_int_or_throw_error
+from utils.helpers.other import convert_keys_to_camel_case, parse_fields
 
 
 def list_datacontracts(params):
@@ -19,7 +22,8 @@ def list_datacontracts(params):
         params (dict): parameters of this function
 
     Returns:
-        dict: result from list objects
+        dict: data_contracts (one page) and meta with `next_start_key`, the cursor
+            of next page (None on last page)
     """
     path_params, query, body, headers, meta = (
         params.get("path_params"),
@@ -30,11 +34,36 @@ def list_datacontracts(params):
     )
 
     state = query.get("state")
+    limit = parse_int_or_throw_error(
+        query.get("limit"), "limit", 10, maximum=LIST_MAX_LIMIT
+    )
+    start_key = query.get("start_key") or None
+    # Only requested attributes are read (and converted), e.g. "name,version"
+    fields = parse_fields(query.get("fields"))
+    # Optional filters, each served by its own index (no filtering in Python)
+    team = query.get("team") or ""
+    owner = query.get("owner") or ""
+    since = query.get("since") or ""
+    order = query.get("order") or "asc"
 
-    result = query_items_with_gsi(
+    # Cursor keeps the whole key (name, version and state), so next page
+    # starts right after the last item of this one
+    result = query_by_state(
         table_name=DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
-        index_name=DATACONTRACT_DYNAMODB_STATE_GSI_NAME,
-        partition_query={"key": "state", "value": state},
+        state=state,
+        state_index_name=DATACONTRACT_DYNAMODB_STATE_GSI_NAME,
+        team=team,
+        team_index_name=DATACONTRACT_DYNAMODB_TEAM_STATE_GSI_NAME,
+        owner=owner,
+        owner_index_name=DATACONTRACT_DYNAMODB_OWNER_STATE_GSI_NAME,
+        since=since,
+        order=order,
+        cursor=start_key,
+        max_items=limit,
+        fields=fields,
     )
 
-    return convert_keys_to_camel_case(result)
+    return {
+        "data_contracts": convert_keys_to_camel_case(result["items"]),
+        "meta": {"next_start_key": result["cursor"]},
+    }
@@ -11,12 +11,12 @@ from utils.constants import (
     DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
 )
 from utils.dc_state import DataContractState
-from utils.dynamodb import update_item
-from utils.s3 import move_file
+from utils.state_transition import transition_item
 from utils.helpers.boolean import check_empty_or_throw_error
+from utils.helpers.number import parse_int_or_throw_error
 
 
-def reject_datacontract(params):
+async def reject_datacontract(params):
     """
     Reject a pending data contract
 
@@ -34,6 +34,10 @@ def reject_datacontract(params):
 
     object_name = path_params.get("datacontract_name", "")
     version = body.get("version", "")
+    # Revision read by the client, the item isn't read again before writing
+    revision = parse_int_or_throw_error(
+        body.get("revision"), "revision", None, minimum=0
+    )
 
     check_empty_or_throw_error(
         version,
@@ -44,23 +48,17 @@ def reject_datacontract(params):
     default_ext = "yaml"
     old_state = DataContractState.Pending
     new_state = DataContractState.Rejected
-    source_object_key = f"{old_state}/{object_name}.{default_ext}"
-    dest_object_key = f"{new_state}/{object_name}.{default_ext}"
-
-    # Move object from /pending to /approved
-    move_file(
-        bucket_name=DATACONTRACT_BUCKET_NAME,
-        source_key=source_object_key,
-        dest_bucket_name=DATACONTRACT_BUCKET_NAME,
-        dest_key=dest_object_key,
-    )
 
-    # Update corresponding dynamodb item (by name - pk and version - sk)
-    updated_item = update_item(
+    # Update dynamodb item (by name - pk and version - sk) only if it is
+    # still pending, then move object from /pending to /rejected. The
+    # contract is set back to pending if it can't be moved.
+    return await transition_item(
         table_name=DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
-        partition_query={"key": "name", "value": object_name},
-        sort_query={"key": "version", "value": version},
-        data={"state": new_state},
+        bucket_name=DATACONTRACT_BUCKET_NAME,
+        name=object_name,
+        version=version,
+        old_state=old_state,
+        new_state=new_state,
+        ext=default_ext,
+        revision=revision,
     )
-
-    return updated_item
@@ -15,8 +15,9 @@ from utils.constants import (
     DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
 )
 from utils.dc_state import DataContractState
-from utils.s3 import upload_fileobj
+from utils.s3 import upload_stream
 from utils.dynamodb import add_item
+from utils.state_index import build_state_index_attributes
 from utils.helpers.boolean import check_empty_or_throw_error
 
 
@@ -77,9 +78,9 @@ def upload_datacontract(params):
     object_key = (
         f"{DataContractState.Pending}/{datacontract_meta.get("name")}.{default_ext}"
     )
-    bytes = io.BytesIO(content.encode("utf-8"))
-    url = upload_fileobj(
-        fileobj=bytes,
+    upload_stream(
+        source=content,
+        content_type="application/yaml",
         bucket_name=DATACONTRACT_BUCKET_NAME,
         object_name=object_key,
         metadata={
@@ -88,9 +89,15 @@ def upload_datacontract(params):
         },
     )
 
-    # Save metadata
+    # Save metadata, with attributes of team#state and owner#state indexes
+    index_attributes = build_state_index_attributes(
+        datacontract_meta.get("team"),
+        datacontract_meta.get("owner"),
+        datacontract_meta.get("state"),
+    )
     add_item(
-        table_name=DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME, data=datacontract_meta
+        table_name=DATACONTRACT_MAPPING_DYNAMODB_TABLE_NAME,
+        data={**datacontract_meta, **index_attributes},
     )
 
     return datacontract_meta
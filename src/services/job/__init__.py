@@ -2,5 +2,12 @@ from .list_etl_jobs import list_etl_jobs
 from .list_etl_job_runs import list_etl_job_runs
 from .run_etl_job import run_etl_job
 from .get_elt_job import get_etl_job
+from .list_etl_jobs_overview import list_etl_jobs_overview
 
-__all__ = ["list_etl_jobs", "list_etl_job_runs", "run_etl_job", "get_etl_job"]
+__all__ = [
+    "list_etl_jobs",
+    "list_etl_job_runs",
+    "run_etl_job",
+    "get_etl_job",
+    "list_etl_jobs_overview",
+]
@@ -25,6 +25,8 @@ def list_etl_jobs(params):
     headers = params.get("headers")
     meta = params.get("meta", {})
 
-    result = list_jobs(limit=int(query.get("limit", "10")))
+    result = list_jobs(
+        limit=int(query.get("limit", "10")), refresh=query.get("refresh") == "true"
+    )
 
     return result
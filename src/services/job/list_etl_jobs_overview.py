@@ -0,0 +1,34 @@
+# Import from utils
+from utils.constants import LIST_MAX_LIMIT
+from utils.glue_async import list_jobs_overview
+from utils.helpers.number import parse_int_or_throw_error
+
+
+async def list_etl_jobs_overview(params):
+    """
+    List a page of jobs with the latest run of each job (one aggregate view
+    instead of a GetJob and a GetJobRuns call per job).
+
+    Args:
+        params (dict): Parameters of this function.
+
+    Returns:
+        dict: result from list_jobs_overview.
+    """
+    path_params = params.get("path_params")
+    query = params.get("query") or {}
+    body = params.get("body")
+    headers = params.get("headers")
+    meta = params.get("meta", {})
+
+    job_names = query.get("job_names")
+
+    result = await list_jobs_overview(
+        job_names=job_names.split(",") if job_names else None,
+        next_token=query.get("next_token"),
+        limit=parse_int_or_throw_error(
+            query.get("limit"), "limit", 10, maximum=LIST_MAX_LIMIT
+        ),
+    )
+
+    return result
@@ -1,6 +1,12 @@
 from .generate import generate_ruleset
 from .activate_ruleset import activate_ruleset
+from .activate_rulesets import (
+    activate_rulesets,
+    iter_activate_rulesets,
+    summarize_activations,
+)
 from .get_ruleset import get_ruleset
+from .get_ruleset_url import get_ruleset_url
 from .get_ruleset_info import get_ruleset_info
 from .inactivate_ruleset import inactivate_ruleset
 from .list_rulesets import list_rulesets
@@ -9,7 +15,11 @@ from .upload_ruleset import upload_ruleset
 __all__ = [
     "generate_ruleset",
     "activate_ruleset",
+    "activate_rulesets",
+    "iter_activate_rulesets",
+    "summarize_activations",
     "get_ruleset",
+    "get_ruleset_url",
     "get_ruleset_info",
     "inactivate_ruleset",
     "list_rulesets",
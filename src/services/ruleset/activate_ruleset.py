@@ -11,11 +11,22 @@ from utils.constants import (
     RULESET_BUCKET_NAME,
     RULESET_MAPPING_DYNAMODB_TABLE_NAME,
 )
-from utils.dynamodb import update_item
+from utils.aio import run_blocking
+from utils.dynamodb_async import query_item, transact_write_items
+from utils.state_index import (
+    build_state_index_attributes,
+    get_state_index_attributes,
+)
 from utils.rl_state import RulesetState
-from utils.s3 import move_file, get_file
-from utils.glue import update_inline_ruleset_in_job
+from utils.s3_async import get_cached_file_content
+from utils.state_transition import move_or_roll_back
+from utils.glue import hash_ruleset
+from utils.glue_async import apply_inline_ruleset_with_retry
 from utils.helpers.boolean import check_empty_or_throw_error
+from utils.helpers.number import parse_int_or_throw_error
+
+# Hash of normalised DQDL of a ruleset (utils.glue.hash_ruleset)
+RULESET_HASH_ATTRIBUTE = "ruleset_hash"
 
 
 async def activate_ruleset(params):
@@ -38,8 +49,14 @@ async def activate_ruleset(params):
 
     job_name = body.get("jobName", "")
     version = body.get("version", "")
+    # Revision read by the client, the item isn't read again before writing
+    revision = parse_int_or_throw_error(
+        body.get("revision"), "revision", None, minimum=0
+    )
     current_active_ruleset_name = body.get("currentActiveRulesetName", "")
     current_active_ruleset_version = body.get("currentActiveRulesetVersion", "")
+    # Read the job definition from Glue instead of the job cache
+    refresh_job = body.get("refreshJob", False)
 
     check_empty_or_throw_error(
         version,
@@ -58,27 +75,61 @@ async def activate_ruleset(params):
     source_object_key = f"{old_state}/{object_name}.{default_ext}"
     dest_object_key = f"{new_state}/{object_name}.{default_ext}"
 
-    # Move object from /pending to /approved
-    move_file_tasks = [
-        asyncio.to_thread(
-            move_file,
-            bucket_name=RULESET_BUCKET_NAME,
-            source_key=source_object_key,
-            dest_bucket_name=RULESET_BUCKET_NAME,
-            dest_key=dest_object_key,
+    # Move object from /inactive to /active
+    moves = [{"source_key": source_object_key, "dest_key": dest_object_key}]
+
+    # Content is read before the move (it stays cached at its new key), its
+    # hash is recorded on the item with the new state
+    object_content, (index_attributes, old_index_attributes) = await asyncio.gather(
+        get_cached_file_content(
+            bucket_name=RULESET_BUCKET_NAME, object_key=source_object_key
+        ),
+        run_blocking(
+            get_state_index_attributes,
+            RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+            object_name,
+            version,
+            new_state,
+            old_state,
         ),
+    )
+    ruleset_content = object_content.decode("utf-8")
+    ruleset_hash = hash_ruleset(ruleset_content)
+
+    # Both rulesets change state in one transaction, which only commits if
+    # they are still in the state seen by the caller. A concurrent
+    # activation gets ConflictException instead of a second active ruleset.
+    operations = [
+        {
+            "action": "update",
+            "table_name": RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+            "partition_query": {"key": "name", "value": object_name},
+            "sort_query": {"key": "version", "value": version},
+            "data": {
+                "state": new_state,
+                "job_name": job_name,
+                RULESET_HASH_ATTRIBUTE: ruleset_hash,
+                **index_attributes,
+            },
+            "expected": {"state": old_state},
+            "expected_revision": revision,
+        }
     ]
 
-    update_item_tasks = [
-        asyncio.to_thread(
-            update_item,
-            table_name=RULESET_MAPPING_DYNAMODB_TABLE_NAME,
-            partition_query={"key": "name", "value": object_name},
-            sort_query={"key": "version", "value": version},
-            data={"state": new_state, "job_name": job_name},
-        )
+    # Operations restoring the previous states, if objects can't be moved
+    rollback_operations = [
+        {
+            "action": "update",
+            "table_name": RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+            "partition_query": {"key": "name", "value": object_name},
+            "sort_query": {"key": "version", "value": version},
+            "data": {"state": old_state, "job_name": "", **old_index_attributes},
+            "expected": {"state": new_state, "job_name": job_name},
+            "expected_revision": revision + 1 if revision is not None else None,
+        }
     ]
 
+    job_is_current = False
     if current_active_ruleset_name:
         check_empty_or_throw_error(
             current_active_ruleset_version,
@@ -95,37 +146,111 @@ async def activate_ruleset(params):
             f"{current_active_rl_new_state}/{current_active_ruleset_name}.{default_ext}"
         )
 
-        move_file_tasks.append(
-            asyncio.to_thread(
-                move_file,
-                bucket_name=RULESET_BUCKET_NAME,
-                source_key=currect_active_rl_object_key,
-                dest_bucket_name=RULESET_BUCKET_NAME,
-                dest_key=current_active_rl_dest_object_key,
-            )
+        current_active_item = await query_item(
+            table_name=RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+            partition_query={"key": "name", "value": current_active_ruleset_name},
+            sort_query={"key": "version", "value": current_active_ruleset_version},
+            fields=["team", "owner", "job_name", RULESET_HASH_ATTRIBUTE],
+        )
+        current_active_index_attributes = build_state_index_attributes(
+            current_active_item.get("team"),
+            current_active_item.get("owner"),
+            current_active_rl_new_state,
         )
 
-        update_item_tasks.append(
-            asyncio.to_thread(
-                update_item,
-                table_name=RULESET_MAPPING_DYNAMODB_TABLE_NAME,
-                partition_query={"key": "name", "value": current_active_ruleset_name},
-                sort_query={"key": "version", "value": current_active_ruleset_version},
-                data={"state": current_active_rl_new_state, "job_name": ""},
-            )
+        # The job already runs this DQDL, only metadata changes. The
+        # transaction checks the job and hash are still the ones read here.
+        job_is_current = (
+            not refresh_job
+            and current_active_item.get("job_name") == job_name
+            and current_active_item.get(RULESET_HASH_ATTRIBUTE) == ruleset_hash
         )
 
-    await asyncio.gather(*move_file_tasks)
-    responses = await asyncio.gather(*update_item_tasks)
+        moves.append(
+            {
+                "source_key": currect_active_rl_object_key,
+                "dest_key": current_active_rl_dest_object_key,
+            }
+        )
 
-    print("DEST:", dest_object_key)
+        operations.append(
+            {
+                "action": "update",
+                "table_name": RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+                "partition_query": {
+                    "key": "name",
+                    "value": current_active_ruleset_name,
+                },
+                "sort_query": {
+                    "key": "version",
+                    "value": current_active_ruleset_version,
+                },
+                "data": {
+                    "state": current_active_rl_new_state,
+                    "job_name": "",
+                    **current_active_index_attributes,
+                },
+                "expected": (
+                    {
+                        "state": current_active_rl_state,
+                        "job_name": job_name,
+                        RULESET_HASH_ATTRIBUTE: ruleset_hash,
+                    }
+                    if job_is_current
+                    else {"state": current_active_rl_state}
+                ),
+            }
+        )
+        rollback_operations.append(
+            {
+                "action": "update",
+                "table_name": RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+                "partition_query": {
+                    "key": "name",
+                    "value": current_active_ruleset_name,
+                },
+                "sort_query": {
+                    "key": "version",
+                    "value": current_active_ruleset_version,
+                },
+                "data": {
+                    "state": current_active_rl_state,
+                    "job_name": current_active_item.get("job_name") or "",
+                    **build_state_index_attributes(
+                        current_active_item.get("team"),
+                        current_active_item.get("owner"),
+                        current_active_rl_state,
+                    ),
+                },
+                "expected": {"state": current_active_rl_new_state, "job_name": ""},
+            }
+        )
 
-    get_file_response = get_file(
-        bucket_name=RULESET_BUCKET_NAME, object_key=dest_object_key
-    )
-    object_content = get_file_response["Body"].read()
-    ruleset_content = object_content.decode("utf-8")
+    await transact_write_items(operations=operations)
+
+    # Objects are moved only once the new states are committed, Glue is
+    # updated only once they are moved
+    await move_or_roll_back(RULESET_BUCKET_NAME, moves, rollback_operations)
+
+    # When the recorded hash can't tell, the job is read (through the job
+    # cache) and UpdateJob is still skipped if its node holds the same DQDL
+    job_updated = False
+    if not job_is_current:
+        result = await apply_inline_ruleset_with_retry(
+            job_name=job_name, new_ruleset=ruleset_content, refresh=refresh_job
+        )
+        job_updated = result["updated"]
+
+    activated_item = {
+        "name": object_name,
+        "version": version,
+        "state": new_state,
+        "job_name": job_name,
+        "ruleset_hash": ruleset_hash,
+        "job_updated": job_updated,
+    }
 
-    update_inline_ruleset_in_job(job_name=job_name, new_ruleset=ruleset_content)
+    if revision is not None:
+        activated_item["revision"] = revision + 1
 
-    return responses[0]
+    return activated_item
@@ -0,0 +1,156 @@
+# Import built-in libraries
+import asyncio
+import logging
+import time
+
+# Import from utils
+from utils.constants import RULESET_BULK_ACTIVATION_CONCURRENCY
+import utils.exceptions as Exps
+from utils.helpers.boolean import check_empty_or_throw_error
+from utils.helpers.number import parse_int_or_throw_error
+
+# Import from services
+from .activate_ruleset import activate_ruleset
+
+logger = logging.getLogger(__name__)
+
+
+def _check_activations(activations: list):
+    job_names = set()
+    rulesets = set()
+
+    for i, activation in enumerate(activations):
+        for key in ("jobName", "rulesetName", "version"):
+            if not activation.get(key):
+                raise Exps.BadRequestException(f"{key} is required in activation {i}")
+
+        # Two rulesets of one job would race for its active ruleset
+        if activation["jobName"] in job_names:
+            raise Exps.BadRequestException(
+                f"Job {activation['jobName']} is activated more than once"
+            )
+
+        # A ruleset version is bound to a single job (one state and job_name
+        # in its mapping item), a second activation could only conflict
+        ruleset = (activation["rulesetName"], activation["version"])
+        if ruleset in rulesets:
+            raise Exps.BadRequestException(
+                f"Ruleset {ruleset[0]} {ruleset[1]} is activated more than once"
+            )
+
+        job_names.add(activation["jobName"])
+        rulesets.add(ruleset)
+
+
+async def iter_activate_rulesets(params):
+    """
+    Activate many rulesets, each on its own job (a job, and a ruleset
+    version, appear in one activation at most). Activations run with
+    bounded concurrency; their Glue calls share the rate limit of
+    utils.glue.apply_inline_ruleset_with_retry. Progress of each activation
+    is yielded as soon as it ends, in order of completion.
+
+    Args:
+        params (dict): Parameters of this function. Body has:
+            - activations (list[dict]): jobName, rulesetName, version and the
+              optional fields of activate_ruleset (revision,
+              currentActiveRulesetName, currentActiveRulesetVersion, refreshJob)
+            - concurrency (int, optional): Number of activations running at the same time.
+
+    Yields:
+        dict: index (in activations), job_name, ruleset_name, version, status
+            ("activated" or "failed"), result, error and elapsed_ms
+    """
+    body = params.get("body") or {}
+    meta = params.get("meta", {})
+
+    activations = body.get("activations", [])
+    concurrency = parse_int_or_throw_error(
+        body.get("concurrency"), "concurrency", RULESET_BULK_ACTIVATION_CONCURRENCY
+    )
+
+    check_empty_or_throw_error(
+        activations, "activations", "At least one activation is required"
+    )
+    _check_activations(activations)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    started = set()
+
+    async def activate(index: int, activation: dict):
+        async with semaphore:
+            started.add(index)
+            started_at = time.perf_counter()
+            outcome = {
+                "index": index,
+                "job_name": activation["jobName"],
+                "ruleset_name": activation["rulesetName"],
+                "version": activation["version"],
+                "status": "activated",
+                "result": None,
+                "error": None,
+            }
+
+            try:
+                outcome["result"] = await activate_ruleset(
+                    {
+                        "path_params": {"ruleset_name": activation["rulesetName"]},
+                        "body": activation,
+                        "meta": meta,
+                    }
+                )
+            except Exps.AppException as error:
+                outcome["status"] = "failed"
+                outcome["error"] = error.to_plain()
+            except Exception as error:
+                logger.exception(
+                    f"Cannot activate {activation['rulesetName']} on {activation['jobName']}"
+                )
+                outcome["status"] = "failed"
+                outcome["error"] = Exps.UnknownException(str(error)).to_plain()
+
+            outcome["elapsed_ms"] = round((time.perf_counter() - started_at) * 1000, 1)
+
+            return outcome
+
+    tasks = [
+        asyncio.create_task(activate(index, activation))
+        for index, activation in enumerate(activations)
+    ]
+
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # The client went away: activations which haven't started are
+        # dropped, started ones run to the end (never half applied)
+        for index, task in enumerate(tasks):
+            if index not in started:
+                task.cancel()
+
+
+async def activate_rulesets(params):
+    """
+    Activate many rulesets, see iter_activate_rulesets
+
+    Args:
+        params (dict): Parameters of this function.
+
+    Returns:
+        dict: results (in order of activations) and summary with the number
+            of activated and failed rulesets
+    """
+    results = [outcome async for outcome in iter_activate_rulesets(params)]
+    results.sort(key=lambda outcome: outcome["index"])
+
+    return {"results": results, "summary": summarize_activations(results)}
+
+
+def summarize_activations(results: list):
+    """Count outcomes of activations by status"""
+    summary = {"activated": 0, "failed": 0}
+
+    for outcome in results:
+        summary[outcome["status"]] += 1
+
+    return summary
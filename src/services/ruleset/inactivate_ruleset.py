@@ -11,22 +11,24 @@ from utils.constants import (
     RULESET_BUCKET_NAME,
     RULESET_MAPPING_DYNAMODB_TABLE_NAME,
 )
-from utils.dynamodb import update_item, query_item
+from utils.dynamodb_async import transact_write_items, query_item
+from utils.state_index import build_state_index_attributes
 from utils.rl_state import RulesetState
-from utils.s3 import move_file
-from utils.glue import update_inline_ruleset_in_job
+from utils.state_transition import move_or_roll_back
+from utils.glue_async import update_inline_ruleset_in_job
 from utils.helpers.boolean import check_empty_or_throw_error
+from utils.helpers.number import parse_int_or_throw_error
 
 
-def inactivate_ruleset(params):
+async def inactivate_ruleset(params):
     """
-    Activate a inactive ruleset
+    Inactivate an active ruleset
 
     Args:
         params (dict): Parameters of this function.
 
     Returns:
-        dict: response from activate_ruleset
+        dict: response from inactivate_ruleset
     """
     path_params = params.get("path_params")
     query = params.get("query")
@@ -36,6 +38,11 @@ def inactivate_ruleset(params):
 
     ruleset_name = path_params.get("ruleset_name", "")
     version = body.get("version", "")
+    # Revision read by the client, a concurrent change of the ruleset gets
+    # RevisionConflictException
+    revision = parse_int_or_throw_error(
+        body.get("revision"), "revision", None, minimum=0
+    )
 
     check_empty_or_throw_error(
         version,
@@ -43,10 +50,11 @@ def inactivate_ruleset(params):
         "Version of data contract must be specified to update its metadata",
     )
 
-    ruleset_metadata = query_item(
+    ruleset_metadata = await query_item(
         table_name=RULESET_MAPPING_DYNAMODB_TABLE_NAME,
         partition_query={"key": "name", "value": ruleset_name},
         sort_query={"key": "version", "value": version},
+        consistent_read=True,
     )
 
     if ruleset_metadata is None or not ruleset_metadata:
@@ -61,25 +69,74 @@ def inactivate_ruleset(params):
     source_object_key = f"{old_state}/{ruleset_name}.{default_ext}"
     dest_object_key = f"{new_state}/{ruleset_name}.{default_ext}"
 
-    # Move object from /pending to /approved
-    move_file(
-        bucket_name=RULESET_BUCKET_NAME,
-        source_key=source_object_key,
-        dest_bucket_name=RULESET_BUCKET_NAME,
-        dest_key=dest_object_key,
+    job_name = ruleset_metadata.get("job_name")
+
+    # Update dynamodb item (by name - pk and version - sk) only if it is
+    # still active, a concurrent inactivation gets ConflictException instead
+    # of moving the object twice
+    await transact_write_items(
+        operations=[
+            {
+                "action": "update",
+                "table_name": RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+                "partition_query": {"key": "name", "value": ruleset_name},
+                "sort_query": {"key": "version", "value": version},
+                "data": {
+                    "state": new_state,
+                    "job_name": "",
+                    **build_state_index_attributes(
+                        ruleset_metadata.get("team"),
+                        ruleset_metadata.get("owner"),
+                        new_state,
+                    ),
+                },
+                "expected": {"state": old_state},
+                "expected_revision": revision,
+            }
+        ]
     )
-
-    # Update corresponding dynamodb item (by name - pk and version - sk)
-    updated_item = update_item(
-        table_name=RULESET_MAPPING_DYNAMODB_TABLE_NAME,
-        partition_query={"key": "name", "value": ruleset_name},
-        sort_query={"key": "version", "value": version},
-        data={"state": new_state, "job_name": ""},
+    updated_item = {
+        "name": ruleset_name,
+        "version": version,
+        "state": new_state,
+        "job_name": "",
+    }
+
+    if revision is not None:
+        updated_item["revision"] = revision + 1
+
+    # Move object from /active to /inactive. If it can't be moved, the
+    # ruleset is set back to active on its job (Glue isn't reset yet), so
+    # the inactivation can be run again.
+    await move_or_roll_back(
+        RULESET_BUCKET_NAME,
+        [{"source_key": source_object_key, "dest_key": dest_object_key}],
+        [
+            {
+                "action": "update",
+                "table_name": RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+                "partition_query": {"key": "name", "value": ruleset_name},
+                "sort_query": {"key": "version", "value": version},
+                "data": {
+                    "state": old_state,
+                    "job_name": job_name or "",
+                    **build_state_index_attributes(
+                        ruleset_metadata.get("team"),
+                        ruleset_metadata.get("owner"),
+                        old_state,
+                    ),
+                },
+                "expected": {"state": new_state, "job_name": ""},
+                "expected_revision": updated_item.get("revision"),
+            }
+        ],
     )
 
-    update_inline_ruleset_in_job(
-        job_name=ruleset_metadata.get("job_name"),
-        new_ruleset='Rules = [ColumnExists "id"]',
-    )
+    # Reset ruleset of the job, if the ruleset was bound to one
+    if job_name:
+        await update_inline_ruleset_in_job(
+            job_name=job_name,
+            new_ruleset='Rules = [ColumnExists "id"]',
+        )
 
     return updated_item
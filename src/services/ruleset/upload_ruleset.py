@@ -14,8 +14,9 @@ from utils.constants import (
     RULESET_MAPPING_DYNAMODB_TABLE_NAME,
 )
 from utils.rl_state import RulesetState
-from utils.s3 import upload_fileobj
+from utils.s3 import upload_stream
 from utils.dynamodb import add_item
+from utils.state_index import build_state_index_attributes
 from utils.helpers.boolean import check_empty_or_throw_error
 
 
@@ -70,9 +71,9 @@ def upload_ruleset(params):
     # Upload file
     default_ext = "txt"
     object_key = f"{RulesetState.Inactive}/{ruleset_meta.get("name")}.{default_ext}"
-    bytes = io.BytesIO(content.encode("utf-8"))
-    url = upload_fileobj(
-        fileobj=bytes,
+    upload_stream(
+        source=content,
+        content_type="text/plain",
         bucket_name=RULESET_BUCKET_NAME,
         object_name=object_key,
         metadata={
@@ -81,7 +82,13 @@ def upload_ruleset(params):
         },
     )
 
-    # Save metadata
-    add_item(table_name=RULESET_MAPPING_DYNAMODB_TABLE_NAME, data=ruleset_meta)
+    # Save metadata, with attributes of team#state and owner#state indexes
+    index_attributes = build_state_index_attributes(
+        ruleset_meta.get("team"), ruleset_meta.get("owner"), ruleset_meta.get("state")
+    )
+    add_item(
+        table_name=RULESET_MAPPING_DYNAMODB_TABLE_NAME,
+        data={**ruleset_meta, **index_attributes},
+    )
 
     return ruleset_meta
@@ -0,0 +1,69 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Import from utils
+from utils.constants import AIO_MAX_WORKERS
+
+# A dedicated, bounded executor for blocking AWS calls. It is kept separate
+# from the default executor of the event loop, so slow AWS calls cannot
+# starve other `run_in_executor` users, and its size stays below the
+# connection pool of AWS clients (see utils.aws_clients).
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Get the shared executor for blocking AWS calls, create it if needed
+
+    Returns:
+        ThreadPoolExecutor: shared executor
+    """
+    global _executor
+
+    if _executor is not None:
+        return _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=AIO_MAX_WORKERS, thread_name_prefix="aws-io"
+            )
+
+    return _executor
+
+
+def shutdown_executor(wait: bool = True):
+    """Shut down the shared executor (e.g. at server shutdown or in tests),
+    a new one is created on next use.
+
+    Args:
+        wait (bool, optional): wait for running calls. Defaults to True.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking function on the shared executor without blocking
+    the event loop. Context variables are propagated like asyncio.to_thread.
+
+    Args:
+        func (Callable): blocking function
+        *args: positional arguments of func
+        **kwargs: keyword arguments of func
+
+    Returns:
+        Any: result of func
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+
+    return await loop.run_in_executor(get_executor(), call)
@@ -1,8 +1,12 @@
 import logging
+import os
+import threading
 
 import boto3
+from botocore.config import Config
 
 # Import from utils
+import utils.exceptions as Exps
 from utils.constants import DEFAULT_REGION_NAME, DEFAULT_PROFILE_NAME
 
 logger = logging.getLogger(__name__)
@@ -14,17 +18,201 @@ if DEFAULT_REGION_NAME is None:
 if DEFAULT_PROFILE_NAME is None:
     DEFAULT_PROFILE_NAME = ""
 
+# Services which are created at Lambda init (cold start) by `warm_up_clients`
+DEFAULT_WARM_UP_SERVICES = ("s3", "dynamodb", "glue", "cognito-idp")
+
+# Named botocore config profiles. Every option can be overridden with env
+# `AWS_CLIENT_<PROFILE>_<OPTION>`, e.g. AWS_CLIENT_LATENCY_READ_TIMEOUT=5
+#   - latency: short timeouts, fail fast (S3 get, DynamoDB, Cognito)
+#   - long: long read timeout for slow APIs (Bedrock, Glue UpdateJob)
+CLIENT_CONFIG_PROFILES = {
+    "default": {
+        "max_pool_connections": 25,
+        "retry_mode": "adaptive",
+        "max_attempts": 5,
+        "connect_timeout": 5,
+        "read_timeout": 60,
+    },
+    "latency": {
+        "max_pool_connections": 50,
+        "retry_mode": "adaptive",
+        "max_attempts": 3,
+        "connect_timeout": 2,
+        "read_timeout": 10,
+    },
+    "long": {
+        "max_pool_connections": 10,
+        "retry_mode": "adaptive",
+        "max_attempts": 4,
+        "connect_timeout": 5,
+        "read_timeout": 300,
+    },
+}
+
+# Config profile which is used by a service when caller doesn't choose one
+SERVICE_CONFIG_PROFILES = {
+    "s3": "default",
+    "dynamodb": "latency",
+    "cognito-idp": "latency",
+    "glue": "default",
+    "bedrock-runtime": "long",
+}
+
+# Other config profiles of a service which are used by helpers
+# (S3 reads and Glue UpdateJob), they are warmed up too
+EXTRA_SERVICE_CONFIG_PROFILES = {
+    "s3": ("latency",),
+    "glue": ("long",),
+}
+
+# Process-wide registry. Sessions, clients and resources are created once
+# and reused by every request handled by this process (or Lambda container).
+_registry_lock = threading.RLock()
+_sessions = {}
+_clients = {}
+_resources = {}
+_tables = {}
+_configs = {}
+
+
+def get_client_config(profile: str = "default"):
+    """Get botocore Config of a named profile (see CLIENT_CONFIG_PROFILES),
+    values from env `AWS_CLIENT_<PROFILE>_<OPTION>` take precedence.
+
+    Args:
+        profile (str, optional): name of config profile. Defaults to "default".
+
+    Raises:
+        InternalException: if profile doesn't exist
+
+    Returns:
+        Config: botocore config
+    """
+    config = _configs.get(profile)
+
+    if config is not None:
+        return config
+
+    if profile not in CLIENT_CONFIG_PROFILES:
+        raise Exps.InternalException(f"Unknown client config profile: {profile}")
+
+    options = dict(CLIENT_CONFIG_PROFILES[profile])
+    env_prefix = f"AWS_CLIENT_{profile.upper()}_"
+
+    for option, default_value in options.items():
+        value = os.getenv(env_prefix + option.upper())
+
+        if value is None or value.strip() == "":
+            continue
+
+        options[option] = type(default_value)(value)
+
+    config = Config(
+        max_pool_connections=options["max_pool_connections"],
+        connect_timeout=options["connect_timeout"],
+        read_timeout=options["read_timeout"],
+        retries={
+            "mode": options["retry_mode"],
+            "total_max_attempts": options["max_attempts"],
+        },
+    )
+    _configs[profile] = config
+
+    return config
+
+
+def _resolve_config(
+    service_name: str, config: Config | None, config_profile: str | None
+):
+    if config is not None:
+        return config
+
+    if config_profile is None:
+        config_profile = SERVICE_CONFIG_PROFILES.get(service_name, "default")
+
+    return get_client_config(config_profile)
+
+
+def _get_config_key(config: Config | None):
+    """Build a hashable key from a botocore Config
+
+    Args:
+        config (Config | None): botocore config
+
+    Returns:
+        tuple: key of config (compared by value, not by identity)
+    """
+    if config is None:
+        return None
+
+    options = getattr(config, "_user_provided_options", {})
+    return tuple(sorted((k, repr(v)) for k, v in options.items()))
+
+
+def get_session(profile_name: str = DEFAULT_PROFILE_NAME):
+    """Get the shared boto3 session of a profile, create it if it doesn't exist
+
+    Args:
+        profile_name (str, optional): AWS profile. Defaults to DEFAULT_PROFILE_NAME.
+
+    Returns:
+        boto3.Session: shared session
+    """
+    session = _sessions.get(profile_name)
+
+    if session is not None:
+        return session
+
+    with _registry_lock:
+        session = _sessions.get(profile_name)
+
+        if session is None:
+            # Empty profile means "use the default credential chain" (Lambda role)
+            session = boto3.Session(profile_name=profile_name or None)
+            _sessions[profile_name] = session
+
+    return session
+
 
 def get_client(
     service_name: str,
     profile_name: str = DEFAULT_PROFILE_NAME,
     region_name: str = DEFAULT_REGION_NAME,
+    config: Config | None = None,
+    config_profile: str | None = None,
 ):
-    # Create a session using the named profile 'vsl'
-    session = boto3.Session(profile_name=profile_name)
+    """Get a shared client of a service. Clients are cached per
+    (service, profile, region, config) and are thread-safe to use.
+
+    Args:
+        service_name (str): name of AWS service
+        profile_name (str, optional): AWS profile. Defaults to DEFAULT_PROFILE_NAME.
+        region_name (str, optional): AWS region. Defaults to DEFAULT_REGION_NAME.
+        config (Config, optional): botocore config of client. Defaults to None.
+        config_profile (str, optional): name of config profile, used when config
+            isn't set. Defaults to the profile of service in SERVICE_CONFIG_PROFILES.
+
+    Returns:
+        botocore.client.BaseClient: shared client
+    """
+    config = _resolve_config(service_name, config, config_profile)
+    key = (service_name, profile_name, region_name, _get_config_key(config))
+    client = _clients.get(key)
+
+    if client is not None:
+        return client
+
+    # boto3.Session is not thread-safe, so clients are created under the lock
+    with _registry_lock:
+        client = _clients.get(key)
+
+        if client is None:
+            session = get_session(profile_name)
+            client = session.client(
+                service_name=service_name, region_name=region_name, config=config
+            )
+            _clients[key] = client
 
-    # Create a Service client from the session
-    client = session.client(service_name=service_name, region_name=region_name)
     return client
 
 
@@ -32,36 +220,131 @@ def get_resource(
     service_name: str,
     profile_name: str = DEFAULT_PROFILE_NAME,
     region_name: str = DEFAULT_REGION_NAME,
+    config: Config | None = None,
+    config_profile: str | None = None,
 ):
-    # Create a session using the named profile 'vsl'
-    session = boto3.Session(profile_name=profile_name)
+    """Get a shared resource of a service. Resources are cached per
+    (service, profile, region, config).
+
+    Args:
+        service_name (str): name of AWS service
+        profile_name (str, optional): AWS profile. Defaults to DEFAULT_PROFILE_NAME.
+        region_name (str, optional): AWS region. Defaults to DEFAULT_REGION_NAME.
+        config (Config, optional): botocore config of resource. Defaults to None.
+        config_profile (str, optional): name of config profile, used when config
+            isn't set. Defaults to the profile of service in SERVICE_CONFIG_PROFILES.
+
+    Returns:
+        boto3.resources.base.ServiceResource: shared resource
+    """
+    config = _resolve_config(service_name, config, config_profile)
+    key = (service_name, profile_name, region_name, _get_config_key(config))
+    resource = _resources.get(key)
+
+    if resource is not None:
+        return resource
+
+    with _registry_lock:
+        resource = _resources.get(key)
+
+        if resource is None:
+            session = get_session(profile_name)
+            resource = session.resource(
+                service_name, region_name=region_name, config=config
+            )
+            _resources[key] = resource
 
-    # Create a service resource
-    resource = session.resource(service_name, region_name=region_name)
     return resource
 
 
-def get_bedrock_client():
-    return get_client("bedrock-runtime")
+def warm_up_clients(*service_names: str):
+    """Create clients (and DynamoDB resource) ahead of the first request.
+    It should be called at Lambda init, errors are logged but not raised.
 
+    Args:
+        *service_names (str): services to warm up. Defaults to DEFAULT_WARM_UP_SERVICES.
+    """
+    if not service_names:
+        service_names = DEFAULT_WARM_UP_SERVICES
 
-def get_s3_client():
-    return get_client("s3")
+    for service_name in service_names:
+        try:
+            get_client(service_name)
 
+            for config_profile in EXTRA_SERVICE_CONFIG_PROFILES.get(service_name, ()):
+                get_client(service_name, config_profile=config_profile)
 
-def get_cognito_client():
-    return get_client("cognito-idp")
+            if service_name == "dynamodb":
+                get_resource(service_name)
+        except Exception as error:
+            logger.warning(f"Cannot warm up client of {service_name}: {error}")
 
 
-def get_glue_client():
-    return get_client("glue")
+def reset_clients():
+    """Drop all cached sessions, clients, resources and tables.
+    Use in tests (or after changing credentials) to get fresh clients.
+    """
+    with _registry_lock:
+        _tables.clear()
+        _resources.clear()
+        _clients.clear()
+        _sessions.clear()
+        _configs.clear()
 
 
-def get_dynamodb_client():
-    return get_client("dynamodb")
+def resolve_client(params: dict, get_default_client, key: str = "client"):
+    """Get client which is passed by caller, the default client is only
+    resolved when caller doesn't pass one. Use it instead of
+    `params.get("client", get_*_client())`, which always evaluates the default.
+
+    Args:
+        params (dict): parameters of a helper
+        get_default_client (Callable): factory of default client, e.g. get_s3_client
+        key (str, optional): key of client in params. Defaults to "client".
+
+    Returns:
+        botocore.client.BaseClient: client
+    """
+    client = params.get(key)
+
+    if client is None:
+        client = get_default_client()
+
+    return client
+
+
+def get_bedrock_client(config_profile: str | None = None):
+    return get_client("bedrock-runtime", config_profile=config_profile)
+
+
+def get_s3_client(config_profile: str | None = None):
+    return get_client("s3", config_profile=config_profile)
+
+
+def get_cognito_client(config_profile: str | None = None):
+    return get_client("cognito-idp", config_profile=config_profile)
+
+
+def get_glue_client(config_profile: str | None = None):
+    return get_client("glue", config_profile=config_profile)
+
+
+def get_dynamodb_client(config_profile: str | None = None):
+    return get_client("dynamodb", config_profile=config_profile)
+
+
+def get_dynamodb_resource(config_profile: str | None = None):
+    return get_resource("dynamodb", config_profile=config_profile)
 
 
 def get_dynamodb_table(table_name: str):
-    resource = get_resource("dynamodb")
+    table = _tables.get(table_name)
+
+    if table is not None:
+        return table
+
+    resource = get_dynamodb_resource()
     table = resource.Table(table_name)
+    _tables[table_name] = table
+
     return table
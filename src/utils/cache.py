@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by total weight of its values (e.g.
+    number of bytes). Least recently used entries are evicted first, a value
+    heavier than the bound is never stored. Entries can also expire after a
+    time to live.
+
+    Args:
+        max_weight (int): maximum total weight of cached values
+        weigh (Callable, optional): weight of a value. Defaults to len.
+        ttl (float, optional): default seconds to live of entries. Defaults to forever.
+    """
+
+    def __init__(self, max_weight: int, weigh=len, ttl: float | None = None):
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self._weigh = weigh
+        self._entries = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key, default=None):
+        """Get a value and mark it as recently used
+
+        Args:
+            key (Hashable): key of value
+            default (Any, optional): returned when key isn't cached. Defaults to None.
+
+        Returns:
+            Any: cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if (
+                entry is not None
+                and entry[2] is not None
+                and entry[2] <= time.monotonic()
+            ):
+                self._remove(key)
+                self._counters["expirations"] += 1
+                entry = None
+
+            if entry is None:
+                self._counters["misses"] += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+
+            return entry[0]
+
+    def set(self, key, value, weight: int | None = None, ttl: float | None = None):
+        """Cache a value, evict least recently used values to stay in bound
+
+        Args:
+            key (Hashable): key of value
+            value (Any): value to cache
+            weight (int, optional): weight of value. Defaults to weigh(value).
+            ttl (float, optional): seconds to live of value. Defaults to ttl of cache.
+
+        Returns:
+            bool: True if value is cached
+        """
+        if weight is None:
+            weight = self._weigh(value)
+
+        if ttl is None:
+            ttl = self.ttl
+
+        expires_at = None if ttl is None else time.monotonic() + ttl
+
+        with self._lock:
+            self._remove(key)
+
+            if weight > self.max_weight:
+                return False
+
+            self._entries[key] = (value, weight, expires_at)
+            self._weight += weight
+
+            while self._weight > self.max_weight:
+                _, (_, evicted_weight, _) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+                self._counters["evictions"] += 1
+
+            return True
+
+    def pop(self, key, default=None):
+        """Remove a value from cache
+
+        Args:
+            key (Hashable): key of value
+            default (Any, optional): returned when key isn't cached. Defaults to None.
+
+        Returns:
+            Any: removed value or default
+        """
+        with self._lock:
+            entry = self._remove(key)
+
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def stats(self):
+        """Get counters of cache
+
+        Returns:
+            dict: hits, misses, evictions, expirations, entries and weight
+        """
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "weight": self._weight,
+                "max_weight": self.max_weight,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            return entry is not None and (
+                entry[2] is None or entry[2] > time.monotonic()
+            )
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._weight -= entry[1]
+
+        return entry
@@ -5,7 +5,7 @@ from utils.constants import (
     DEFAULT_REGION_NAME,
 )
 from utils.exceptions import BadRequestException
-from utils.aws_clients import get_cognito_client
+from utils.aws_clients import get_cognito_client, resolve_client
 from utils.helpers.other import extract_kwargs
 from utils.helpers.string import is_empty
 from utils.helpers.boolean import check_empty_or_throw_error
@@ -25,7 +25,7 @@ def get_user(**params):
     Returns:
         dict: Phản hồi từ Cognito chứa thông tin chi tiết của người dùng.
     """
-    cognito_client = params.get("client", get_cognito_client())
+    cognito_client = resolve_client(params, get_cognito_client)
 
     username = params.get("username", "")
 
@@ -54,7 +54,7 @@ def get_tokens_from_refresh_token(**params):
     Returns:
         dict: Phản hồi từ Cognito chứa Access token và Id token mới.
     """
-    cognito_client = params.get("client", get_cognito_client())
+    cognito_client = resolve_client(params, get_cognito_client)
 
     refresh_token = params.get("refresh_token", "")
 
@@ -86,7 +86,7 @@ def initiate_auth(**params):
     Returns:
         dict: Kết quả phản hồi từ Cognito sau khi xác thực người dùng.
     """
-    cognito_client = params.get("client", get_cognito_client())
+    cognito_client = resolve_client(params, get_cognito_client)
 
     username = params.get("username", "")
     email = params.get("email", "")
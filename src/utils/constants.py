@@ -26,3 +26,78 @@ RULESET_MAPPING_DYNAMODB_TABLE_NAME = os.getenv(
     "RULESET_MAPPING_DYNAMODB_TABLE_NAME", None
 )
 RULESET_DYNAMODB_STATE_GSI_NAME = os.getenv("RULESET_DYNAMODB_STATE_GSI_NAME", None)
+# Sparse GSIs on `team#state` / `owner#state` (sort key created_at)
+DATACONTRACT_DYNAMODB_TEAM_STATE_GSI_NAME = os.getenv(
+    "DATACONTRACT_DYNAMODB_TEAM_STATE_GSI_NAME", None
+)
+DATACONTRACT_DYNAMODB_OWNER_STATE_GSI_NAME = os.getenv(
+    "DATACONTRACT_DYNAMODB_OWNER_STATE_GSI_NAME", None
+)
+RULESET_DYNAMODB_TEAM_STATE_GSI_NAME = os.getenv(
+    "RULESET_DYNAMODB_TEAM_STATE_GSI_NAME", None
+)
+RULESET_DYNAMODB_OWNER_STATE_GSI_NAME = os.getenv(
+    "RULESET_DYNAMODB_OWNER_STATE_GSI_NAME", None
+)
+# Largest page size of list endpoints, bigger `limit`s are capped to it
+LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "100"))
+# Number of threads which run blocking AWS calls for async helpers
+AIO_MAX_WORKERS = int(os.getenv("AIO_MAX_WORKERS", "20"))
+# Streaming multipart upload to S3 (utils.s3.upload_stream)
+S3_MULTIPART_PART_SIZE = int(os.getenv("S3_MULTIPART_PART_SIZE", str(8 * 1024 * 1024)))
+S3_MULTIPART_CONCURRENCY = int(os.getenv("S3_MULTIPART_CONCURRENCY", "4"))
+# Bulk server-side move in S3 (utils.s3.move_files)
+S3_MULTIPART_COPY_PART_SIZE = int(
+    os.getenv("S3_MULTIPART_COPY_PART_SIZE", str(512 * 1024 * 1024))
+)
+S3_COPY_CONCURRENCY = int(os.getenv("S3_COPY_CONCURRENCY", "10"))
+# Read-through cache of S3 documents (utils.s3_cache)
+S3_CACHE_MAX_BYTES = int(os.getenv("S3_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+S3_CACHE_MAX_OBJECT_BYTES = int(
+    os.getenv("S3_CACHE_MAX_OBJECT_BYTES", str(4 * 1024 * 1024))
+)
+S3_CACHE_DISK_ENABLED = os.getenv("S3_CACHE_DISK_ENABLED", "false").lower() == "true"
+S3_CACHE_DISK_MAX_BYTES = int(
+    os.getenv("S3_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))
+)
+S3_CACHE_FRESH_SECONDS = float(os.getenv("S3_CACHE_FRESH_SECONDS", "0"))
+# Presigned download urls of contracts and rulesets, in seconds
+S3_PRESIGNED_URL_TTL = int(os.getenv("S3_PRESIGNED_URL_TTL", "300"))
+S3_PRESIGNED_URL_MAX_TTL = int(os.getenv("S3_PRESIGNED_URL_MAX_TTL", "3600"))
+# In-process index of object names by state (utils.s3_index): seconds
+# before a state is listed again, objects of other processes show up then
+S3_INDEX_MAX_AGE_SECONDS = float(os.getenv("S3_INDEX_MAX_AGE_SECONDS", "60"))
+# Batch reads and writes of DynamoDB (utils.dynamodb.batch_*)
+DYNAMODB_BATCH_CONCURRENCY = int(os.getenv("DYNAMODB_BATCH_CONCURRENCY", "4"))
+DYNAMODB_BATCH_MAX_RETRIES = int(os.getenv("DYNAMODB_BATCH_MAX_RETRIES", "8"))
+# Parallel scan of DynamoDB (utils.dynamodb.parallel_scan), 0 RCU = no limit
+DYNAMODB_SCAN_SEGMENTS = int(os.getenv("DYNAMODB_SCAN_SEGMENTS", "4"))
+DYNAMODB_SCAN_MAX_RCU = float(os.getenv("DYNAMODB_SCAN_MAX_RCU", "0"))
+# Retries of DynamoDB transactions cancelled by a concurrent transaction
+DYNAMODB_TRANSACTION_MAX_RETRIES = int(
+    os.getenv("DYNAMODB_TRANSACTION_MAX_RETRIES", "3")
+)
+# Read cache of DynamoDB queries: default TTL (0 = disabled), TTL per table
+# as `table=seconds,...` and maximum number of cached items
+DYNAMODB_CACHE_TTL_SECONDS = float(os.getenv("DYNAMODB_CACHE_TTL_SECONDS", "30"))
+DYNAMODB_CACHE_TABLE_TTLS = os.getenv("DYNAMODB_CACHE_TABLE_TTLS", "")
+DYNAMODB_CACHE_MAX_ITEMS = int(os.getenv("DYNAMODB_CACHE_MAX_ITEMS", "5000"))
+# GetJobRuns calls running at the same time in utils.glue.list_jobs_overview
+GLUE_JOB_RUNS_CONCURRENCY = int(os.getenv("GLUE_JOB_RUNS_CONCURRENCY", "8"))
+# Cache of Glue job definitions (utils.glue_cache), TTL in seconds (0 = disabled)
+GLUE_JOB_CACHE_TTL_SECONDS = float(os.getenv("GLUE_JOB_CACHE_TTL_SECONDS", "30"))
+GLUE_JOB_CACHE_MAX_ITEMS = int(os.getenv("GLUE_JOB_CACHE_MAX_ITEMS", "500"))
+# Job definition calls of Glue (GetJob, UpdateJob): requests per second and
+# burst of the process, retries of throttled or concurrently modified updates
+GLUE_API_RATE = float(os.getenv("GLUE_API_RATE", "5"))
+GLUE_API_BURST = float(os.getenv("GLUE_API_BURST", "10"))
+GLUE_MAX_RETRIES = int(os.getenv("GLUE_MAX_RETRIES", "5"))
+# Activations running at the same time in bulk ruleset activation
+RULESET_BULK_ACTIVATION_CONCURRENCY = int(
+    os.getenv("RULESET_BULK_ACTIVATION_CONCURRENCY", "4")
+)
+# Watcher of Glue job runs (utils.glue_watcher): delay between polls grows
+# from initial to max delay while the run doesn't change, in seconds
+GLUE_WATCH_INITIAL_DELAY = float(os.getenv("GLUE_WATCH_INITIAL_DELAY", "2"))
+GLUE_WATCH_MAX_DELAY = float(os.getenv("GLUE_WATCH_MAX_DELAY", "30"))
+GLUE_WATCH_IDLE_SECONDS = float(os.getenv("GLUE_WATCH_IDLE_SECONDS", "10"))
@@ -1,18 +1,93 @@
+import base64
+import copy
+import functools
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Tuple, Union
 
 import boto3
 from botocore.exceptions import ClientError
 from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 
 # Import utils
 import utils.exceptions as Exps
-from utils.aws_clients import get_dynamodb_table
+from utils.aws_clients import get_dynamodb_resource, get_dynamodb_table
+from utils.constants import (
+    DYNAMODB_BATCH_CONCURRENCY,
+    DYNAMODB_BATCH_MAX_RETRIES,
+    DYNAMODB_SCAN_SEGMENTS,
+    DYNAMODB_SCAN_MAX_RCU,
+    DYNAMODB_TRANSACTION_MAX_RETRIES,
+    DYNAMODB_CACHE_TTL_SECONDS,
+    DYNAMODB_CACHE_TABLE_TTLS,
+    DYNAMODB_CACHE_MAX_ITEMS,
+)
 from utils.helpers.boolean import (
     is_empty,
     check_none_or_throw_error,
     check_empty_or_throw_error,
     check_attr_in_dict_or_throw_error,
 )
+from utils.cache import LRUCache
+from utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Limits of BatchGetItem and BatchWriteItem per request
+MAX_BATCH_GET_ITEMS = 100
+MAX_BATCH_WRITE_ITEMS = 25
+# Full jitter backoff between retries of unprocessed items, in seconds
+_BATCH_RETRY_BASE_DELAY = 0.05
+_BATCH_RETRY_MAX_DELAY = 5
+# Attribute counting updates of an item, for optimistic concurrency
+REVISION_ATTRIBUTE = "revision"
+# Limit of TransactWriteItems per request
+MAX_TRANSACTION_ITEMS = 100
+TRANSACTION_ACTIONS = frozenset(("put", "update", "delete", "check"))
+
+_transaction_counters_lock = threading.Lock()
+_transaction_counters = {
+    "transactions": 0,
+    "committed": 0,
+    "condition_failures": 0,
+    "transaction_conflicts": 0,
+    "retries": 0,
+}
+
+
+def _parse_table_ttls(value: str):
+    """Parse `table=seconds,table=seconds` into a dict"""
+    ttls = {}
+
+    for pair in (value or "").split(","):
+        table_name, _, seconds = pair.partition("=")
+
+        if table_name.strip() and seconds.strip():
+            ttls[table_name.strip()] = float(seconds)
+
+    return ttls
+
+
+# Read cache of query results, bounded by number of items. Metadata of data
+# contracts and rulesets only changes through the write helpers of this
+# module, which invalidate the tables they touch; writes of other processes
+# are picked up when entries expire.
+_read_cache = LRUCache(
+    DYNAMODB_CACHE_MAX_ITEMS,
+    weigh=lambda result: max(1, len(result["items"])) if "items" in result else 1,
+)
+_table_cache_ttls = _parse_table_ttls(DYNAMODB_CACHE_TABLE_TTLS)
+# A write bumps the generation of its table, so cached results (and results
+# of queries running during the write) of older generations are never read
+_cache_generations = {}
+_cache_lock = threading.Lock()
+_cache_counters = {"bypasses": 0, "invalidations": 0}
 
 
 class EnumComparisonOperator:
@@ -29,26 +104,40 @@ class EnumComparisonOperator:
     Between = "in"
 
     @classmethod
-    def all(cls) -> set[str]:
-        return {
-            cls.Equal,
-            cls.NotEqual,
-            cls.LargeThan,
-            cls.LargeThanOrEqual,
-            cls.GreatThan,
-            cls.GreatThanOrEqual,
-            cls.Contains,
-            cls.NotContains,
-            cls.BeginsWith,
-            cls.Exists,
-            cls.Between,
-        }
+    def all(cls) -> frozenset[str]:
+        return _ALL_OPERATORS
 
     @classmethod
     def validate(cls, op: str):
-        if op not in cls.all():
-            return False
-        return True
+        return op in _ALL_OPERATORS
+
+
+_ALL_OPERATORS = frozenset(
+    (
+        EnumComparisonOperator.Equal,
+        EnumComparisonOperator.NotEqual,
+        EnumComparisonOperator.LargeThan,
+        EnumComparisonOperator.LargeThanOrEqual,
+        EnumComparisonOperator.GreatThan,
+        EnumComparisonOperator.GreatThanOrEqual,
+        EnumComparisonOperator.Contains,
+        EnumComparisonOperator.NotContains,
+        EnumComparisonOperator.BeginsWith,
+        EnumComparisonOperator.Exists,
+        EnumComparisonOperator.Between,
+    )
+)
+# Operators allowed on a sort key by KeyConditionExpression (partition keys
+# only allow equality)
+_KEY_CONDITION_TEMPLATES = {
+    EnumComparisonOperator.Equal: "#sk = :sk",
+    EnumComparisonOperator.LargeThan: "#sk < :sk",
+    EnumComparisonOperator.LargeThanOrEqual: "#sk <= :sk",
+    EnumComparisonOperator.GreatThan: "#sk > :sk",
+    EnumComparisonOperator.GreatThanOrEqual: "#sk >= :sk",
+    EnumComparisonOperator.BeginsWith: "begins_with(#sk, :sk)",
+    EnumComparisonOperator.Between: "#sk BETWEEN :sk0 AND :sk1",
+}
 
 
 class Condition:
@@ -58,6 +147,106 @@ class Condition:
         self.value = value
 
 
+class QuerySpec:
+    """Shape of a query (table, index, key names, operators and projection),
+    validated and compiled once into KeyConditionExpression and
+    ExpressionAttributeNames. Each call only binds values with bind.
+
+    Use get_query_spec to share specs of the same shape.
+
+    Args:
+        table_name (str): name of the DynamoDB table
+        index_name (str): name of the index, "" for the table
+        partition_key (str): name of partition key
+        sort_key (str, optional): name of sort key. Defaults to None (no sort condition).
+        sort_op (str, optional): operator of sort condition. Defaults to "eq".
+        fields (tuple[str], optional): names of attributes to return. Defaults to all.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        index_name: str,
+        partition_key: str,
+        sort_key: str | None = None,
+        sort_op: str | None = None,
+        fields: tuple = (),
+    ):
+        check_empty_or_throw_error(
+            table_name, "table_name", "Table name is required to query item"
+        )
+        check_empty_or_throw_error(
+            partition_key,
+            "partition_query",
+            "key of partition_query is required to query item",
+        )
+
+        self.table_name = table_name
+        self.index_name = index_name
+        self.sort_op = None
+        names = {"#pk": partition_key}
+        expression = "#pk = :pk"
+
+        if sort_key:
+            self.sort_op = sort_op or EnumComparisonOperator.Equal
+            template = _KEY_CONDITION_TEMPLATES.get(self.sort_op)
+
+            if template is None:
+                raise Exps.InternalException(
+                    "Invalid comparison expression in sort query"
+                )
+
+            names["#sk"] = sort_key
+            expression = f"{expression} AND {template}"
+
+        projection = _build_projection(list(fields))
+        names.update(projection.pop("ExpressionAttributeNames", {}))
+
+        self._names = names
+        self._params = {"KeyConditionExpression": expression, **projection}
+
+        if index_name:
+            self._params["IndexName"] = index_name
+
+    def bind(self, partition_value, sort_value=None):
+        """Get parameters of Table.query with values of the keys
+
+        Args:
+            partition_value (Any): value of partition key
+            sort_value (Any, optional): value of sort key, (low, high) for "in"
+
+        Returns:
+            dict: KeyConditionExpression, ExpressionAttributeNames,
+                ExpressionAttributeValues (and IndexName, ProjectionExpression)
+        """
+        values = {":pk": partition_value}
+
+        if self.sort_op == EnumComparisonOperator.Between:
+            values[":sk0"], values[":sk1"] = sort_value
+        elif self.sort_op is not None:
+            values[":sk"] = sort_value
+
+        return {
+            **self._params,
+            # boto3 adds names of FilterExpression to this dict, never share it
+            "ExpressionAttributeNames": dict(self._names),
+            "ExpressionAttributeValues": values,
+        }
+
+
+@functools.lru_cache(maxsize=256)
+def get_query_spec(
+    table_name: str,
+    index_name: str,
+    partition_key: str,
+    sort_key: str | None = None,
+    sort_op: str | None = None,
+    fields: tuple = (),
+):
+    """Get the shared QuerySpec of a shape, see QuerySpec for arguments"""
+    return QuerySpec(table_name, index_name, partition_key, sort_key, sort_op, fields)
+
+
 def build_expression(cond: Condition, use_key: bool = False):
     expr_target = Key(cond.key) if use_key else Attr(cond.key)
 
@@ -86,12 +275,14 @@ def build_expression(cond: Condition, use_key: bool = False):
             raise Exps.InternalException(f"Unsupported operator: {cond.operator}")
 
 
-def build_update_expressions(update_data: dict):
+def build_update_expressions(update_data: dict, revision_attribute: str | None = None):
     """Build UpdateExpression, ExpressionAttributeValues and ExpressionAttributeNames
     from data of item
 
     Args:
         update_data (dict): data item to update
+        revision_attribute (str, optional): attribute incremented by every
+            update (starting from 1). Defaults to None (no revision).
 
     Returns:
         dict: response from Table.update_item
@@ -99,56 +290,132 @@ def build_update_expressions(update_data: dict):
     if not update_data:
         raise Exps.InternalException("Data item is required to update item")
 
+    if revision_attribute and revision_attribute in update_data:
+        raise Exps.InternalException(
+            f"{revision_attribute} is maintained by updates, it can't be set"
+        )
+
+    update_expression, expression_names, static_values = _compile_update_expression(
+        tuple(update_data), revision_attribute
+    )
+    expression_values = {f":{k}": v for k, v in update_data.items()}
+    expression_values.update(static_values)
+
+    # Compiled names are shared, callers get their own copy
+    return update_expression, expression_values, dict(expression_names)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_update_expression(attribute_names: tuple, revision_attribute: str | None):
+    """Build UpdateExpression and ExpressionAttributeNames of a set of
+    attributes once, only values change between updates of the same shape"""
     expression_names = {}
-    expression_values = {}
+    static_values = {}
     update_parts = []
 
-    for k, v in update_data.items():
+    for k in attribute_names:
         placeholder_name = f"#{k}"
         placeholder_value = f":{k}"
         expression_names[placeholder_name] = k
-        expression_values[placeholder_value] = v
         update_parts.append(f"{placeholder_name} = {placeholder_value}")
 
+    if revision_attribute:
+        expression_names["#rev_attr"] = revision_attribute
+        static_values[":rev_zero"] = 0
+        static_values[":rev_step"] = 1
+        update_parts.append(
+            "#rev_attr = if_not_exists(#rev_attr, :rev_zero) + :rev_step"
+        )
+
     update_expression = "SET " + ", ".join(update_parts)
-    return update_expression, expression_values, expression_names
+    return update_expression, expression_names, static_values
 
 
-def query_items(**params: Any):
-    """Query items in a table with partition key (sort key is optional)
+def build_revision_condition(revision_attribute: str, expected_revision: int):
+    """Build ConditionExpression checking the current revision of an item,
+    items never updated with a revision are at revision 0
 
     Args:
-        **params: Dictionary of parameters:
-            - table_name (str): Name of the DynamoDB table to query. This is required.
-            - partition_query (dict, optional): Dictionary specifying the partition key condition. Include:
-                - key: name of partition key
-                - value: value of partition key
-                - op: operator which is used to compare
-            - sort_query (dict, optional): Dictionary specifying the sort key condition. Include:
-                - key: name of sort key
-                - value: value of sort key
-                - op: operator which is used to compare
-            - limit (int, optional): Maximum number of items to return
-            - start_point (dict): Dictionary specifying the start of new query. Include:
-                - key: name of start point
-                - value: value of start point
+        revision_attribute (str): attribute of revision
+        expected_revision (int): revision the caller has read
+
+    Returns:
+        tuple: ConditionExpression, ExpressionAttributeValues and
+            ExpressionAttributeNames
+    """
+    names = {"#rev_attr": revision_attribute}
+    values = {":rev_expected": int(expected_revision)}
+    condition = "#rev_attr = :rev_expected"
+
+    if int(expected_revision) == 0:
+        condition = f"attribute_not_exists(#rev_attr) OR {condition}"
+
+    return condition, values, names
+
 
+_type_serializer = TypeSerializer()
+_type_deserializer = TypeDeserializer()
+
+
+def encode_cursor(last_evaluated_key: dict | None):
+    """Encode LastEvaluatedKey of a query into an opaque cursor. Every
+    attribute of the key (e.g. name and version, plus keys of GSI) is kept
+    with its DynamoDB type, so the cursor resumes at the exact item.
+
+    Args:
+        last_evaluated_key (dict | None): LastEvaluatedKey of a query
 
     Returns:
-        dict: response from Table.query
+        str | None: url-safe cursor, None if there is nothing left to read
     """
-    table_name = params.get("table_name", "")
+    if not last_evaluated_key:
+        return None
+
+    typed_key = {
+        name: _type_serializer.serialize(value)
+        for name, value in last_evaluated_key.items()
+    }
+    raw = json.dumps(typed_key, separators=(",", ":"), sort_keys=True)
+
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None):
+    """Decode a cursor created by encode_cursor into an ExclusiveStartKey
+
+    Args:
+        cursor (str | None): cursor of a previous page
+
+    Raises:
+        BadRequestException: if cursor is malformed
+
+    Returns:
+        dict | None: ExclusiveStartKey
+    """
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        typed_key = json.loads(raw)
+
+        return {
+            name: _type_deserializer.deserialize(value)
+            for name, value in typed_key.items()
+        }
+    except (ValueError, TypeError, AttributeError, KeyError):
+        raise Exps.BadRequestException("Cursor is invalid")
+
+
+def _bind_query(params: dict):
+    """Validate partition and sort query of parameters, then bind them to the
+    QuerySpec of their shape"""
     partition_query = params.get("partition_query", None)
     sort_query = params.get("sort_query", None)
-    limit = params.get("limit", 10)
-    start_point = params.get("start_point", None)
-
-    check_empty_or_throw_error(table_name, "table_name")
+    fields = params.get("fields", None)
 
     check_none_or_throw_error(
-        partition_query,
-        "partition_query",
-        "partition_query is required to query item",
+        partition_query, "partition_query", "partition_query is required to query item"
     )
     check_attr_in_dict_or_throw_error(
         "key",
@@ -163,20 +430,10 @@ def query_items(**params: Any):
         "value of partition_query is required to query item",
     )
 
-    if partition_query.get("op", None) is None:
-        partition_query["op"] = EnumComparisonOperator.Equal
-
-    if not EnumComparisonOperator.validate(partition_query.get("op")):
+    if partition_query.get("op") not in (None, EnumComparisonOperator.Equal):
         raise Exps.InternalException("Invalid comparison expression in partition query")
 
-    key_condition_exp = build_expression(
-        Condition(
-            key=partition_query.get("key"),
-            value=partition_query.get("value"),
-            operator=partition_query.get("op"),
-        ),
-        use_key=True,
-    )
+    sort_key, sort_op, sort_value = None, None, None
 
     if sort_query:
         check_attr_in_dict_or_throw_error(
@@ -192,25 +449,81 @@ def query_items(**params: Any):
             "value of sort_query is required to query item",
         )
 
-        if sort_query.get("op", None) is None:
-            sort_query["op"] = EnumComparisonOperator.Equal
+        sort_key = sort_query.get("key")
+        sort_op = sort_query.get("op")
+        sort_value = sort_query.get("value")
+
+    spec = get_query_spec(
+        params.get("table_name", ""),
+        params.get("index_name", "") or "",
+        partition_query.get("key"),
+        sort_key,
+        sort_op,
+        tuple(fields or ()),
+    )
 
-        if not EnumComparisonOperator.validate(sort_query.get("op")):
-            raise Exps.InternalException("Invalid comparison expression in sort query")
+    return spec.bind(partition_query.get("value"), sort_value)
 
-        key_condition_exp = key_condition_exp & build_expression(
-            Condition(
-                key=sort_query.get("key"),
-                value=sort_query.get("value"),
-                operator=sort_query.get("op"),
-            ),
-            use_key=True,
+
+def _build_filter(filters: list | None):
+    """Validate filters (list of key, value, op) and build FilterExpression
+    joined with AND"""
+    filter_exp = None
+
+    for cond in filters or []:
+        check_attr_in_dict_or_throw_error(
+            "key", cond, "filters", "key of filter is required to filter items"
         )
 
-    _params = {"KeyConditionExpression": key_condition_exp}
+        op = cond.get("op", None) or EnumComparisonOperator.Equal
+
+        if not EnumComparisonOperator.validate(op):
+            raise Exps.InternalException("Invalid comparison expression in filters")
+
+        if op == EnumComparisonOperator.Exists:
+            exp = Attr(cond.get("key")).exists()
+        else:
+            check_attr_in_dict_or_throw_error(
+                "value", cond, "filters", "value of filter is required to filter items"
+            )
+            exp = build_expression(
+                Condition(key=cond.get("key"), value=cond.get("value"), operator=op)
+            )
+
+        filter_exp = exp if filter_exp is None else filter_exp & exp
+
+    return filter_exp
+
+
+def _build_projection(fields: list | None):
+    """Build ProjectionExpression and its ExpressionAttributeNames from names
+    of top-level attributes. Every name goes through a placeholder, so
+    reserved words (e.g. `name`, `state`) can be projected.
+    """
+    if not fields:
+        return {}
+
+    names = {f"#p{i}": field for i, field in enumerate(dict.fromkeys(fields))}
+
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def _get_start_key(params: dict):
+    """Get ExclusiveStartKey from `cursor`, `start_key` or (single attribute)
+    `start_point` of parameters
+    """
+    cursor = params.get("cursor", None)
+    start_key = params.get("start_key", None)
+    start_point = params.get("start_point", None)
+
+    if cursor:
+        return decode_cursor(cursor)
 
-    if limit is not None:
-        _params["Limit"] = limit
+    if start_key:
+        return start_key
 
     if start_point is not None:
         check_attr_in_dict_or_throw_error(
@@ -226,17 +539,358 @@ def query_items(**params: Any):
             "value of start_point is required to query item",
         )
 
-        _params["ExclusiveStartKey"] = {
-            start_point.get("key"): start_point.get("value")
-        }
+        return {start_point.get("key"): start_point.get("value")}
+
+    return None
+
+
+def iter_query_pages(**params):
+    """Query items page by page. A page is requested only when the previous
+    one is consumed, so a large partition (e.g. state=approved of a GSI) is
+    read in constant memory.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of the DynamoDB table to query. This is required.
+            - index_name (str, optional): Name of the Global Secondary Index (GSI) to query. Defaults to the table.
+            - partition_query (dict): Partition key condition (key, value, op). This is required.
+            - sort_query (dict, optional): Sort key condition (key, value, op).
+            - cursor (str, optional): Cursor of a previous page to resume from.
+            - start_key (dict, optional): ExclusiveStartKey with every key attribute, used when cursor isn't set.
+            - page_size (int, optional): Maximum number of items per request. Defaults to as many as fit in 1 MB.
+            - max_items (int, optional): Stop after this number of items (across pages).
+            - scan_forward (bool, optional): Order by sort key ascending. Defaults to True.
+            - fields (list[str], optional): Names of attributes to return. Defaults to all.
+            - consistent_read (bool, optional): Use strongly consistent reads (tables only, not GSIs). Defaults to False.
+
+    Yields:
+        dict: items of a page and cursor to resume after it (None when
+            there is nothing left)
+    """
+    table_name = params.get("table_name", "")
+    page_size = params.get("page_size", None)
+    max_items = params.get("max_items", None)
+    scan_forward = params.get("scan_forward", True)
+    consistent_read = params.get("consistent_read", False)
+
+    check_empty_or_throw_error(
+        table_name, "table_name", "Table name is required to query item"
+    )
+
+    _params = _bind_query(params)
+
+    if consistent_read:
+        _params["ConsistentRead"] = True
+
+    if not scan_forward:
+        _params["ScanIndexForward"] = False
+
+    start_key = _get_start_key(params)
+
+    if start_key:
+        _params["ExclusiveStartKey"] = start_key
+
+    remaining = max_items
+    table = get_dynamodb_table(table_name)
+
+    while remaining is None or remaining > 0:
+        # Never read more than the budget, so the last key of the page is
+        # exactly where the next call must resume
+        if remaining is not None:
+            _params["Limit"] = (
+                remaining if page_size is None else min(page_size, remaining)
+            )
+        elif page_size is not None:
+            _params["Limit"] = page_size
+
+        response = table.query(**_params)
+        items = response.get("Items", [])
+        last_evaluated_key = response.get("LastEvaluatedKey")
+
+        if remaining is not None:
+            remaining -= len(items)
+
+        yield {"items": items, "cursor": encode_cursor(last_evaluated_key)}
+
+        if not last_evaluated_key:
+            return
+
+        _params["ExclusiveStartKey"] = last_evaluated_key
+
+
+def iter_query_items(**params):
+    """Query items one by one across pages, see iter_query_pages for parameters
+
+    Yields:
+        dict: item
+    """
+    for page in iter_query_pages(**params):
+        yield from page["items"]
+
+
+def set_table_cache_ttl(table_name: str, seconds: float):
+    """Set seconds to live of cached query results of a table, 0 disables
+    the cache of the table"""
+    with _cache_lock:
+        _table_cache_ttls[table_name] = seconds
+
+
+def _get_table_cache_ttl(table_name: str):
+    with _cache_lock:
+        return _table_cache_ttls.get(table_name, DYNAMODB_CACHE_TTL_SECONDS)
+
+
+def _get_cache_key(table_name: str, params: dict, kind: str = "query"):
+    with _cache_lock:
+        generation = _cache_generations.get(table_name, 0)
+
+    query = {
+        name: params.get(name)
+        for name in (
+            "partition_query",
+            "sort_query",
+            "cursor",
+            "start_key",
+            "start_point",
+            "page_size",
+            "max_items",
+            "scan_forward",
+            "fields",
+            "filters",
+        )
+    }
+
+    # Queries with and without the default operator are the same query
+    for name in ("partition_query", "sort_query"):
+        if query[name]:
+            query[name] = {
+                **query[name],
+                "op": query[name].get("op") or EnumComparisonOperator.Equal,
+            }
+
+    return (
+        table_name,
+        generation,
+        kind,
+        params.get("index_name", ""),
+        json.dumps(query, sort_keys=True, default=str),
+    )
+
+
+def invalidate_cache(*table_names: str):
+    """Drop cached query results of tables (every table if none is given)"""
+    with _cache_lock:
+        _cache_counters["invalidations"] += 1
+
+        if not table_names:
+            _cache_generations.clear()
+            _read_cache.clear()
+            return
+
+        for table_name in table_names:
+            _cache_generations[table_name] = _cache_generations.get(table_name, 0) + 1
+
+
+def get_cache_stats():
+    """Get counters of the read cache
+
+    Returns:
+        dict: hits, misses, expirations, evictions, bypasses, invalidations,
+            entries and items (weight) of cached results
+    """
+    with _cache_lock:
+        stats = dict(_cache_counters)
+
+    cache = _read_cache.stats()
+    stats.update(
+        hits=cache["hits"],
+        misses=cache["misses"],
+        expirations=cache["expirations"],
+        evictions=cache["evictions"],
+        entries=cache["entries"],
+        items=cache["weight"],
+        max_items=cache["max_weight"],
+    )
+
+    return stats
+
+
+def _read_query_page(**params):
+    items = []
+    cursor = params.get("cursor", None)
+
+    for page in iter_query_pages(**params):
+        items.extend(page["items"])
+        cursor = page["cursor"]
+
+    return {"items": items, "cursor": cursor}
+
+
+def _read_through_cache(read, kind: str, params: dict):
+    """Return read(**params) from the read cache, or read and cache it"""
+    table_name = params.get("table_name", "")
+    consistent_read = params.get("consistent_read", False)
+    use_cache = params.get("use_cache", True)
+    ttl = _get_table_cache_ttl(table_name)
+
+    if ttl <= 0:
+        return read(**params)
+
+    if consistent_read or not use_cache:
+        with _cache_lock:
+            _cache_counters["bypasses"] += 1
+
+        return read(**params)
+
+    # Key (with generation) is taken before the query, a write during the
+    # query makes its result unreachable
+    key = _get_cache_key(table_name, params, kind)
+    result = _read_cache.get(key)
+
+    if result is None:
+        result = read(**params)
+        _read_cache.set(key, copy.deepcopy(result), ttl=ttl)
+
+        return result
+
+    # Callers may change items, they never share them with the cache
+    return copy.deepcopy(result)
+
+
+def query_items_page(**params):
+    """Query up to `max_items` items (across pages) and a cursor to get the
+    next ones, see iter_query_pages for parameters.
+
+    Results are cached per table + index + key condition for the TTL of the
+    table (DYNAMODB_CACHE_TTL_SECONDS or DYNAMODB_CACHE_TABLE_TTLS). Set
+    `consistent_read` (or `use_cache` to False) to read from DynamoDB.
+
+    Returns:
+        dict: items and cursor (None when there is nothing left)
+    """
+    return _read_through_cache(_read_query_page, "query", params)
+
+
+def _count_items(**params):
+    table_name = params.get("table_name", "")
+    filters = params.get("filters", None)
+    consistent_read = params.get("consistent_read", False)
+
+    check_empty_or_throw_error(
+        table_name, "table_name", "Table name is required to count items"
+    )
+
+    _params = _bind_query({**params, "fields": None})
+    _params["Select"] = "COUNT"
+
+    if consistent_read:
+        _params["ConsistentRead"] = True
+
+    filter_exp = _build_filter(filters)
+
+    if filter_exp is not None:
+        _params["FilterExpression"] = filter_exp
 
     table = get_dynamodb_table(table_name)
-    response = table.query(**_params)
+    count = 0
+
+    # Only counts are returned, but a page still stops at 1 MB of read items
+    while True:
+        response = table.query(**_params)
+        count += response.get("Count", 0)
+        last_evaluated_key = response.get("LastEvaluatedKey")
+
+        if not last_evaluated_key:
+            return {"count": count}
+
+        _params["ExclusiveStartKey"] = last_evaluated_key
+
+
+def count_items(**params):
+    """Count items matching a key condition (Select=COUNT across pages), no
+    item is transferred. Counts are cached like query results.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of the DynamoDB table to query. This is required.
+            - index_name (str, optional): Name of the Global Secondary Index (GSI) to query. Defaults to the table.
+            - partition_query (dict): Partition key condition (key, value, op). This is required.
+            - sort_query (dict, optional): Sort key condition (key, value, op).
+            - filters (list[dict], optional): Conditions (key, value, op) that items must match, joined with AND.
+            - consistent_read (bool, optional): Read from DynamoDB (not the cache) with strongly consistent reads. Defaults to False.
+
+    Returns:
+        int: number of items
+    """
+    return _read_through_cache(_count_items, "count", params)["count"]
+
+
+def exists(**params):
+    """Check if an item matches a key condition, reading at most one item
+    with only its partition key (no BadRequestException when there is none)
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of the DynamoDB table to query. This is required.
+            - index_name (str, optional): Name of the Global Secondary Index (GSI) to query. Defaults to the table.
+            - partition_query (dict): Partition key condition (key, value, op). This is required.
+            - sort_query (dict, optional): Sort key condition (key, value, op).
+            - consistent_read (bool, optional): Read from DynamoDB (not the cache) with strongly consistent reads. Defaults to False.
+
+    Returns:
+        bool: True if an item exists
+    """
+    partition_query = params.get("partition_query", None)
 
-    if not response.get("Items"):
+    check_none_or_throw_error(
+        partition_query, "partition_query", "partition_query is required to query item"
+    )
+
+    page = query_items_page(
+        **{**params, "max_items": 1, "fields": [partition_query.get("key")]}
+    )
+
+    return len(page["items"]) > 0
+
+
+def query_items(**params: Any):
+    """Query items in a table with partition key (sort key is optional)
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of the DynamoDB table to query. This is required.
+            - partition_query (dict, optional): Dictionary specifying the partition key condition. Include:
+                - key: name of partition key
+                - value: value of partition key
+                - op: operator which is used to compare
+            - sort_query (dict, optional): Dictionary specifying the sort key condition. Include:
+                - key: name of sort key
+                - value: value of sort key
+                - op: operator which is used to compare
+            - limit (int, optional): Maximum number of items to return (across pages). Defaults to all items.
+            - cursor (str, optional): Cursor of a previous page (see query_items_page).
+            - start_key (dict, optional): ExclusiveStartKey with every key attribute.
+            - start_point (dict): Dictionary specifying the start of new query (single attribute key). Include:
+                - key: name of start point
+                - value: value of start point
+            - fields (list[str], optional): Names of attributes to return. Defaults to all.
+            - consistent_read (bool, optional): Read from DynamoDB (not the cache) with strongly consistent reads. Defaults to False.
+
+
+    Returns:
+        dict: response from Table.query
+    """
+    table_name = params.get("table_name", "")
+    limit = params.get("limit", None)
+
+    check_empty_or_throw_error(table_name, "table_name")
+
+    items = query_items_page(**params, max_items=limit)["items"]
+
+    if not items:
         raise Exps.BadRequestException("Items are not found")
 
-    return response.get("Items")
+    return items
 
 
 def query_items_with_gsi(**params):
@@ -254,20 +908,21 @@ def query_items_with_gsi(**params):
                 - key: name of sort key
                 - value: value of sort key
                 - op: operator which is used to compare
-            - limit (int, optional): Maximum number of items to return
-            - start_point (dict): Dictionary specifying the start of new query. Include:
+            - limit (int, optional): Maximum number of items to return (across pages). Defaults to all items.
+            - cursor (str, optional): Cursor of a previous page (see query_items_page).
+            - start_key (dict, optional): ExclusiveStartKey with every key attribute (table and index keys).
+            - start_point (dict): Dictionary specifying the start of new query (single attribute key). Include:
                 - key: name of start point
                 - value: value of start point
+            - fields (list[str], optional): Names of attributes to return. Defaults to all.
+            - consistent_read (bool, optional): Read from DynamoDB (not the cache) with strongly consistent reads. Defaults to False.
 
     Returns:
         dict: response from Table.query
     """
     table_name = params.get("table_name", "")
     index_name = params.get("index_name", "")
-    partition_query = params.get("partition_query", None)
-    sort_query = params.get("sort_query", None)
     limit = params.get("limit", None)
-    start_point = params.get("start_point", None)
 
     check_empty_or_throw_error(
         table_name, "table_name", "Table name is required to query item"
@@ -276,96 +931,12 @@ def query_items_with_gsi(**params):
         index_name, "index_name", "Index name is required to query item with GSI"
     )
 
-    check_none_or_throw_error(
-        partition_query, "partition_query", "partition_query is required to query item"
-    )
-    check_attr_in_dict_or_throw_error(
-        "key",
-        partition_query,
-        "partition_query",
-        "key of partition_query is required to query item",
-    )
-    check_attr_in_dict_or_throw_error(
-        "value",
-        partition_query,
-        "partition_query",
-        "value of partition_query is required to query item",
-    )
-
-    if partition_query.get("op", None) is None:
-        partition_query["op"] = EnumComparisonOperator.Equal
-
-    if not EnumComparisonOperator.validate(partition_query.get("op")):
-        raise Exps.InternalException("Invalid comparison expression in partition query")
-
-    key_condition_exp = build_expression(
-        Condition(
-            key=partition_query.get("key"),
-            value=partition_query.get("value"),
-            operator=partition_query.get("op"),
-        ),
-        use_key=True,
-    )
-
-    if sort_query:
-        check_attr_in_dict_or_throw_error(
-            "key",
-            sort_query,
-            "sort_query",
-            "key of sort_query is required to query item",
-        )
-        check_attr_in_dict_or_throw_error(
-            "value",
-            sort_query,
-            "sort_query",
-            "value of sort_query is required to query item",
-        )
-
-        if sort_query.get("op", None) is None:
-            sort_query["op"] = EnumComparisonOperator.Equal
-
-        if not EnumComparisonOperator.validate(sort_query.get("op")):
-            raise Exps.InternalException("Invalid comparison expression in sort query")
-
-        key_condition_exp = key_condition_exp & build_expression(
-            Condition(
-                key=sort_query.get("key"),
-                value=sort_query.get("value"),
-                operator=sort_query.get("op"),
-            ),
-            use_key=True,
-        )
-
-    _params = {"IndexName": index_name, "KeyConditionExpression": key_condition_exp}
-
-    if limit is not None:
-        _params["Limit"] = limit
-
-    if start_point is not None:
-        check_attr_in_dict_or_throw_error(
-            "key",
-            start_point,
-            "start_point",
-            "key of start_point is required to query item",
-        )
-        check_attr_in_dict_or_throw_error(
-            "value",
-            start_point,
-            "start_point",
-            "value of start_point is required to query item",
-        )
-
-        _params["ExclusiveStartKey"] = {
-            start_point.get("key"): start_point.get("value")
-        }
-
-    table = get_dynamodb_table(table_name)
-    response = table.query(**_params)
+    items = query_items_page(**params, max_items=limit)["items"]
 
-    if not response.get("Items"):
+    if not items:
         raise Exps.BadRequestException("Items are not found")
 
-    return response.get("Items")
+    return items
 
 
 def query_item(**params):
@@ -386,6 +957,8 @@ def query_item(**params):
             - start_point (dict): Dictionary specifying the start of new query. Include:
                 - key: name of start point
                 - value: value of start point
+            - fields (list[str], optional): Names of attributes to return. Defaults to all.
+            - consistent_read (bool, optional): Read from DynamoDB (not the cache) with strongly consistent reads. Defaults to False.
 
     Returns:
         dict: response from Table.query
@@ -412,11 +985,13 @@ def query_item_with_gsi(**params):
             - start_point (dict): Dictionary specifying the start of new query. Include:
                 - key: name of start point
                 - value: value of start point
+            - fields (list[str], optional): Names of attributes to return. Defaults to all.
+            - consistent_read (bool, optional): Read from DynamoDB (not the cache) with strongly consistent reads. Defaults to False.
 
     Returns:
         dict: response from Table.query
     """
-    return query_item_with_gsi(**params, limit=1)[0]
+    return query_items_with_gsi(**params, limit=1)[0]
 
 
 def add_item(**params):
@@ -443,6 +1018,7 @@ def add_item(**params):
 
     table = get_dynamodb_table(table_name)
     table.put_item(Item=data)
+    invalidate_cache(table_name)
 
     return data
 
@@ -460,14 +1036,24 @@ def update_item(**params):
             - sort_query (dict): Dictionary with keys:
                 - key (str): Name of the sort key.
                 - value: Value of the sort key used to locate the item. This is required.
+            - expected_revision (int, optional): Revision the caller has read, the update fails with
+                RevisionConflictException if the item was updated since. Defaults to no check.
+            - revision_attribute (str, optional): Attribute incremented by the update, None to keep no
+                revision. Defaults to REVISION_ATTRIBUTE.
+            - expected (dict, optional): Expected current values of attributes (None as value means
+                the attribute must not exist), the item must exist too. The update fails with
+                ConflictException if one doesn't match. Defaults to no check.
 
     Returns:
-        dict: new data of item
+        dict: new data of item (with its new revision)
     """
     table_name = params.get("table_name", "")
     data = params.get("data", None)
     partition_query = params.get("partition_query", None)
     sort_query = params.get("sort_query", None)
+    expected_revision = params.get("expected_revision", None)
+    expected = params.get("expected", None)
+    revision_attribute = params.get("revision_attribute", REVISION_ATTRIBUTE)
 
     check_empty_or_throw_error(
         table_name, "table_name", "Table name is required to update item"
@@ -514,20 +1100,68 @@ def update_item(**params):
     )
 
     update_expression, expression_values, expression_names = build_update_expressions(
-        data
+        data, revision_attribute
     )
 
-    table = get_dynamodb_table(table_name)
-    response = table.update_item(
-        Key={
+    _params = {
+        "Key": {
             partition_query.get("key"): partition_query.get("value"),
             sort_query.get("key"): sort_query.get("value"),
         },
-        UpdateExpression=update_expression,
-        ExpressionAttributeValues=expression_values,
-        ExpressionAttributeNames=expression_names,
-        ReturnValues="UPDATED_NEW",
-    )
+        "UpdateExpression": update_expression,
+        "ExpressionAttributeValues": expression_values,
+        "ExpressionAttributeNames": expression_names,
+        "ReturnValues": "UPDATED_NEW",
+    }
+
+    conditions = []
+
+    if expected is not None:
+        expected_condition = _build_expected_condition(
+            expected, partition_query.get("key")
+        )
+        conditions.append(expected_condition["ConditionExpression"])
+        expression_values.update(
+            expected_condition.get("ExpressionAttributeValues", {})
+        )
+        expression_names.update(expected_condition["ExpressionAttributeNames"])
+
+    if expected_revision is not None:
+        if not revision_attribute:
+            raise Exps.InternalException(
+                "revision_attribute is required to check expected_revision"
+            )
+
+        condition, condition_values, condition_names = build_revision_condition(
+            revision_attribute, expected_revision
+        )
+        conditions.append(f"({condition})")
+        expression_values.update(condition_values)
+        expression_names.update(condition_names)
+
+    if conditions:
+        _params["ConditionExpression"] = " AND ".join(conditions)
+
+    table = get_dynamodb_table(table_name)
+
+    try:
+        response = table.update_item(**_params)
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code") != (
+            "ConditionalCheckFailedException"
+        ):
+            raise
+
+        if expected_revision is None:
+            raise Exps.ConflictException(
+                "Item was changed by another request, reload it and try again"
+            )
+
+        raise Exps.RevisionConflictException(
+            f"Item was updated since revision {expected_revision}, reload it and try again"
+        )
+
+    invalidate_cache(table_name)
 
     attrs = response.get("Attributes", {})
     attrs[partition_query.get("key")] = partition_query.get("value")
@@ -603,5 +1237,660 @@ def delete_item(**params):
             sort_query.get("key"): sort_query.get("value"),
         }
     )
+    invalidate_cache(table_name)
 
     return True
+
+
+def _get_key_values(item: dict, key_names: tuple):
+    return tuple(item.get(name) for name in key_names)
+
+
+def _sleep_before_retry(attempt: int):
+    delay = min(_BATCH_RETRY_MAX_DELAY, _BATCH_RETRY_BASE_DELAY * 2**attempt)
+    time.sleep(random.uniform(0, delay))
+
+
+def _run_chunks(run_chunk, chunks: list, concurrency: int):
+    if len(chunks) <= 1 or concurrency <= 1:
+        for chunk in chunks:
+            run_chunk(chunk)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+        # list() re-raises unexpected errors of chunks
+        list(executor.map(run_chunk, chunks))
+
+
+def batch_get_items(**params):
+    """Get many items by key. Keys are sent in chunks of 100 (BatchGetItem
+    limit) which run concurrently, unprocessed keys are retried with jittered
+    exponential backoff.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of the DynamoDB table. This is required.
+            - keys (list[dict]): Keys of items, each with every key attribute, e.g. {"name": "a", "version": "1.0"}. This is required.
+            - consistent_read (bool, optional): Use strongly consistent reads. Defaults to False.
+            - concurrency (int, optional): Number of chunks running at the same time. Defaults to DYNAMODB_BATCH_CONCURRENCY.
+            - max_retries (int, optional): Retries of unprocessed keys. Defaults to DYNAMODB_BATCH_MAX_RETRIES.
+
+    Returns:
+        list[dict]: outcome of each key (same order as keys) with key, item
+            (None if not found), status ("found", "not_found" or "failed")
+            and error
+    """
+    table_name = params.get("table_name", "")
+    keys = params.get("keys", None)
+    consistent_read = params.get("consistent_read", False)
+    concurrency = params.get("concurrency", DYNAMODB_BATCH_CONCURRENCY)
+    max_retries = params.get("max_retries", DYNAMODB_BATCH_MAX_RETRIES)
+
+    check_empty_or_throw_error(
+        table_name, "table_name", "Table name is required to get items"
+    )
+    check_none_or_throw_error(keys, "keys", "Keys are required to get items")
+
+    if not keys:
+        return []
+
+    key_names = tuple(sorted(keys[0]))
+    outcomes = {}
+
+    # BatchGetItem rejects duplicated keys in a request
+    unique_keys = {}
+    for key in keys:
+        unique_keys.setdefault(_get_key_values(key, key_names), key)
+
+    resource = get_dynamodb_resource()
+
+    def get_chunk(chunk: list):
+        pending = chunk
+
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                _sleep_before_retry(attempt)
+
+            request = {"Keys": pending}
+            if consistent_read:
+                request["ConsistentRead"] = True
+
+            try:
+                response = resource.batch_get_item(RequestItems={table_name: request})
+            except ClientError as error:
+                for key in pending:
+                    outcomes[_get_key_values(key, key_names)] = (
+                        "failed",
+                        None,
+                        str(error),
+                    )
+                return
+
+            for item in response.get("Responses", {}).get(table_name, []):
+                outcomes[_get_key_values(item, key_names)] = ("found", item, None)
+
+            pending = (
+                response.get("UnprocessedKeys", {}).get(table_name, {}).get("Keys", [])
+            )
+
+            if not pending:
+                return
+
+        logger.warning(f"{len(pending)} keys of {table_name} are still unprocessed")
+        for key in pending:
+            outcomes[_get_key_values(key, key_names)] = (
+                "failed",
+                None,
+                f"Key is unprocessed after {max_retries} retries",
+            )
+
+    unique_key_list = list(unique_keys.values())
+    chunks = [
+        unique_key_list[i : i + MAX_BATCH_GET_ITEMS]
+        for i in range(0, len(unique_key_list), MAX_BATCH_GET_ITEMS)
+    ]
+    _run_chunks(get_chunk, chunks, concurrency)
+
+    results = []
+    for key in keys:
+        status, item, error = outcomes.get(
+            _get_key_values(key, key_names), ("not_found", None, None)
+        )
+        results.append({"key": key, "item": item, "status": status, "error": error})
+
+    return results
+
+
+def batch_write_items(**params):
+    """Put and delete many items. Requests are sent in chunks of 25
+    (BatchWriteItem limit) which run concurrently, unprocessed items are
+    retried with jittered exponential backoff.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of the DynamoDB table. This is required.
+            - put_items (list[dict], optional): Items to put (add or replace).
+            - delete_keys (list[dict], optional): Keys of items to delete.
+            - concurrency (int, optional): Number of chunks running at the same time. Defaults to DYNAMODB_BATCH_CONCURRENCY.
+            - max_retries (int, optional): Retries of unprocessed items. Defaults to DYNAMODB_BATCH_MAX_RETRIES.
+
+    Returns:
+        list[dict]: outcome of each request (puts first, then deletes, in
+            the given order) with operation ("put" or "delete"), index (in
+            its list), key, status ("ok" or "failed") and error. A key
+            written more than once is written by its first request only,
+            the next ones fail.
+    """
+    table_name = params.get("table_name", "")
+    put_items = params.get("put_items", None) or []
+    delete_keys = params.get("delete_keys", None) or []
+    concurrency = params.get("concurrency", DYNAMODB_BATCH_CONCURRENCY)
+    max_retries = params.get("max_retries", DYNAMODB_BATCH_MAX_RETRIES)
+
+    check_empty_or_throw_error(
+        table_name, "table_name", "Table name is required to write items"
+    )
+
+    if not put_items and not delete_keys:
+        raise Exps.InternalException("Items to put or keys to delete are required")
+
+    table = get_dynamodb_table(table_name)
+    key_names = tuple(sorted(schema["AttributeName"] for schema in table.key_schema))
+
+    results = []
+    for index, item in enumerate(put_items):
+        results.append(
+            {
+                "operation": "put",
+                "index": index,
+                "key": {name: item.get(name) for name in key_names},
+                "request": {"PutRequest": {"Item": item}},
+            }
+        )
+    for index, key in enumerate(delete_keys):
+        results.append(
+            {
+                "operation": "delete",
+                "index": index,
+                "key": {name: key.get(name) for name in key_names},
+                "request": {"DeleteRequest": {"Key": key}},
+            }
+        )
+
+    # BatchWriteItem rejects a whole request writing one key twice, only the
+    # first write of a key is sent, the others fail on their own
+    written = {}
+    unique_results = []
+    for result in results:
+        key_values = _get_key_values(result["key"], key_names)
+        first = written.setdefault(key_values, result)
+
+        if first is result:
+            unique_results.append(result)
+        else:
+            result["status"] = "failed"
+            result["error"] = (
+                f"Key is already written by {first['operation']} {first['index']}"
+            )
+
+    resource = get_dynamodb_resource()
+
+    def get_request_id(request: dict):
+        item = request.get("PutRequest", {}).get("Item") or request.get(
+            "DeleteRequest", {}
+        ).get("Key", {})
+
+        return _get_key_values(item, key_names)
+
+    def write_chunk(chunk: list):
+        by_request_id = {get_request_id(result["request"]): result for result in chunk}
+        pending = [result["request"] for result in chunk]
+
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                _sleep_before_retry(attempt)
+
+            try:
+                response = resource.batch_write_item(RequestItems={table_name: pending})
+            except ClientError as error:
+                for request in pending:
+                    result = by_request_id[get_request_id(request)]
+                    result["status"], result["error"] = "failed", str(error)
+                return
+
+            unprocessed = response.get("UnprocessedItems", {}).get(table_name, [])
+            unprocessed_ids = {get_request_id(request) for request in unprocessed}
+
+            for request in pending:
+                request_id = get_request_id(request)
+                if request_id not in unprocessed_ids:
+                    by_request_id[request_id]["status"] = "ok"
+                    by_request_id[request_id]["error"] = None
+
+            pending = unprocessed
+
+            if not pending:
+                return
+
+        logger.warning(f"{len(pending)} writes of {table_name} are still unprocessed")
+        for request in pending:
+            result = by_request_id[get_request_id(request)]
+            result["status"] = "failed"
+            result["error"] = f"Item is unprocessed after {max_retries} retries"
+
+    chunks = [
+        unique_results[i : i + MAX_BATCH_WRITE_ITEMS]
+        for i in range(0, len(unique_results), MAX_BATCH_WRITE_ITEMS)
+    ]
+    try:
+        _run_chunks(write_chunk, chunks, concurrency)
+    finally:
+        invalidate_cache(table_name)
+
+    return [
+        {
+            "operation": result["operation"],
+            "index": result["index"],
+            "key": result["key"],
+            "status": result.get("status", "failed"),
+            "error": result.get("error"),
+        }
+        for result in results
+    ]
+
+
+def parallel_scan(**params):
+    """Scan a whole table (or index) with `total_segments` workers, each
+    reading its own Segment on a thread pool, and yield their items as one
+    stream. Items of different segments are interleaved, in no particular
+    order.
+
+    Reads can be limited in consumed read capacity units per second, so
+    maintenance jobs (audit, migration, re-index) don't starve the API.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of the DynamoDB table to scan. This is required.
+            - index_name (str, optional): Name of the index to scan. Defaults to the table.
+            - filters (list[dict], optional): Conditions (key, value, op) that items must match, joined with AND.
+            - fields (list[str], optional): Names of attributes to return. Defaults to all.
+            - total_segments (int, optional): Number of segments (and workers). Defaults to DYNAMODB_SCAN_SEGMENTS.
+            - page_size (int, optional): Maximum number of items per request. Defaults to as many as fit in 1 MB.
+            - max_rcu (float, optional): Maximum consumed RCUs per second, 0 for no limit. Defaults to DYNAMODB_SCAN_MAX_RCU.
+            - consistent_read (bool, optional): Use strongly consistent reads. Defaults to False.
+
+    Yields:
+        dict: item
+    """
+    table_name = params.get("table_name", "")
+    index_name = params.get("index_name", "")
+    filters = params.get("filters", None)
+    fields = params.get("fields", None)
+    total_segments = params.get("total_segments", DYNAMODB_SCAN_SEGMENTS)
+    page_size = params.get("page_size", None)
+    max_rcu = params.get("max_rcu", DYNAMODB_SCAN_MAX_RCU)
+    consistent_read = params.get("consistent_read", False)
+
+    check_empty_or_throw_error(
+        table_name, "table_name", "Table name is required to scan items"
+    )
+
+    if total_segments < 1:
+        raise Exps.InternalException("total_segments must be at least 1")
+
+    _params = {"ReturnConsumedCapacity": "TOTAL", **_build_projection(fields)}
+
+    filter_exp = _build_filter(filters)
+
+    if filter_exp is not None:
+        _params["FilterExpression"] = filter_exp
+
+    if index_name:
+        _params["IndexName"] = index_name
+
+    if page_size is not None:
+        _params["Limit"] = page_size
+
+    if consistent_read:
+        _params["ConsistentRead"] = True
+
+    if total_segments > 1:
+        _params["TotalSegments"] = total_segments
+
+    table = get_dynamodb_table(table_name)
+    limiter = TokenBucket(max_rcu) if max_rcu else None
+    # Bounded, so workers don't read far ahead of a slow consumer
+    pages = queue.Queue(maxsize=total_segments * 2)
+    stopped = threading.Event()
+    done = object()
+
+    def put(value):
+        while not stopped.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def scan_segment(segment: int):
+        segment_params = dict(_params)
+
+        if total_segments > 1:
+            segment_params["Segment"] = segment
+
+        try:
+            while not stopped.is_set():
+                # Consumed capacity is only known after the request: take
+                # a unit up front, pay the rest once the page is read
+                if limiter is not None:
+                    limiter.acquire(1)
+
+                response = table.scan(**segment_params)
+
+                if limiter is not None:
+                    consumed = response.get("ConsumedCapacity", {})
+                    limiter.debit(consumed.get("CapacityUnits", 1) - 1)
+
+                put(response.get("Items", []))
+
+                last_evaluated_key = response.get("LastEvaluatedKey")
+
+                if not last_evaluated_key:
+                    break
+
+                segment_params["ExclusiveStartKey"] = last_evaluated_key
+        except Exception as error:
+            put(error)
+        finally:
+            put(done)
+
+    executor = ThreadPoolExecutor(
+        max_workers=total_segments, thread_name_prefix="dynamodb-scan"
+    )
+
+    try:
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
+
+        running = total_segments
+
+        while running:
+            page = pages.get()
+
+            if page is done:
+                running -= 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield from page
+    finally:
+        # Consumer stopped early or failed, let workers exit
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _count_transactions(**increments):
+    with _transaction_counters_lock:
+        for name, value in increments.items():
+            _transaction_counters[name] += value
+
+
+def _get_operation_key(operation: dict):
+    partition_query = operation.get("partition_query", None)
+    sort_query = operation.get("sort_query", None)
+
+    check_none_or_throw_error(
+        partition_query,
+        "partition_query",
+        "partition_query is required in operation of transaction",
+    )
+    check_attr_in_dict_or_throw_error(
+        "key",
+        partition_query,
+        "partition_query",
+        "key of partition_query is required in operation of transaction",
+    )
+    check_attr_in_dict_or_throw_error(
+        "value",
+        partition_query,
+        "partition_query",
+        "value of partition_query is required in operation of transaction",
+    )
+
+    key = {partition_query.get("key"): partition_query.get("value")}
+
+    if sort_query:
+        key[sort_query.get("key")] = sort_query.get("value")
+
+    return key
+
+
+def _build_expected_condition(expected: dict | None, must_exist_key: str | None):
+    """Build ConditionExpression (string with its own placeholders, which
+    can't be generated by boto3 inside TransactItems) from expected current
+    values of attributes. None as value means the attribute must not exist.
+    """
+    parts = []
+    names = {}
+    values = {}
+
+    if must_exist_key:
+        names["#cond_key"] = must_exist_key
+        parts.append("attribute_exists(#cond_key)")
+
+    for i, (name, value) in enumerate((expected or {}).items()):
+        names[f"#cond_{i}"] = name
+
+        if value is None:
+            parts.append(f"attribute_not_exists(#cond_{i})")
+        else:
+            values[f":cond_{i}"] = value
+            parts.append(f"#cond_{i} = :cond_{i}")
+
+    if not parts:
+        return {}
+
+    condition = {
+        "ConditionExpression": " AND ".join(parts),
+        "ExpressionAttributeNames": names,
+    }
+
+    if values:
+        condition["ExpressionAttributeValues"] = values
+
+    return condition
+
+
+def _build_transact_item(operation: dict):
+    action = operation.get("action", "")
+    table_name = operation.get("table_name", "")
+    data = operation.get("data", None)
+    expected = operation.get("expected", None)
+    expected_revision = operation.get("expected_revision", None)
+
+    check_empty_or_throw_error(
+        table_name, "table_name", "Table name is required in operation of transaction"
+    )
+
+    if action not in TRANSACTION_ACTIONS:
+        raise Exps.InternalException(f"Unsupported action of transaction: {action}")
+
+    if action == "put":
+        check_none_or_throw_error(
+            data, "item data", "Data of item is required to put item in transaction"
+        )
+
+        return {
+            "Put": {
+                "TableName": table_name,
+                "Item": data,
+                **_build_expected_condition(expected, None),
+            }
+        }
+
+    key = _get_operation_key(operation)
+    # Updates and checks never create an item which doesn't exist
+    must_exist_key = (
+        operation.get("partition_query").get("key")
+        if action in ("update", "check")
+        else None
+    )
+    condition = _build_expected_condition(expected, must_exist_key)
+
+    if expected_revision is not None:
+        revision_condition, values, names = build_revision_condition(
+            REVISION_ATTRIBUTE, expected_revision
+        )
+        parts = [condition["ConditionExpression"]] if condition else []
+        condition = {
+            "ConditionExpression": " AND ".join([*parts, f"({revision_condition})"]),
+            "ExpressionAttributeNames": {
+                **condition.get("ExpressionAttributeNames", {}),
+                **names,
+            },
+            "ExpressionAttributeValues": {
+                **condition.get("ExpressionAttributeValues", {}),
+                **values,
+            },
+        }
+
+    if action == "delete":
+        return {"Delete": {"TableName": table_name, "Key": key, **condition}}
+
+    if action == "check":
+        return {"ConditionCheck": {"TableName": table_name, "Key": key, **condition}}
+
+    update_expression, expression_values, expression_names = build_update_expressions(
+        data, REVISION_ATTRIBUTE
+    )
+    expression_names.update(condition.pop("ExpressionAttributeNames", {}))
+    expression_values.update(condition.pop("ExpressionAttributeValues", {}))
+
+    return {
+        "Update": {
+            "TableName": table_name,
+            "Key": key,
+            "UpdateExpression": update_expression,
+            "ExpressionAttributeNames": expression_names,
+            "ExpressionAttributeValues": expression_values,
+            **condition,
+        }
+    }
+
+
+def transact_write_items(**params):
+    """Write items of one or more tables in a single atomic TransactWriteItems
+    call. Every operation can state `expected` current values of attributes
+    (e.g. {"state": "inactive"}): if one doesn't match, nothing is written and
+    ConflictException (HTTP 409) is raised.
+
+    Transactions cancelled because another transaction touched the same
+    items at the same time (TransactionConflict) are retried with jittered
+    backoff. Outcomes are counted, see get_transaction_stats.
+
+    Args:
+        **params: Dictionary of parameters:
+            - operations (list[dict]): Operations of transaction. This is required. Each has:
+                - action (str): "put", "update", "delete" or "check" (condition only).
+                - table_name (str): Name of the DynamoDB table.
+                - partition_query (dict): key and value of partition key (all but put).
+                - sort_query (dict, optional): key and value of sort key.
+                - data (dict): item to put or attributes to update.
+                - expected (dict, optional): expected current values of attributes, None for not existing.
+                - expected_revision (int, optional): expected current revision (updates and checks).
+            - client_request_token (str, optional): Idempotency token of the transaction.
+            - max_retries (int, optional): Retries on TransactionConflict. Defaults to DYNAMODB_TRANSACTION_MAX_RETRIES.
+
+    Returns:
+        bool: True when the transaction is committed
+    """
+    operations = params.get("operations", None)
+    client_request_token = params.get("client_request_token", None)
+    max_retries = params.get("max_retries", DYNAMODB_TRANSACTION_MAX_RETRIES)
+
+    check_empty_or_throw_error(
+        operations, "operations", "Operations are required to write transaction"
+    )
+
+    if len(operations) > MAX_TRANSACTION_ITEMS:
+        raise Exps.InternalException(
+            f"A transaction has at most {MAX_TRANSACTION_ITEMS} operations"
+        )
+
+    _params = {"TransactItems": [_build_transact_item(op) for op in operations]}
+
+    if client_request_token:
+        _params["ClientRequestToken"] = client_request_token
+
+    # Client of the resource serializes python values (as Table does)
+    client = get_dynamodb_resource().meta.client
+
+    for attempt in range(max_retries + 1):
+        if attempt > 0:
+            _count_transactions(retries=1)
+            _sleep_before_retry(attempt)
+
+        _count_transactions(transactions=1)
+
+        try:
+            client.transact_write_items(**_params)
+            _count_transactions(committed=1)
+            invalidate_cache(*{op.get("table_name") for op in operations})
+
+            return True
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code") != (
+                "TransactionCanceledException"
+            ):
+                raise
+
+            reasons = [
+                reason.get("Code", "None")
+                for reason in error.response.get("CancellationReasons", [])
+            ]
+
+        if "ConditionalCheckFailed" in reasons:
+            _count_transactions(condition_failures=1)
+            failed = [
+                i for i, code in enumerate(reasons) if code == "ConditionalCheckFailed"
+            ]
+            logger.warning(
+                f"Transaction is cancelled by conditions of operations {failed}"
+            )
+
+            if any(operations[i].get("expected_revision") is not None for i in failed):
+                raise Exps.RevisionConflictException(
+                    "Items were updated since the given revision, reload them and try again"
+                )
+
+            raise Exps.ConflictException(
+                "Items were changed by another request, reload them and try again"
+            )
+
+        if "TransactionConflict" not in reasons:
+            raise Exps.InternalException(f"Transaction is cancelled: {reasons}")
+
+        _count_transactions(transaction_conflicts=1)
+
+    raise Exps.ConflictException(
+        f"Transaction still conflicts with others after {max_retries} retries"
+    )
+
+
+def get_transaction_stats():
+    """Get counters of transact_write_items, conflict_rate is the share of
+    transactions cancelled by a condition or a concurrent transaction
+
+    Returns:
+        dict: transactions, committed, condition_failures,
+            transaction_conflicts, retries and conflict_rate
+    """
+    with _transaction_counters_lock:
+        stats = dict(_transaction_counters)
+
+    conflicts = stats["condition_failures"] + stats["transaction_conflicts"]
+    stats["conflict_rate"] = (
+        conflicts / stats["transactions"] if stats["transactions"] else 0.0
+    )
+
+    return stats
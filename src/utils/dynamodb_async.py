@@ -0,0 +1,75 @@
+# Async variants of utils.dynamodb helpers (same parameters), see utils.aio
+
+# Import from utils
+from utils import dynamodb
+from utils.aio import run_blocking
+
+
+async def query_items(**params):
+    """Async variant of utils.dynamodb.query_items"""
+    return await run_blocking(dynamodb.query_items, **params)
+
+
+async def query_items_with_gsi(**params):
+    """Async variant of utils.dynamodb.query_items_with_gsi"""
+    return await run_blocking(dynamodb.query_items_with_gsi, **params)
+
+
+async def query_items_page(**params):
+    """Async variant of utils.dynamodb.query_items_page"""
+    return await run_blocking(dynamodb.query_items_page, **params)
+
+
+async def query_item(**params):
+    """Async variant of utils.dynamodb.query_item"""
+    return await run_blocking(dynamodb.query_item, **params)
+
+
+async def query_item_with_gsi(**params):
+    """Async variant of utils.dynamodb.query_item_with_gsi"""
+    return await run_blocking(dynamodb.query_item_with_gsi, **params)
+
+
+async def add_item(**params):
+    """Async variant of utils.dynamodb.add_item"""
+    return await run_blocking(dynamodb.add_item, **params)
+
+
+async def update_item(**params):
+    """Async variant of utils.dynamodb.update_item"""
+    return await run_blocking(dynamodb.update_item, **params)
+
+
+async def delete_item(**params):
+    """Async variant of utils.dynamodb.delete_item"""
+    return await run_blocking(dynamodb.delete_item, **params)
+
+
+async def batch_get_items(**params):
+    """Async variant of utils.dynamodb.batch_get_items"""
+    return await run_blocking(dynamodb.batch_get_items, **params)
+
+
+async def batch_write_items(**params):
+    """Async variant of utils.dynamodb.batch_write_items"""
+    return await run_blocking(dynamodb.batch_write_items, **params)
+
+
+async def scan_items(**params):
+    """Async variant of utils.dynamodb.parallel_scan, collected in a list"""
+    return await run_blocking(lambda: list(dynamodb.parallel_scan(**params)))
+
+
+async def transact_write_items(**params):
+    """Async variant of utils.dynamodb.transact_write_items"""
+    return await run_blocking(dynamodb.transact_write_items, **params)
+
+
+async def count_items(**params):
+    """Async variant of utils.dynamodb.count_items"""
+    return await run_blocking(dynamodb.count_items, **params)
+
+
+async def exists(**params):
+    """Async variant of utils.dynamodb.exists"""
+    return await run_blocking(dynamodb.exists, **params)
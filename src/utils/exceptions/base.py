@@ -25,6 +25,7 @@ class ErrorCodes:
     NotFound = "NOT_FOUND"
     MethodNotAllowed = "METHOD_NOT_ALLOWED"
     Conflict = "CONFLICT"
+    RangeNotSatisfiable = "RANGE_NOT_SATISFIABLE"
     TooManyRequests = "TOO_MANY_REQUESTS"
     ServiceUnavailable = "SERVICE_UNAVAILABLE"
     # Authentication & Authorization Errors
@@ -69,6 +70,7 @@ ErrorHttpStatusMap = {
     ErrorCodes.NotFound: 404,
     ErrorCodes.MethodNotAllowed: 405,
     ErrorCodes.Conflict: 409,
+    ErrorCodes.RangeNotSatisfiable: 416,
     ErrorCodes.TooManyRequests: 429,
     ErrorCodes.ServiceUnavailable: 503,
     ErrorCodes.AuthenticationFailed: 401,
@@ -131,6 +131,28 @@ class ConflictException(AppException):
         super().__init__(message, title, ErrorCodes.Conflict)
 
 
+class RevisionConflictException(ConflictException):
+    """Thrown when an item was updated since the revision the caller has read."""
+
+    def __init__(
+        self,
+        message="The resource was updated by another request.",
+        title="Revision Conflict",
+    ):
+        super().__init__(message, title)
+
+
+class RangeNotSatisfiableException(AppException):
+    """Thrown when the requested range of a resource cannot be served."""
+
+    def __init__(
+        self,
+        message="The requested range is not satisfiable.",
+        title="Range Not Satisfiable",
+    ):
+        super().__init__(message, title, ErrorCodes.RangeNotSatisfiable)
+
+
 class TooManyRequestsException(AppException):
     """Thrown when too many requests are made in a short period of time."""
 
@@ -1,10 +1,26 @@
 # Import built-in libraries
+import hashlib
 import json
+import logging
+import random
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Import 3rd-party libraries
+from botocore.exceptions import ClientError
 
 # Import utils
 import utils.exceptions as Exps
-from utils.aws_clients import get_glue_client
+from utils import glue_cache
+from utils.aws_clients import get_glue_client, resolve_client
+from utils.constants import (
+    GLUE_JOB_RUNS_CONCURRENCY,
+    GLUE_API_RATE,
+    GLUE_API_BURST,
+    GLUE_MAX_RETRIES,
+)
+from utils.rate_limiter import TokenBucket
 from utils.helpers.other import (
     extract_kwargs,
     convert_keys_to_camel_case,
@@ -14,6 +30,23 @@ from utils.helpers.boolean import (
     check_attr_in_dict_or_throw_error,
 )
 
+logger = logging.getLogger(__name__)
+
+# Job definition calls (GetJob, UpdateJob) of this process share one budget,
+# kept under the Glue API quota of the account
+_job_api_limiter = TokenBucket(GLUE_API_RATE, GLUE_API_BURST)
+# Errors of UpdateJob which succeed when tried again later
+_RETRYABLE_ERROR_CODES = frozenset(
+    ("ThrottlingException", "ConcurrentModificationException")
+)
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 20
+
+
+def _get_long_glue_client():
+    # UpdateJob is slow and throttled, it needs long timeouts and more retries
+    return get_glue_client("long")
+
 
 def start_job(**params):
     """Run a job (create a job run)
@@ -29,7 +62,7 @@ def start_job(**params):
     Returns:
         dict: id of new job run
     """
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, get_glue_client)
 
     job_name = params.get("job_name", "")
     prev_job_run_id = params.get("prev_job_run_id", "")
@@ -62,23 +95,22 @@ def list_jobs(**params):
             - client (boto3.client, optional): AWS Glue client instance. If not provided, a default client will be created
             - next_token (str, optional): Token for paginated results. Used to retrieve the next set of jobs
             - limit (int, optional): Maximum number of jobs to return. Default is 5
+            - refresh (bool, optional): List jobs from Glue even if the page is cached. Default is False
 
     Returns:
         dict: modified response from get_jobs
     """
 
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, get_glue_client)
 
     next_token = params.get("next_token", None)
     limit = params.get("limit", 10)
+    refresh = params.get("refresh", False)
 
-    # Prepare params for get_jobs
-    _params = {"MaxResults": limit}
-
-    if next_token is not None:
-        _params["NextToken"] = next_token
-
-    response = glue_client.get_jobs(**_params)
+    # Pages are cached shortly, see utils.glue_cache
+    response = glue_cache.get_jobs_page(
+        client=glue_client, limit=limit, next_token=next_token, refresh=refresh
+    )
     jobs = response.get("Jobs", [])
 
     return {
@@ -94,18 +126,19 @@ def get_job(**params):
         **params: Dictionary of parameters:
             - client (boto3.client, optional): AWS Glue client instance. If not provided, a default client will be created
             - job_name (str): Name of the AWS Glue job to retrieve. This is required
+            - refresh (bool, optional): Read the job from Glue even if it is cached. Default is False
 
     Returns:
         dict: Job from response from get_job
     """
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, get_glue_client)
 
     job_name = params.get("job_name", "")
+    refresh = params.get("refresh", False)
 
     check_empty_or_throw_error(job_name, "job_name")
 
-    response = glue_client.get_job(JobName=job_name)
-    job = response.get("Job")
+    job = glue_cache.get_job(client=glue_client, job_name=job_name, refresh=refresh)
 
     return convert_keys_to_camel_case(job)
 
@@ -123,7 +156,7 @@ def list_job_runs(**params):
     Returns:
         dict: modified response from get_job_runs
     """
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, get_glue_client)
 
     next_token = params.get("next_token", None)
     limit = params.get("limit", 10)
@@ -157,7 +190,7 @@ def get_job_run(**params):
     Returns:
         dict: JobRun from response from start_job_run
     """
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, get_glue_client)
 
     job_name = params.get("job_name", "")
     job_run_id = params.get("job_run_id", "")
@@ -171,6 +204,113 @@ def get_job_run(**params):
     return convert_keys_to_camel_case(job_run)
 
 
+def _elapsed_ms(started_at: float):
+    return round((time.perf_counter() - started_at) * 1000, 1)
+
+
+def list_jobs_overview(**params):
+    """List a page of jobs with the latest run of each job, in a fixed number
+    of round trips instead of one GetJob and one GetJobRuns per job:
+        - ListJobs for names of the page (skipped when job_names is given)
+        - BatchGetJobs for definitions of every job of the page
+        - GetJobRuns (1 run) of every job, running concurrently
+
+    Args:
+        **params: Dictionary of parameters:
+            - client (boto3.client, optional): AWS Glue client instance. If not provided, a default client will be created
+            - job_names (list[str], optional): Names of jobs. Defaults to a page of ListJobs
+            - next_token (str, optional): Token for paginated results. Used to retrieve the next set of jobs
+            - limit (int, optional): Maximum number of jobs to return. Default is 10
+            - concurrency (int, optional): Number of GetJobRuns calls running at the same time. Defaults to GLUE_JOB_RUNS_CONCURRENCY
+
+    Returns:
+        dict: jobs (each with latestRun, latestRunError and latestRunLatencyMs)
+            and meta with next_token, jobs_not_found and latency_ms of calls
+    """
+    glue_client = resolve_client(params, get_glue_client)
+
+    job_names = params.get("job_names", None)
+    next_token = params.get("next_token", None)
+    limit = params.get("limit", 10)
+    concurrency = params.get("concurrency", GLUE_JOB_RUNS_CONCURRENCY)
+
+    latency_ms = {}
+
+    if job_names is None:
+        _params = {"MaxResults": limit}
+
+        if next_token is not None:
+            _params["NextToken"] = next_token
+
+        started_at = time.perf_counter()
+        response = glue_client.list_jobs(**_params)
+        latency_ms["list_jobs"] = _elapsed_ms(started_at)
+
+        job_names = response.get("JobNames", [])
+        next_token = response.get("NextToken")
+    else:
+        next_token = None
+
+    if not job_names:
+        return {
+            "jobs": [],
+            "meta": {
+                "next_token": next_token,
+                "jobs_not_found": [],
+                "latency_ms": latency_ms,
+            },
+        }
+
+    versions = glue_cache.get_versions(job_names)
+
+    started_at = time.perf_counter()
+    batch_response = glue_client.batch_get_jobs(JobNames=list(job_names))
+    latency_ms["batch_get_jobs"] = _elapsed_ms(started_at)
+
+    glue_cache.put_jobs(batch_response.get("Jobs", []), versions)
+
+    jobs_by_name = {job["Name"]: job for job in batch_response.get("Jobs", [])}
+    jobs = [jobs_by_name[name] for name in job_names if name in jobs_by_name]
+
+    def get_latest_run(job: dict):
+        started_at = time.perf_counter()
+
+        try:
+            response = glue_client.get_job_runs(JobName=job["Name"], MaxResults=1)
+            job_runs = response.get("JobRuns", [])
+            return (job_runs[0] if job_runs else None), None, _elapsed_ms(started_at)
+        except ClientError as error:
+            # A job without readable runs is still listed
+            return None, str(error), _elapsed_ms(started_at)
+
+    started_at = time.perf_counter()
+
+    if len(jobs) <= 1 or concurrency <= 1:
+        latest_runs = [get_latest_run(job) for job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(jobs))) as executor:
+            latest_runs = list(executor.map(get_latest_run, jobs))
+
+    latency_ms["get_job_runs"] = _elapsed_ms(started_at)
+
+    results = []
+    for job, (latest_run, error, run_latency_ms) in zip(jobs, latest_runs):
+        result = convert_keys_to_camel_case(job)
+        result["latestRun"] = convert_keys_to_camel_case(latest_run)
+        result["latestRunError"] = error
+        result["latestRunLatencyMs"] = run_latency_ms
+        results.append(result)
+
+    return {
+        "jobs": results,
+        "meta": {
+            "next_token": next_token,
+            "jobs_not_found": batch_response.get("JobsNotFound", []),
+            "latency_ms": latency_ms,
+        },
+    }
+
+
 def start_data_quality_evaluation(**params):
     """Evaluate data quality
 
@@ -186,7 +326,7 @@ def start_data_quality_evaluation(**params):
     Returns:
         dict: response from start_data_quality_ruleset_evaluation_run
     """
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, get_glue_client)
 
     target_table = params.get("target_table", "")
     role_arn = params.get("role_arn", "")
@@ -233,7 +373,7 @@ def create_ruleset(**params):
     Returns:
         dict: response from create_data_quality_ruleset
     """
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, get_glue_client)
 
     name = params.get("name", "")
     description = params.get("description", "")
@@ -262,8 +402,36 @@ def create_ruleset(**params):
     return convert_keys_to_camel_case(response)
 
 
-def update_inline_ruleset_in_job(**params):
-    """Update a ruleset of a job (standard job)
+def normalize_ruleset(ruleset: str):
+    """Normalise DQDL content, so formatting-only differences (line endings,
+    trailing spaces, blank lines, BOM) don't count as a change
+
+    Args:
+        ruleset (str): DQDL content
+
+    Returns:
+        str: normalised DQDL content
+    """
+    lines = (ruleset or "").lstrip("\ufeff").splitlines()
+
+    return "\n".join(line.rstrip() for line in lines if line.strip())
+
+
+def hash_ruleset(ruleset: str):
+    """Get hash of normalised DQDL content
+
+    Args:
+        ruleset (str): DQDL content
+
+    Returns:
+        str: sha256 hex digest
+    """
+    return hashlib.sha256(normalize_ruleset(ruleset).encode("utf-8")).hexdigest()
+
+
+def apply_inline_ruleset_to_job(**params):
+    """Update a ruleset of a job (standard job), UpdateJob is skipped when
+    the node already holds the same DQDL (compared by hash_ruleset)
 
     Args:
         **params: Dictionary of parameters:
@@ -271,24 +439,25 @@ def update_inline_ruleset_in_job(**params):
             - job_name (str): Name of the AWS Glue job to update. This is required.
             - new_ruleset (str): New DQDL ruleset content to apply. This is required.
             - dq_node_name (str, optional): Name of the DataQuality node within the job. Default is "Evaluate Data Quality".
+            - refresh (bool, optional): Read the job definition from Glue even if it is cached. Default is False.
 
     Returns:
-        dict: name of job
+        dict: job_name, updated (False if UpdateJob was skipped) and ruleset_hash
     """
-    glue_client = params.get("client", get_glue_client())
+    glue_client = resolve_client(params, _get_long_glue_client)
 
     job_name = params.get("job_name", "")
     new_ruleset = params.get("new_ruleset", "")
     dq_node_name = params.get("dq_node_name", "")
+    refresh = params.get("refresh", False)
 
     check_empty_or_throw_error(job_name, "job_name")
 
     if not dq_node_name:
         dq_node_name = "Evaluate Data Quality"
 
-    # Lấy định nghĩa job hiện tại
-    response = glue_client.get_job(JobName=job_name)
-    job = response.get("Job")
+    # Lấy định nghĩa job hiện tại (cache được invalidate sau mỗi UpdateJob)
+    job = glue_cache.get_job(client=glue_client, job_name=job_name, refresh=refresh)
     nodes = job.get("CodeGenConfigurationNodes", {})
 
     # Tìm node EvaluateDataQualityMultiFrame theo tên
@@ -304,6 +473,14 @@ def update_inline_ruleset_in_job(**params):
             f"Cannot find EvaluateDataQualityMultiFrame with the name '{dq_node_name}' in job '{job_name}'"
         )
 
+    ruleset_hash = hash_ruleset(new_ruleset)
+    current_ruleset = nodes[dq_node_id]["EvaluateDataQualityMultiFrame"].get("Ruleset")
+
+    # Node đã có đúng ruleset này, không cần gọi UpdateJob
+    if current_ruleset is not None and hash_ruleset(current_ruleset) == ruleset_hash:
+        logger.info(f"Ruleset of job {job_name} is unchanged, UpdateJob is skipped")
+        return {"job_name": job_name, "updated": False, "ruleset_hash": ruleset_hash}
+
     # Cập nhật ruleset
     nodes[dq_node_id]["EvaluateDataQualityMultiFrame"]["Ruleset"] = new_ruleset
 
@@ -323,6 +500,63 @@ def update_inline_ruleset_in_job(**params):
     }
 
     # Gọi UpdateJob để cập nhật
-    response = glue_client.update_job(JobName=job_name, JobUpdate=job_update)
+    try:
+        response = glue_client.update_job(JobName=job_name, JobUpdate=job_update)
+    finally:
+        # The cached definition is outdated (or was stale if the update failed)
+        glue_cache.invalidate(job_name)
+
+    return {
+        "job_name": response.get("JobName", job_name),
+        "updated": True,
+        "ruleset_hash": ruleset_hash,
+    }
+
+
+def update_inline_ruleset_in_job(**params):
+    """Update a ruleset of a job (standard job), see apply_inline_ruleset_to_job
+
+    Args:
+        **params: Same parameters as apply_inline_ruleset_to_job.
+
+    Returns:
+        str: name of job
+    """
+    return apply_inline_ruleset_to_job(**params)["job_name"]
+
 
-    return response.get("JobName", "")
+def apply_inline_ruleset_with_retry(**params):
+    """Update a ruleset of a job like apply_inline_ruleset_to_job, within the
+    Glue API rate of the process (GLUE_API_RATE). ThrottlingException and
+    ConcurrentModificationException are retried with jittered exponential
+    backoff. A failed UpdateJob invalidates the cached job, so every retry
+    applies the ruleset to the current definition.
+
+    Args:
+        **params: Same parameters as apply_inline_ruleset_to_job, and:
+            - max_retries (int, optional): Retries of retryable errors. Defaults to GLUE_MAX_RETRIES.
+
+    Returns:
+        dict: job_name, updated, ruleset_hash and attempts
+    """
+    max_retries = params.get("max_retries", GLUE_MAX_RETRIES)
+
+    for attempt in range(max_retries + 1):
+        # GetJob (when the definition isn't cached) and UpdateJob
+        _job_api_limiter.acquire(2)
+
+        try:
+            result = apply_inline_ruleset_to_job(**params)
+            return {**result, "attempts": attempt + 1}
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code")
+
+            if code not in _RETRYABLE_ERROR_CODES or attempt == max_retries:
+                raise
+
+            delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2**attempt)
+            logger.warning(
+                f"UpdateJob of {params.get('job_name')} failed with {code}, "
+                f"retry {attempt + 1}/{max_retries}"
+            )
+            time.sleep(random.uniform(delay / 2, delay))
@@ -0,0 +1,60 @@
+# Async variants of utils.glue helpers (same parameters), see utils.aio
+
+# Import from utils
+from utils import glue
+from utils.aio import run_blocking
+
+
+async def start_job(**params):
+    """Async variant of utils.glue.start_job"""
+    return await run_blocking(glue.start_job, **params)
+
+
+async def list_jobs(**params):
+    """Async variant of utils.glue.list_jobs"""
+    return await run_blocking(glue.list_jobs, **params)
+
+
+async def get_job(**params):
+    """Async variant of utils.glue.get_job"""
+    return await run_blocking(glue.get_job, **params)
+
+
+async def list_job_runs(**params):
+    """Async variant of utils.glue.list_job_runs"""
+    return await run_blocking(glue.list_job_runs, **params)
+
+
+async def list_jobs_overview(**params):
+    """Async variant of utils.glue.list_jobs_overview"""
+    return await run_blocking(glue.list_jobs_overview, **params)
+
+
+async def get_job_run(**params):
+    """Async variant of utils.glue.get_job_run"""
+    return await run_blocking(glue.get_job_run, **params)
+
+
+async def start_data_quality_evaluation(**params):
+    """Async variant of utils.glue.start_data_quality_evaluation"""
+    return await run_blocking(glue.start_data_quality_evaluation, **params)
+
+
+async def create_ruleset(**params):
+    """Async variant of utils.glue.create_ruleset"""
+    return await run_blocking(glue.create_ruleset, **params)
+
+
+async def update_inline_ruleset_in_job(**params):
+    """Async variant of utils.glue.update_inline_ruleset_in_job"""
+    return await run_blocking(glue.update_inline_ruleset_in_job, **params)
+
+
+async def apply_inline_ruleset_to_job(**params):
+    """Async variant of utils.glue.apply_inline_ruleset_to_job"""
+    return await run_blocking(glue.apply_inline_ruleset_to_job, **params)
+
+
+async def apply_inline_ruleset_with_retry(**params):
+    """Async variant of utils.glue.apply_inline_ruleset_with_retry"""
+    return await run_blocking(glue.apply_inline_ruleset_with_retry, **params)
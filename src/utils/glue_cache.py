@@ -0,0 +1,223 @@
+import copy
+import threading
+
+# Import helpers
+from utils.aws_clients import get_glue_client, resolve_client
+from utils.cache import LRUCache
+from utils.constants import GLUE_JOB_CACHE_TTL_SECONDS, GLUE_JOB_CACHE_MAX_ITEMS
+from utils.helpers.boolean import check_empty_or_throw_error
+
+# Short-lived cache of Glue job definitions (raw `Job` of GetJob), shared by
+# job listing and ruleset activation.
+#   - definitions are keyed by job name, pages of GetJobs by (limit, token)
+#   - every job has a version, bumped when the job is updated through
+#     utils.glue; a read which started before an update is never cached
+#   - pages of GetJobs are keyed by a generation bumped on every update, so
+#     no page listed before an update is served after it
+# Jobs updated outside of this process are seen after the TTL, or right away
+# with `refresh=True`.
+_definitions = LRUCache(
+    GLUE_JOB_CACHE_MAX_ITEMS, weigh=lambda _: 1, ttl=GLUE_JOB_CACHE_TTL_SECONDS
+)
+_pages = LRUCache(
+    GLUE_JOB_CACHE_MAX_ITEMS,
+    weigh=lambda page: max(1, len(page.get("Jobs", []))),
+    ttl=GLUE_JOB_CACHE_TTL_SECONDS,
+)
+_lock = threading.Lock()
+_versions = {}
+_generation = 0
+_counters = {"refreshes": 0, "invalidations": 0, "stale_reads": 0, "bypasses": 0}
+
+
+def _is_enabled():
+    return GLUE_JOB_CACHE_TTL_SECONDS > 0
+
+
+def _get_versions(job_names):
+    with _lock:
+        return {name: _versions.get(name, 0) for name in job_names}, _generation
+
+
+def _store_jobs(jobs: list, versions: dict):
+    with _lock:
+        for job in jobs:
+            name = job.get("Name")
+
+            # The job was updated while it was read, its definition is stale
+            if _versions.get(name, 0) != versions.get(name, 0):
+                _counters["stale_reads"] += 1
+                continue
+
+            _definitions.set(name, job)
+
+
+def get_job(**params: dict):
+    """Get definition of a job through the cache
+
+    Args:
+        **params (dict): Dictionary of parameters. Expected keys:
+            - job_name (str): Name of the AWS Glue job. This is required.
+            - refresh (bool, optional): Read the job from Glue even if it is cached. Defaults to False.
+            - client (boto3.client, optional): AWS Glue client instance. Defaults to the shared client.
+
+    Returns:
+        dict: Job of response from get_job (a copy, safe to modify)
+    """
+    glue_client = resolve_client(params, get_glue_client)
+
+    job_name = params.get("job_name", "")
+    refresh = params.get("refresh", False)
+
+    check_empty_or_throw_error(job_name, "job_name")
+
+    if not _is_enabled():
+        with _lock:
+            _counters["bypasses"] += 1
+        return glue_client.get_job(JobName=job_name).get("Job")
+
+    if refresh:
+        with _lock:
+            _counters["refreshes"] += 1
+    else:
+        job = _definitions.get(job_name)
+
+        if job is not None:
+            return copy.deepcopy(job)
+
+    versions, _ = _get_versions([job_name])
+    job = glue_client.get_job(JobName=job_name).get("Job")
+    _store_jobs([job], versions)
+
+    return copy.deepcopy(job)
+
+
+def get_jobs_page(**params: dict):
+    """Get a page of GetJobs through the cache, definitions of its jobs are
+    cached too
+
+    Args:
+        **params (dict): Dictionary of parameters. Expected keys:
+            - limit (int, optional): Maximum number of jobs. Defaults to 10.
+            - next_token (str, optional): Token of the page. Defaults to the first page.
+            - refresh (bool, optional): List jobs from Glue even if the page is cached. Defaults to False.
+            - client (boto3.client, optional): AWS Glue client instance. Defaults to the shared client.
+
+    Returns:
+        dict: Jobs and NextToken of response from get_jobs (a copy)
+    """
+    glue_client = resolve_client(params, get_glue_client)
+
+    limit = params.get("limit", 10)
+    next_token = params.get("next_token", None)
+    refresh = params.get("refresh", False)
+
+    _params = {"MaxResults": limit}
+
+    if next_token is not None:
+        _params["NextToken"] = next_token
+
+    if not _is_enabled():
+        with _lock:
+            _counters["bypasses"] += 1
+        return glue_client.get_jobs(**_params)
+
+    with _lock:
+        generation = _generation
+        versions = dict(_versions)
+
+    key = (generation, limit, next_token)
+
+    if refresh:
+        with _lock:
+            _counters["refreshes"] += 1
+    else:
+        page = _pages.get(key)
+
+        if page is not None:
+            return copy.deepcopy(page)
+
+    response = glue_client.get_jobs(**_params)
+    page = {"Jobs": response.get("Jobs", []), "NextToken": response.get("NextToken")}
+
+    _store_jobs(page["Jobs"], versions)
+
+    with _lock:
+        if _generation == generation:
+            _pages.set(key, page)
+
+    return copy.deepcopy(page)
+
+
+def put_jobs(jobs: list, versions: dict):
+    """Cache definitions of jobs read by other calls (e.g. BatchGetJobs)
+
+    Args:
+        jobs (list[dict]): raw jobs
+        versions (dict): versions of jobs before they were read, see get_versions
+    """
+    if _is_enabled():
+        _store_jobs(jobs, versions)
+
+
+def get_versions(job_names: list):
+    """Get current versions of jobs, to be given to put_jobs
+
+    Args:
+        job_names (list[str]): names of jobs
+
+    Returns:
+        dict: job name -> version
+    """
+    return _get_versions(job_names)[0]
+
+
+def invalidate(job_name: str):
+    """Drop cached definition of a job and every cached page (call it when
+    the job is updated)
+
+    Args:
+        job_name (str): name of the job
+    """
+    global _generation
+
+    with _lock:
+        _versions[job_name] = _versions.get(job_name, 0) + 1
+        _generation += 1
+        _definitions.pop(job_name)
+        _pages.clear()
+        _counters["invalidations"] += 1
+
+
+def clear():
+    """Drop every cached definition and page"""
+    global _generation
+
+    with _lock:
+        _generation += 1
+        _definitions.clear()
+        _pages.clear()
+
+
+def get_stats():
+    """Get counters of the cache
+
+    Returns:
+        dict: hits, misses, expirations and entries of definitions and pages,
+            refreshes, invalidations, stale_reads and bypasses
+    """
+    with _lock:
+        stats = dict(_counters)
+
+    for name, cache in (("definition", _definitions), ("page", _pages)):
+        cache_stats = cache.stats()
+        stats.update(
+            {
+                f"{name}_hits": cache_stats["hits"],
+                f"{name}_misses": cache_stats["misses"],
+                f"{name}_expirations": cache_stats["expirations"],
+                f"{name}_entries": cache_stats["entries"],
+            }
+        )
+
+    return stats
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import time
+
+from botocore.exceptions import ClientError
+
+# Import utils
+import utils.exceptions as Exps
+from utils import glue_async
+from utils.constants import (
+    GLUE_WATCH_INITIAL_DELAY,
+    GLUE_WATCH_MAX_DELAY,
+    GLUE_WATCH_IDLE_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# A run in one of these states never changes again
+TERMINAL_STATES = frozenset(
+    ("SUCCEEDED", "FAILED", "STOPPED", "TIMEOUT", "ERROR", "EXPIRED")
+)
+# Attributes of a run which make a change worth pushing to watchers
+_TRACKED_ATTRIBUTES = ("jobRunState", "errorMessage", "completedOn", "attempt")
+_BACKOFF_MULTIPLIER = 1.5
+
+
+class _Watch:
+    """Poll stream of one run, shared by every watcher of the run"""
+
+    def __init__(self, job_name: str, job_run_id: str):
+        self.job_name = job_name
+        self.job_run_id = job_run_id
+        self.snapshot = None
+        self.error = None
+        self.version = 0
+        self.watchers = 0
+        self.idle_since = time.monotonic()
+        self.changed = asyncio.Condition()
+        self.task = None
+
+    @property
+    def done(self):
+        return self.error is not None or (
+            self.snapshot is not None
+            and self.snapshot.get("jobRunState") in TERMINAL_STATES
+        )
+
+
+class JobRunWatcher:
+    """Track in-flight Glue job runs for many clients at once.
+
+    Each run has at most one poll loop, whatever the number of clients
+    watching it. The loop polls GetJobRun with exponential backoff (from
+    `initial_delay` up to `max_delay`, reset on every change), stops once
+    the run reaches a terminal state, or once nobody has watched it for
+    `idle_seconds`.
+
+    Must be used from a single event loop (e.g. the FastAPI server).
+
+    Args:
+        initial_delay (float, optional): seconds between first polls. Defaults to GLUE_WATCH_INITIAL_DELAY.
+        max_delay (float, optional): maximum seconds between polls. Defaults to GLUE_WATCH_MAX_DELAY.
+        idle_seconds (float, optional): seconds a run is still polled without watchers. Defaults to GLUE_WATCH_IDLE_SECONDS.
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = GLUE_WATCH_INITIAL_DELAY,
+        max_delay: float = GLUE_WATCH_MAX_DELAY,
+        idle_seconds: float = GLUE_WATCH_IDLE_SECONDS,
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.idle_seconds = idle_seconds
+        self._watches = {}
+        self._counters = {"polls": 0, "changes": 0, "errors": 0, "streams": 0}
+
+    def track(self, job_name: str, job_run_id: str):
+        """Start polling a run (e.g. right after it is started), so the
+        first watcher gets its state without waiting"""
+        self._get_watch(job_name, job_run_id)
+
+    async def watch(self, job_name: str, job_run_id: str):
+        """Iterate changes of a run, from its current state until it ends
+
+        Yields:
+            tuple: version and snapshot (job run in camelCase) of each change
+
+        Raises:
+            Exps.NotFoundException: when the run doesn't exist
+        """
+        watch = self._get_watch(job_name, job_run_id)
+        watch.watchers += 1
+        seen = 0
+
+        try:
+            while True:
+                async with watch.changed:
+                    await watch.changed.wait_for(
+                        lambda: watch.version > seen or watch.error is not None
+                    )
+
+                if watch.version > seen:
+                    seen = watch.version
+                    yield seen, watch.snapshot
+
+                if watch.error is not None:
+                    raise watch.error
+
+                if watch.done:
+                    return
+        finally:
+            watch.watchers -= 1
+            watch.idle_since = time.monotonic()
+
+    async def wait_for_change(
+        self,
+        job_name: str,
+        job_run_id: str,
+        since_version: int = 0,
+        timeout: float = 25,
+    ):
+        """Long-poll a run: wait until its version is newer than
+        `since_version` (or timeout), then return its current state
+
+        Returns:
+            tuple: version and snapshot (None if the run wasn't read yet)
+        """
+        watch = self._get_watch(job_name, job_run_id)
+        watch.watchers += 1
+
+        try:
+            async with watch.changed:
+                try:
+                    await asyncio.wait_for(
+                        watch.changed.wait_for(
+                            lambda: watch.version > since_version
+                            or watch.error is not None
+                        ),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            if watch.error is not None:
+                raise watch.error
+
+            return watch.version, watch.snapshot
+        finally:
+            watch.watchers -= 1
+            watch.idle_since = time.monotonic()
+
+    def get_stats(self):
+        """Get counters of the watcher
+
+        Returns:
+            dict: polls, changes, errors, streams (poll loops started) and
+                active (runs being polled)
+        """
+        return {**self._counters, "active": len(self._watches)}
+
+    def _get_watch(self, job_name: str, job_run_id: str):
+        key = (job_name, job_run_id)
+        watch = self._watches.get(key)
+
+        if watch is None:
+            watch = _Watch(job_name, job_run_id)
+            watch.task = asyncio.create_task(self._poll(watch))
+            self._watches[key] = watch
+            self._counters["streams"] += 1
+
+        return watch
+
+    async def _poll(self, watch: _Watch):
+        delay = self.initial_delay
+
+        try:
+            while True:
+                try:
+                    snapshot = await glue_async.get_job_run(
+                        job_name=watch.job_name, job_run_id=watch.job_run_id
+                    )
+                    self._counters["polls"] += 1
+                except ClientError as error:
+                    self._counters["errors"] += 1
+                    code = error.response.get("Error", {}).get("Code")
+
+                    if code == "EntityNotFoundException":
+                        await self._publish(
+                            watch,
+                            error=Exps.NotFoundException(
+                                f"Run {watch.job_run_id} of job {watch.job_name} not found"
+                            ),
+                        )
+                        return
+
+                    logger.warning(
+                        f"Cannot poll run {watch.job_run_id} of {watch.job_name}: {error}"
+                    )
+                    # Throttling and timeouts are retried after a longer delay
+                    snapshot = None
+
+                if snapshot is not None and self._has_changed(watch.snapshot, snapshot):
+                    self._counters["changes"] += 1
+                    await self._publish(watch, snapshot=snapshot)
+                    delay = self.initial_delay
+                else:
+                    delay = min(self.max_delay, delay * _BACKOFF_MULTIPLIER)
+
+                if watch.done:
+                    return
+
+                if (
+                    watch.watchers == 0
+                    and time.monotonic() - watch.idle_since >= self.idle_seconds
+                ):
+                    return
+
+                await asyncio.sleep(delay)
+        except Exception as error:
+            logger.exception(f"Watch of run {watch.job_run_id} failed")
+            await self._publish(watch, error=error)
+        finally:
+            self._watches.pop((watch.job_name, watch.job_run_id), None)
+
+    async def _publish(self, watch: _Watch, snapshot=None, error=None):
+        async with watch.changed:
+            if snapshot is not None:
+                watch.snapshot = snapshot
+                watch.version += 1
+
+            watch.error = error
+            watch.changed.notify_all()
+
+    @staticmethod
+    def _has_changed(previous: dict | None, current: dict):
+        if previous is None:
+            return True
+
+        return any(
+            previous.get(name) != current.get(name) for name in _TRACKED_ATTRIBUTES
+        )
+
+
+_watcher = None
+
+
+def get_job_run_watcher():
+    """Shared watcher of the running event loop (server)"""
+    global _watcher
+
+    if _watcher is None:
+        _watcher = JobRunWatcher()
+
+    return _watcher
@@ -1,3 +1,7 @@
+# Import utils
+import utils.exceptions as Exps
+
+
 def is_integer(value):
     """Check if `value` is an integer number or not
 
@@ -38,3 +42,37 @@ def is_float(value):
         return False
     except:
         return False
+
+
+def parse_int_or_throw_error(
+    value, value_name: str, default: int, minimum: int = 1, maximum: int = None
+):
+    """Parse an integer parameter of a request (query or body), e.g. `limit`
+
+    Args:
+        value (Any): value to parse, None or "" for the default
+        value_name (str): name of value (or parameter name)
+        default (int): value returned when `value` isn't given
+        minimum (int, optional): smallest accepted value. Defaults to 1.
+        maximum (int, optional): values above it are capped to it. Defaults to no cap.
+
+    Returns:
+        int: parsed value, raise BadRequestException if it isn't an integer
+            or is below `minimum`
+    """
+
+    if value is None or value == "":
+        return default
+
+    if isinstance(value, bool) or not is_integer(value) or float(value) != int(value):
+        raise Exps.BadRequestException(f"{value_name} must be an integer")
+
+    value = int(value)
+
+    if value < minimum:
+        raise Exps.BadRequestException(f"{value_name} must be at least {minimum}")
+
+    if maximum is not None:
+        return min(value, maximum)
+
+    return value
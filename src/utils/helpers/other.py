@@ -1,5 +1,6 @@
 import re
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import format_datetime
 
 
 def to_camel_case(s: str) -> str:
@@ -21,6 +22,45 @@ def to_camel_case(s: str) -> str:
     return parts[0].lower() + "".join(p.capitalize() for p in parts[1:])
 
 
+def to_snake_case(s: str) -> str:
+    if not s:
+        return ""
+
+    # textAText → text_a_text, already snake_case names are kept as is
+    s = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s.strip())
+    s = re.sub(r"([A-Z])([A-Z][a-z])", r"\1_\2", s)
+
+    return re.sub(r"[\-\s]+", "_", s).lower()
+
+
+def parse_fields(fields: str | None) -> list[str]:
+    """Parse a comma separated `fields` query parameter (camelCase or
+    snake_case names) into attribute names of items
+
+    Args:
+        fields (str | None): e.g. "name,version,jobName"
+
+    Returns:
+        list[str]: e.g. ["name", "version", "job_name"], empty for all fields
+    """
+    if not fields:
+        return []
+
+    return [to_snake_case(field) for field in fields.split(",") if field.strip()]
+
+
+def to_http_date(value: datetime) -> str:
+    """Format an aware datetime (e.g. LastModified of S3) as an HTTP-date
+
+    Args:
+        value (datetime): e.g. datetime(2024, 1, 1, tzinfo=tzutc())
+
+    Returns:
+        str: e.g. "Mon, 01 Jan 2024 00:00:00 GMT"
+    """
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
 def convert_keys_and_values(obj):
     if isinstance(obj, dict):
         return {to_camel_case(k): convert_keys_and_values(v) for k, v in obj.items()}
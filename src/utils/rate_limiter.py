@@ -0,0 +1,86 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Tokens refill continuously at `rate` per
+    second up to `capacity`; acquire blocks until enough tokens are
+    available.
+
+    Costs which are only known after the fact (e.g. consumed capacity
+    returned by DynamoDB) are charged with debit, the balance may then go
+    negative and later callers wait until it is paid back.
+
+    Args:
+        rate (float): tokens added per second
+        capacity (float, optional): maximum number of tokens. Defaults to rate.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("Rate of token bucket must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """Take tokens, wait until they are available
+
+        Args:
+            tokens (float, optional): number of tokens. Defaults to 1.
+
+        Returns:
+            float: seconds spent waiting
+        """
+        # A request heavier than the bucket would never be served
+        tokens = min(tokens, self.capacity)
+        waited = 0
+
+        while True:
+            with self._lock:
+                self._refill()
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+
+                delay = (tokens - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens: float = 1):
+        """Take tokens if they are available, without waiting
+
+        Returns:
+            bool: True if tokens are taken
+        """
+        tokens = min(tokens, self.capacity)
+
+        with self._lock:
+            self._refill()
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+
+            return False
+
+    def debit(self, tokens: float):
+        """Charge tokens already spent, without waiting"""
+        if tokens <= 0:
+            return
+
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
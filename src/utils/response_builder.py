@@ -1,4 +1,5 @@
 import json
+from decimal import Decimal
 
 # Import external packages
 import orjson
@@ -11,6 +12,14 @@ from .exceptions import (
 )
 
 
+def _serialize_default(obj):
+    # Numbers of DynamoDB items (e.g. revision) are read as Decimal
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 _DEFAULT_HEADERS = {
     "Content-Type": "application/json",
     "Access-Control-Allow-Origin": "*",
@@ -134,7 +143,8 @@ class ResponseBuilder:
             error = InternalException(str(error))
 
         return orjson.dumps(
-            {"error": error.to_plain(), "data": self.data, "meta": self.meta}
+            {"error": error.to_plain(), "data": self.data, "meta": self.meta},
+            default=_serialize_default,
         )
 
     def create_body(self):
@@ -143,7 +153,9 @@ class ResponseBuilder:
         Returns:
             dict: a body for error response
         """
-        return orjson.dumps({"data": self.data, "meta": self.meta})
+        return orjson.dumps(
+            {"data": self.data, "meta": self.meta}, default=_serialize_default
+        )
 
     def create_error_response(self, error: Exception, statusCode: str | None = None):
         """Create an error response
@@ -1,7 +1,11 @@
 import os
 import json
+import threading
 from botocore.exceptions import ClientError
-from utils.aws_clients import get_s3_client
+import utils.exceptions as Exps
+from utils.aws_clients import get_s3_client, resolve_client
+from utils.s3 import upload_stream, move_files, iter_files
+from utils.s3_index import PrefixIndex
 
 RULESET_BUCKET_NAME = os.getenv("RULESET_BUCKET_NAME")
 RULESET_PREFIX = "rulesets/"
@@ -9,24 +13,54 @@ PENDING_PREFIX = f"{RULESET_PREFIX}pending/"
 APPROVED_PREFIX = f"{RULESET_PREFIX}approved/"
 REJECTED_PREFIX = f"{RULESET_PREFIX}rejected/"
 
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ruleset_index():
+    """Shared in-process index of ruleset ids by status"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PrefixIndex(
+                RULESET_BUCKET_NAME,
+                {
+                    "pending": PENDING_PREFIX,
+                    "approved": APPROVED_PREFIX,
+                    "rejected": REJECTED_PREFIX,
+                },
+                suffix=".json",
+            )
+    return _index
+
+
 def list_rulesets(status="pending", **params: dict):
-    s3_client = params.get("s3_client") or get_s3_client()
+    if status not in ("approved", "rejected"):
+        status = "pending"
+    # Index answers from memory, only new keys are listed from S3
+    if params.get("use_index"):
+        return get_ruleset_index().names(
+            status, params.get("start_after", ""), params.get("limit")
+        )
+    s3_client = resolve_client(params, get_s3_client, "s3_client")
     if status == "approved":
         prefix = APPROVED_PREFIX
     elif status == "rejected":
         prefix = REJECTED_PREFIX
     else:
         prefix = PENDING_PREFIX
-    response = s3_client.list_objects_v2(Bucket=RULESET_BUCKET_NAME, Prefix=prefix)
     ruleset_ids = []
-    for obj in response.get("Contents", []):
+    for obj in iter_files(
+        client=s3_client, bucket_name=RULESET_BUCKET_NAME, prefix=prefix
+    ):
         key = obj["Key"]
         if key.endswith(".json"):
             ruleset_ids.append(os.path.splitext(os.path.basename(key))[0])
     return ruleset_ids
 
+
 def get_ruleset(ruleset_id, status="pending", **params: dict):
-    s3_client = params.get("s3_client") or get_s3_client()
+    s3_client = resolve_client(params, get_s3_client, "s3_client")
     if status == "approved":
         prefix = APPROVED_PREFIX
     elif status == "rejected":
@@ -42,25 +76,54 @@ def get_ruleset(ruleset_id, status="pending", **params: dict):
             return None
         raise
 
+
 def upload_ruleset(ruleset_id, content, **params: dict):
-    s3_client = params.get("s3_client") or get_s3_client()
+    s3_client = resolve_client(params, get_s3_client, "s3_client")
     key = f"{PENDING_PREFIX}{ruleset_id}.json"
     if isinstance(content, dict):
         content = json.dumps(content)
-    s3_client.put_object(Bucket=RULESET_BUCKET_NAME, Key=key, Body=content, ContentType="application/json")
+    upload_stream(
+        client=s3_client,
+        source=content,
+        bucket_name=RULESET_BUCKET_NAME,
+        object_name=key,
+        content_type="application/json",
+    )
     return True
 
+
+def _move_rulesets(ruleset_ids, src_prefix, dest_prefix, **params):
+    s3_client = resolve_client(params, get_s3_client, "s3_client")
+    moves = [
+        {
+            "source_key": f"{src_prefix}{ruleset_id}.json",
+            "dest_key": f"{dest_prefix}{ruleset_id}.json",
+        }
+        for ruleset_id in ruleset_ids
+    ]
+    return move_files(client=s3_client, bucket_name=RULESET_BUCKET_NAME, moves=moves)
+
+
 def _move_ruleset(ruleset_id, src_prefix, dest_prefix, **params):
-    s3_client = params.get("s3_client") or get_s3_client()
-    src_key = f"{src_prefix}{ruleset_id}.json"
-    dest_key = f"{dest_prefix}{ruleset_id}.json"
-    copy_source = {"Bucket": RULESET_BUCKET_NAME, "Key": src_key}
-    s3_client.copy_object(Bucket=RULESET_BUCKET_NAME, CopySource=copy_source, Key=dest_key)
-    s3_client.delete_object(Bucket=RULESET_BUCKET_NAME, Key=src_key)
+    result = _move_rulesets([ruleset_id], src_prefix, dest_prefix, **params)[0]
+    if result["status"] != "moved":
+        raise Exps.InternalException(
+            f"Cannot move ruleset {ruleset_id}: {result['error']}"
+        )
     return True
 
+
 def approve_ruleset(ruleset_id, **params: dict):
     return _move_ruleset(ruleset_id, PENDING_PREFIX, APPROVED_PREFIX, **params)
 
+
 def reject_ruleset(ruleset_id, **params: dict):
-    return _move_ruleset(ruleset_id, PENDING_PREFIX, REJECTED_PREFIX, **params) 
\ No newline at end of file
+    return _move_ruleset(ruleset_id, PENDING_PREFIX, REJECTED_PREFIX, **params)
+
+
+def approve_rulesets(ruleset_ids, **params: dict):
+    return _move_rulesets(ruleset_ids, PENDING_PREFIX, APPROVED_PREFIX, **params)
+
+
+def reject_rulesets(ruleset_ids, **params: dict):
+    return _move_rulesets(ruleset_ids, PENDING_PREFIX, REJECTED_PREFIX, **params)
@@ -1,11 +1,32 @@
+import base64
+import hashlib
+import itertools
 import logging
 import os
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from botocore.exceptions import ClientError
 from botocore.client import BaseClient
+from botocore.config import Config
 
 # Import helpers
-from utils.aws_clients import get_s3_client
+from utils.aws_clients import (
+    get_client,
+    get_client_config,
+    get_s3_client,
+    resolve_client,
+)
+from utils.constants import (
+    S3_MULTIPART_PART_SIZE,
+    S3_MULTIPART_CONCURRENCY,
+    S3_MULTIPART_COPY_PART_SIZE,
+    S3_COPY_CONCURRENCY,
+    S3_PRESIGNED_URL_TTL,
+    S3_PRESIGNED_URL_MAX_TTL,
+)
+import utils.exceptions as Exps
+import utils.s3_cache as s3_cache
 from utils.helpers import string as string_helpers
 from utils.helpers.boolean import check_empty_or_throw_error
 
@@ -13,6 +34,53 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+def _get_latency_s3_client():
+    # Reads are latency-sensitive: short timeouts, fail fast
+    return get_s3_client("latency")
+
+
+def _get_presign_s3_client():
+    # Presigned urls must use SigV4 (regional endpoint), SigV2 is deprecated
+    config = get_client_config().merge(
+        Config(signature_version="s3v4", s3={"addressing_style": "virtual"})
+    )
+
+    return get_client("s3", config=config)
+
+
+# Callbacks `listener(event, bucket_name, object_key)` which are called after
+# an object is written ("put") or deleted ("delete") by helpers of this
+# module, e.g. to keep an in-process index up to date (see utils.s3_index)
+_object_listeners = []
+
+
+def add_object_listener(listener):
+    """Register a callback for objects written or deleted by this module
+
+    Args:
+        listener (Callable): `listener(event, bucket_name, object_key)`, event is "put" or "delete"
+    """
+    _object_listeners.append(listener)
+
+
+def _notify_listeners(event: str, bucket_name: str, object_key: str):
+    for listener in _object_listeners:
+        try:
+            listener(event, bucket_name, object_key)
+        except Exception as error:
+            logger.warning(f"Object listener failed on {event} {object_key}: {error}")
+
+
+def _on_object_written(bucket_name: str, object_key: str):
+    s3_cache.invalidate(bucket_name, object_key)
+    _notify_listeners("put", bucket_name, object_key)
+
+
+def _on_object_deleted(bucket_name: str, object_key: str):
+    s3_cache.invalidate(bucket_name, object_key)
+    _notify_listeners("delete", bucket_name, object_key)
+
+
 def upload_fileobj(**params: dict):
     """Upload file-like object to s3 bucket.
 
@@ -22,13 +90,13 @@ def upload_fileobj(**params: dict):
             - bucket_name (str): Name of the S3 bucket. Required.
             - object_name (str, optional): S3 object name. Defaults to file name.
             - metadata (dict, optional): Metadata to attach to the uploaded file.
-            - client (boto3.Client, optional): S3 client instance. Defaults to result of get_s3_client().
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
 
     Returns:
         str: Public URL of the uploaded file in the S3 bucket.
     """
 
-    s3_client = params.get("client", get_s3_client())
+    s3_client = resolve_client(params, get_s3_client)
     fileobj = params.get("fileobj")
     bucket_name = params.get("bucket_name", "")
     object_name = params.get("object_name", "")
@@ -47,10 +115,217 @@ def upload_fileobj(**params: dict):
     extra_args = {"Metadata": metadata} if metadata else {}
 
     s3_client.upload_fileobj(fileobj, bucket_name, object_name, ExtraArgs=extra_args)
+    _on_object_written(bucket_name, object_name)
 
     return url
 
 
+# S3 rejects parts (except the last one) smaller than 5 MiB
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _iter_source_chunks(source):
+    """Iterate a source as bytes chunks without copying it as a whole
+
+    Args:
+        source (str | bytes | file-like | Iterable): source of content
+    """
+    if isinstance(source, str):
+        # Slice before encoding, so only one chunk is encoded at a time
+        for i in range(0, len(source), _STREAM_CHUNK_SIZE):
+            yield source[i : i + _STREAM_CHUNK_SIZE].encode("utf-8")
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for i in range(0, len(view), _STREAM_CHUNK_SIZE):
+            yield view[i : i + _STREAM_CHUNK_SIZE]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+    else:
+        for chunk in source:
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def _iter_parts(source, part_size: int, hasher):
+    """Group chunks of a source into parts of `part_size` bytes (the last
+    part may be smaller) and feed them to `hasher` on the way.
+    """
+    buffer = bytearray()
+    has_parts = False
+
+    for chunk in _iter_source_chunks(source):
+        hasher.update(chunk)
+        buffer += chunk
+
+        while len(buffer) >= part_size:
+            has_parts = True
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+
+    # Empty content is still uploaded as one (empty) part
+    if buffer or not has_parts:
+        yield bytes(buffer)
+
+
+def _b64_sha256(data: bytes):
+    return base64.b64encode(hashlib.sha256(data).digest()).decode("ascii")
+
+
+def upload_stream(**params: dict):
+    """Upload a stream to s3 bucket with concurrent multipart upload. Only
+    `concurrency + 1` parts are kept in memory, so memory stays flat
+    regardless of size of the content. Content which fits in one part is
+    uploaded with a single put_object.
+
+    Args:
+        **params (dict): Dictionary of parameters. Expected keys:
+            - source (str | bytes | file-like | Iterable[bytes | str]): Content to upload. Required.
+            - bucket_name (str): Name of the S3 bucket. Required.
+            - object_name (str): S3 object name. Required.
+            - metadata (dict, optional): Metadata to attach to the uploaded file.
+            - content_type (str, optional): Content type of the object.
+            - part_size (int, optional): Size of a part in bytes. Defaults to S3_MULTIPART_PART_SIZE.
+            - concurrency (int, optional): Number of parts uploaded at the same time. Defaults to S3_MULTIPART_CONCURRENCY.
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
+
+    Returns:
+        dict: url, etag, checksum_sha256 (hex digest of the whole content), size and number of parts.
+    """
+    s3_client = resolve_client(params, get_s3_client)
+
+    source = params.get("source")
+    bucket_name = params.get("bucket_name", "")
+    object_name = params.get("object_name", "")
+    metadata = params.get("metadata", {})
+    content_type = params.get("content_type", "")
+    part_size = max(
+        params.get("part_size", S3_MULTIPART_PART_SIZE), MIN_MULTIPART_PART_SIZE
+    )
+    concurrency = max(params.get("concurrency", S3_MULTIPART_CONCURRENCY), 1)
+
+    check_empty_or_throw_error(
+        bucket_name, "bucket_name", "Bucket name is required to upload file"
+    )
+    check_empty_or_throw_error(
+        object_name, "object_name", "Object name is required to upload file"
+    )
+
+    if source is None:
+        raise Exps.IOException("Source is required to upload file")
+
+    region = s3_client.meta.region_name
+    url = f"https://{bucket_name}.s3.{region}.amazonaws.com/{object_name}"
+
+    extra_args = {}
+    if metadata:
+        extra_args["Metadata"] = metadata
+    if content_type:
+        extra_args["ContentType"] = content_type
+
+    hasher = hashlib.sha256()
+    parts = _iter_parts(source, part_size, hasher)
+    first_part = next(parts)
+    second_part = next(parts, None)
+
+    # Small content: one request is enough
+    if second_part is None:
+        response = s3_client.put_object(
+            Bucket=bucket_name,
+            Key=object_name,
+            Body=first_part,
+            ChecksumSHA256=_b64_sha256(first_part),
+            **extra_args,
+        )
+        _on_object_written(bucket_name, object_name)
+
+        return {
+            "url": url,
+            "etag": response.get("ETag"),
+            "checksum_sha256": hasher.hexdigest(),
+            "size": len(first_part),
+            "parts": 1,
+        }
+
+    upload = s3_client.create_multipart_upload(
+        Bucket=bucket_name,
+        Key=object_name,
+        ChecksumAlgorithm="SHA256",
+        **extra_args,
+    )
+    upload_id = upload["UploadId"]
+
+    def upload_part(part_number: int, data: bytes):
+        # S3 verifies each part against its checksum
+        checksum = _b64_sha256(data)
+        response = s3_client.upload_part(
+            Bucket=bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+            ChecksumAlgorithm="SHA256",
+            ChecksumSHA256=checksum,
+        )
+
+        return {
+            "PartNumber": part_number,
+            "ETag": response["ETag"],
+            "ChecksumSHA256": checksum,
+        }
+
+    def collect(done):
+        for future in done:
+            completed_parts.append(future.result())
+
+    completed_parts = []
+    size = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = set()
+            all_parts = itertools.chain((first_part, second_part), parts)
+
+            for part_number, data in enumerate(all_parts, start=1):
+                # Backpressure: don't read more than `concurrency` parts ahead
+                if len(in_flight) >= concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                size += len(data)
+                in_flight.add(executor.submit(upload_part, part_number, data))
+
+            done, _ = wait(in_flight)
+            collect(done)
+
+        completed_parts.sort(key=lambda part: part["PartNumber"])
+        response = s3_client.complete_multipart_upload(
+            Bucket=bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": completed_parts},
+        )
+    except Exception:
+        logger.error(f"Abort multipart upload of {bucket_name}/{object_name}")
+        s3_client.abort_multipart_upload(
+            Bucket=bucket_name, Key=object_name, UploadId=upload_id
+        )
+        raise
+
+    _on_object_written(bucket_name, object_name)
+
+    return {
+        "url": url,
+        "etag": response.get("ETag"),
+        "checksum_sha256": hasher.hexdigest(),
+        "size": size,
+        "parts": len(completed_parts),
+    }
+
+
 def upload_file(**params: dict):
     """Upload file to s3 bucket.
 
@@ -60,13 +335,13 @@ def upload_file(**params: dict):
             - bucket_name (str): Name of the S3 bucket. Required.
             - object_name (str, optional): S3 object name. Defaults to file name.
             - metadata (dict, optional): Metadata to attach to the uploaded file.
-            - client (boto3.Client, optional): S3 client instance. Defaults to result of get_s3_client().
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
 
     Returns:
         str: Public URL of the uploaded file in the S3 bucket.
     """
 
-    s3_client = params.get("client", get_s3_client())
+    s3_client = resolve_client(params, get_s3_client)
 
     file_name = params.get("file_name", "")
     bucket_name = params.get("bucket_name", "")
@@ -89,6 +364,7 @@ def upload_file(**params: dict):
     extra_args = {"Metadata": metadata} if metadata else {}
 
     s3_client.upload_file(file_name, bucket_name, object_name, ExtraArgs=extra_args)
+    _on_object_written(bucket_name, object_name)
 
     return url
 
@@ -100,12 +376,12 @@ def get_file_meta(**params: dict):
         **params (dict): Dictionary of parameters. Expected keys:
             - bucket_name (str): Name of the S3 bucket. Required.
             - object_key (str): Key of the object in the bucket. Required.
-            - client (boto3.Client, optional): S3 client instance. Defaults to result of get_s3_client().
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
 
     Returns:
         dict: Metadata and other response headers returned by S3's head_object API.
     """
-    s3_client = params.get("client", get_s3_client())
+    s3_client = resolve_client(params, _get_latency_s3_client)
 
     bucket_name = params.get("bucket_name", "")
     object_key = params.get("object_key", "")
@@ -129,15 +405,23 @@ def get_file(**params: dict):
         **params (dict): Dictionary of parameters. Expected keys:
             - bucket_name (str): Name of the S3 bucket. Required.
             - object_key (str): Key of the object in the bucket. Required.
-            - client (boto3.Client, optional): S3 client instance. Defaults to result of get_s3_client().
+            - range (str, optional): HTTP Range header, e.g. "bytes=0-1023". Only that part of the object is returned.
+            - if_range (str, optional): HTTP If-Range header (strong ETag or HTTP-date). When the object has changed (or the
+                validator is a weak ETag, which never matches), the whole object is returned instead of the range.
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
+
+    Raises:
+        RangeNotSatisfiableException: if range is outside of the object
 
     Returns:
         dict: Response from S3 containing the object's content and metadata.
     """
-    s3_client = params.get("client", get_s3_client())
+    s3_client = resolve_client(params, _get_latency_s3_client)
 
     bucket_name = params.get("bucket_name", "")
     object_key = params.get("object_key", "")
+    range_header = params.get("range", "")
+    if_range = params.get("if_range", "")
 
     check_empty_or_throw_error(
         bucket_name, "bucket_name", "Bucket name is required to get file"
@@ -146,41 +430,365 @@ def get_file(**params: dict):
         object_key, "object_key", "Object key is required to get file"
     )
 
-    response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
+    get_args = {"Bucket": bucket_name, "Key": object_key}
+
+    # A resumed download must continue the same version of the object
+    # (RFC 9110 If-Range), else the whole object is sent
+    if range_header:
+        if not if_range:
+            get_args["Range"] = range_header
+        elif if_range.startswith('"'):
+            get_args["Range"] = range_header
+            get_args["IfMatch"] = if_range
+        elif not if_range.startswith("W/"):
+            try:
+                get_args["IfUnmodifiedSince"] = parsedate_to_datetime(if_range)
+                get_args["Range"] = range_header
+            except (TypeError, ValueError):
+                pass
+
+    try:
+        response = s3_client.get_object(**get_args)
+    except ClientError as error:
+        code = error.response.get("Error", {}).get("Code")
+
+        if code == "InvalidRange":
+            raise Exps.RangeNotSatisfiableException(
+                f"Range {range_header} is not satisfiable for {object_key}"
+            )
+
+        if code != "PreconditionFailed" or not (
+            "IfMatch" in get_args or "IfUnmodifiedSince" in get_args
+        ):
+            raise
+
+        # The object has changed since the client got its first part
+        response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
 
     return response
 
 
-def list_files(**params: dict):
-    """List all files under a given prefix in an S3 bucket.
+def get_file_content(**params: dict):
+    """Get content of an object in S3 bucket as bytes.
+
+    Args:
+        **params (dict): Same parameters as get_file.
+
+    Returns:
+        bytes: content of the object.
+    """
+    response = get_file(**params)
+
+    return response["Body"].read()
+
+
+def get_presigned_url(**params: dict):
+    """Create a presigned GET url of an object, so client downloads it from
+    S3 directly. Signing is local, it doesn't call S3.
 
     Args:
         **params (dict): Dictionary of parameters. Expected keys:
             - bucket_name (str): Name of the S3 bucket. Required.
-            - prefix (str, optional): Prefix to filter objects. Defaults to empty string.
-            - client (boto3.Client, optional): S3 client instance. Defaults to result of get_s3_client().
+            - object_key (str): Key of the object in the bucket. Required.
+            - expires_in (int, optional): Lifetime of url in seconds, capped at S3_PRESIGNED_URL_MAX_TTL. Defaults to S3_PRESIGNED_URL_TTL.
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared SigV4 client.
 
     Returns:
-        list: List of objects (dicts) returned by S3 under the specified prefix.
+        dict: url and expires_in (seconds).
+    """
+    s3_client = resolve_client(params, _get_presign_s3_client)
+
+    bucket_name = params.get("bucket_name", "")
+    object_key = params.get("object_key", "")
+    expires_in = params.get("expires_in")
+
+    if expires_in is None:
+        expires_in = S3_PRESIGNED_URL_TTL
+
+    check_empty_or_throw_error(
+        bucket_name, "bucket_name", "Bucket name is required to create presigned url"
+    )
+    check_empty_or_throw_error(
+        object_key, "object_key", "Object key is required to create presigned url"
+    )
+
+    if expires_in <= 0:
+        raise Exps.OutOfRangeException("Lifetime of presigned url must be positive")
+
+    expires_in = min(expires_in, S3_PRESIGNED_URL_MAX_TTL)
+
+    url = s3_client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket_name, "Key": object_key},
+        ExpiresIn=expires_in,
+    )
+
+    return {"url": url, "expires_in": expires_in}
+
+
+def iter_file_pages(**params: dict):
+    """Iterate pages of objects under a prefix in an S3 bucket. Pages are
+    requested lazily, one list_objects_v2 call per page consumed.
+
+    Args:
+        **params (dict): Dictionary of parameters. Expected keys:
+            - bucket_name (str): Name of the S3 bucket. Required.
+            - prefix (str, optional): Prefix to filter objects. Defaults to empty string.
+            - delimiter (str, optional): Group keys into "folders" by this delimiter, e.g. "/".
+            - start_after (str, optional): List keys after this key.
+            - continuation_token (str, optional): Cursor (`next_token`) of a previous page.
+            - page_size (int, optional): Maximum number of keys per page (up to 1000). Defaults to 1000.
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
+
+    Yields:
+        dict: files (objects of page), folders (common prefixes) and
+            next_token (cursor of next page, None on last page).
     """
-    s3_client = params.get("client", get_s3_client())
+    s3_client = resolve_client(params, get_s3_client)
 
     bucket_name = params.get("bucket_name", "")
     prefix = params.get("prefix", "")
+    delimiter = params.get("delimiter", "")
+    start_after = params.get("start_after", "")
+    continuation_token = params.get("continuation_token", "")
+    page_size = params.get("page_size", 1000)
 
     check_empty_or_throw_error(
-        bucket_name, "bucket_name", "Bucket name is required to get file metadata"
+        bucket_name, "bucket_name", "Bucket name is required to list files"
     )
 
-    paginator = s3_client.get_paginator("list_objects_v2")
-    page_iterator = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+    list_args = {"Bucket": bucket_name, "Prefix": prefix, "MaxKeys": page_size}
+
+    if delimiter:
+        list_args["Delimiter"] = delimiter
+
+    # Continuation token already encodes where the listing stopped
+    if continuation_token:
+        list_args["ContinuationToken"] = continuation_token
+    elif start_after:
+        list_args["StartAfter"] = start_after
+
+    while True:
+        response = s3_client.list_objects_v2(**list_args)
+        next_token = (
+            response.get("NextContinuationToken")
+            if response.get("IsTruncated")
+            else None
+        )
+
+        yield {
+            "files": response.get("Contents", []),
+            "folders": [
+                common_prefix["Prefix"]
+                for common_prefix in response.get("CommonPrefixes", [])
+            ],
+            "next_token": next_token,
+        }
+
+        if not next_token:
+            return
+
+        list_args.pop("StartAfter", None)
+        list_args["ContinuationToken"] = next_token
+
+
+def iter_files(**params: dict):
+    """Iterate objects under a prefix in an S3 bucket, page by page.
+
+    Args:
+        **params (dict): Same parameters as iter_file_pages, and:
+            - max_items (int, optional): Stop after this number of objects.
+
+    Yields:
+        dict: object returned by S3 (Key, Size, ETag, LastModified...)
+    """
+    max_items = params.get("max_items")
+    count = 0
+
+    for page in iter_file_pages(**params):
+        for file in page["files"]:
+            if max_items is not None and count >= max_items:
+                return
+
+            count += 1
+            yield file
+
+
+def iter_folders(**params: dict):
+    """Iterate "folders" (common prefixes) directly under a prefix.
+
+    Args:
+        **params (dict): Same parameters as iter_file_pages. Delimiter defaults to "/".
+
+    Yields:
+        str: prefix of a folder, e.g. "approved/"
+    """
+    params.setdefault("delimiter", "/")
+
+    for page in iter_file_pages(**params):
+        yield from page["folders"]
+
+
+def list_files(**params: dict):
+    """List all files under a given prefix in an S3 bucket. Every page is
+    loaded in memory, prefer iter_files for big prefixes.
 
-    files = []
-    for page in page_iterator:
-        contents = page.get("Contents", [])
-        files.extend(contents)
+    Args:
+        **params (dict): Dictionary of parameters. Expected keys:
+            - bucket_name (str): Name of the S3 bucket. Required.
+            - prefix (str, optional): Prefix to filter objects. Defaults to empty string.
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
+
+    Returns:
+        list: List of objects (dicts) returned by S3 under the specified prefix.
+    """
+    return list(iter_files(**params))
 
-    return files
+
+# CopyObject only accepts sources up to 5 GB, bigger objects are copied in parts
+MAX_COPY_OBJECT_SIZE = 5 * 1024 * 1024 * 1024
+MAX_MULTIPART_PARTS = 10000
+# DeleteObjects accepts up to 1000 keys per request
+MAX_DELETE_OBJECTS_KEYS = 1000
+# Headers which multipart copy doesn't carry over from the source
+_COPIED_HEADERS = (
+    "ContentType",
+    "ContentEncoding",
+    "ContentDisposition",
+    "ContentLanguage",
+    "CacheControl",
+)
+
+
+def _get_object_url(s3_client: BaseClient, bucket_name: str, object_key: str):
+    region = s3_client.meta.region_name
+
+    return f"https://{bucket_name}.s3.{region}.amazonaws.com/{object_key}"
+
+
+def _multipart_copy_object(
+    s3_client: BaseClient,
+    copy_source: dict,
+    dest_bucket_name: str,
+    dest_key: str,
+    metadata: dict | None = None,
+    concurrency: int = S3_MULTIPART_CONCURRENCY,
+):
+    """Copy an object (of any size) with UploadPartCopy, parts are copied
+    in parallel on S3 side.
+    """
+    head = s3_client.head_object(Bucket=copy_source["Bucket"], Key=copy_source["Key"])
+    size = head["ContentLength"]
+    part_size = max(S3_MULTIPART_COPY_PART_SIZE, -(-size // MAX_MULTIPART_PARTS))
+
+    extra_args = {"Metadata": metadata if metadata else head.get("Metadata", {})}
+    for header in _COPIED_HEADERS:
+        if head.get(header):
+            extra_args[header] = head[header]
+
+    upload = s3_client.create_multipart_upload(
+        Bucket=dest_bucket_name, Key=dest_key, **extra_args
+    )
+    upload_id = upload["UploadId"]
+
+    def copy_part(part_number: int, start: int):
+        end = min(start + part_size, size) - 1
+        response = s3_client.upload_part_copy(
+            Bucket=dest_bucket_name,
+            Key=dest_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            CopySource=copy_source,
+            CopySourceRange=f"bytes={start}-{end}",
+        )
+
+        return {"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            parts = list(
+                executor.map(
+                    copy_part,
+                    itertools.count(1),
+                    range(0, size, part_size),
+                )
+            )
+
+        response = s3_client.complete_multipart_upload(
+            Bucket=dest_bucket_name,
+            Key=dest_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        logger.error(f"Abort multipart copy to {dest_bucket_name}/{dest_key}")
+        s3_client.abort_multipart_upload(
+            Bucket=dest_bucket_name, Key=dest_key, UploadId=upload_id
+        )
+        raise
+
+    return response.get("ETag")
+
+
+def _copy_object(
+    s3_client: BaseClient,
+    bucket_name: str,
+    source_key: str,
+    dest_bucket_name: str,
+    dest_key: str,
+    metadata: dict | None = None,
+):
+    """Server-side copy of an object, falls back to multipart copy when the
+    source is bigger than 5 GB. Returns ETag of the copy.
+    """
+    copy_source = {"Bucket": bucket_name, "Key": source_key}
+
+    # Nếu có metadata mới → REPLACE, ngược lại giữ nguyên
+    copy_args = {
+        "Bucket": dest_bucket_name,
+        "CopySource": copy_source,
+        "Key": dest_key,
+        "MetadataDirective": "COPY",
+    }
+
+    if metadata:
+        copy_args["MetadataDirective"] = "REPLACE"
+        copy_args["Metadata"] = metadata
+
+    try:
+        response = s3_client.copy_object(**copy_args)
+    except ClientError as error:
+        # Size of source is only checked when CopyObject rejects it, so
+        # the common (small object) path costs a single request
+        if error.response.get("Error", {}).get("Code") != "InvalidRequest":
+            raise
+
+        head = s3_client.head_object(Bucket=bucket_name, Key=source_key)
+        if head["ContentLength"] <= MAX_COPY_OBJECT_SIZE:
+            raise
+
+        return _multipart_copy_object(
+            s3_client, copy_source, dest_bucket_name, dest_key, metadata
+        )
+
+    return response.get("CopyObjectResult", {}).get("ETag")
+
+
+def _on_object_moved(
+    bucket_name: str,
+    source_key: str,
+    dest_bucket_name: str,
+    dest_key: str,
+    etag: str | None,
+    metadata: dict | None,
+):
+    # Content of a moved object doesn't change, so its cached entry follows
+    # it, unless metadata is replaced
+    s3_cache.move(
+        bucket_name, source_key, dest_bucket_name, dest_key, None if metadata else etag
+    )
+    _notify_listeners("delete", bucket_name, source_key)
+    _notify_listeners("put", dest_bucket_name, dest_key)
 
 
 def move_file(**params: dict):
@@ -193,12 +801,12 @@ def move_file(**params: dict):
             - dest_bucket_name (str): Name of the destination S3 bucket. Required.
             - dest_key (str): Key for the destination object. Required.
             - metadata (dict, optional): New metadata to apply. If provided, replaces existing metadata.
-            - client (boto3.Client, optional): S3 client instance. Defaults to result of get_s3_client().
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
 
     Returns:
         str: Public URL of the moved file in the destination S3 bucket.
     """
-    s3_client = params.get("client", get_s3_client())
+    s3_client = resolve_client(params, get_s3_client)
 
     bucket_name = params.get("bucket_name", "")
     source_key = params.get("source_key", "")
@@ -221,30 +829,166 @@ def move_file(**params: dict):
         dest_key, "dest_key", "Destination key is required to move file"
     )
 
-    copy_source = {"Bucket": bucket_name, "Key": source_key}
-
-    # Nếu có metadata mới → REPLACE, ngược lại giữ nguyên
-    copy_args = {
-        "Bucket": dest_bucket_name,
-        "CopySource": copy_source,
-        "Key": dest_key,
-        "MetadataDirective": "COPY",
-    }
-
-    if new_metadata:
-        copy_args["MetadataDirective"] = "REPLACE"
-        copy_args["Metadata"] = new_metadata
+    etag = _copy_object(
+        s3_client, bucket_name, source_key, dest_bucket_name, dest_key, new_metadata
+    )
+    s3_client.delete_object(Bucket=bucket_name, Key=source_key)
+    _on_object_moved(
+        bucket_name, source_key, dest_bucket_name, dest_key, etag, new_metadata
+    )
 
-    print("Copy params:", copy_args)
+    return _get_object_url(s3_client, dest_bucket_name, dest_key)
 
-    s3_client.copy_object(**copy_args)
-    s3_client.delete_object(Bucket=bucket_name, Key=source_key)
 
-    region = s3_client.meta.region_name
+def move_files(**params: dict):
+    """Move many files in S3 at once. Objects are copied server-side with
+    bounded concurrency, then sources are deleted with DeleteObjects in
+    batches of up to 1000 keys. A failed move doesn't stop the others.
 
-    url = f"https://{dest_bucket_name}.s3.{region}.amazonaws.com/{dest_key}"
+    Args:
+        **params (dict): Dictionary of parameters. Expected keys:
+            - moves (list[dict]): Files to move. Required. Each move has keys:
+                - source_key (str): Key of the source object. Required.
+                - dest_key (str): Key for the destination object. Required.
+                - bucket_name (str, optional): Name of the source bucket. Defaults to `bucket_name`.
+                - dest_bucket_name (str, optional): Name of the destination bucket. Defaults to `dest_bucket_name`.
+                - metadata (dict, optional): New metadata to apply. If provided, replaces existing metadata.
+            - bucket_name (str, optional): Default name of the source S3 bucket.
+            - dest_bucket_name (str, optional): Default name of the destination S3 bucket. Defaults to `bucket_name`.
+            - concurrency (int, optional): Number of copies running at the same time. Defaults to S3_COPY_CONCURRENCY.
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
 
-    return url
+    Returns:
+        list[dict]: Result of each move (in the same order as `moves`) with keys
+            source_key, dest_key, url, status ("moved", "copy_failed" or
+            "delete_failed") and error (str | None).
+    """
+    s3_client = resolve_client(params, get_s3_client)
+
+    moves = params.get("moves", [])
+    default_bucket_name = params.get("bucket_name", "")
+    default_dest_bucket_name = params.get("dest_bucket_name", "") or default_bucket_name
+    concurrency = max(params.get("concurrency", S3_COPY_CONCURRENCY), 1)
+
+    check_empty_or_throw_error(moves, "moves", "Files are required to move files")
+
+    results = []
+    for move in moves:
+        bucket_name = move.get("bucket_name", default_bucket_name)
+        dest_bucket_name = move.get("dest_bucket_name", default_dest_bucket_name)
+        source_key = move.get("source_key", "")
+        dest_key = move.get("dest_key", "")
+
+        check_empty_or_throw_error(
+            bucket_name, "bucket_name", "Bucket name is required to move file"
+        )
+        check_empty_or_throw_error(
+            source_key, "source_key", "Source name is required to move file"
+        )
+        check_empty_or_throw_error(
+            dest_bucket_name,
+            "dest_bucket_name",
+            "Name of destination bucket is required to move file",
+        )
+        check_empty_or_throw_error(
+            dest_key, "dest_key", "Destination key is required to move file"
+        )
+
+        results.append(
+            {
+                "bucket_name": bucket_name,
+                "source_key": source_key,
+                "dest_bucket_name": dest_bucket_name,
+                "dest_key": dest_key,
+                "metadata": move.get("metadata", {}),
+            }
+        )
+
+    def copy(result: dict):
+        result["etag"] = _copy_object(
+            s3_client,
+            result["bucket_name"],
+            result["source_key"],
+            result["dest_bucket_name"],
+            result["dest_key"],
+            result["metadata"],
+        )
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(results))) as executor:
+        futures = [executor.submit(copy, result) for result in results]
+
+        for result, future in zip(results, futures):
+            error = future.exception()
+
+            if error is None:
+                result["status"] = "moved"
+                result["error"] = None
+            else:
+                logger.error(f"Cannot copy {result['source_key']}: {error}")
+                result["status"] = "copy_failed"
+                result["error"] = str(error)
+
+    # Only sources which were copied are deleted, grouped by bucket
+    copied_by_bucket = {}
+    for result in results:
+        if result["status"] == "moved":
+            copied_by_bucket.setdefault(result["bucket_name"], {}).setdefault(
+                result["source_key"], []
+            ).append(result)
+
+    for bucket_name, copied in copied_by_bucket.items():
+        source_keys = list(copied)
+
+        for i in range(0, len(source_keys), MAX_DELETE_OBJECTS_KEYS):
+            batch = source_keys[i : i + MAX_DELETE_OBJECTS_KEYS]
+
+            try:
+                response = s3_client.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={
+                        "Objects": [{"Key": key} for key in batch],
+                        "Quiet": True,
+                    },
+                )
+                errors = {
+                    error["Key"]: error.get("Message", error.get("Code"))
+                    for error in response.get("Errors", [])
+                }
+            except ClientError as error:
+                errors = {key: str(error) for key in batch}
+
+            for key, message in errors.items():
+                logger.error(f"Cannot delete {key} after copying it: {message}")
+
+                for result in copied.get(key, []):
+                    result["status"] = "delete_failed"
+                    result["error"] = message
+
+    for result in results:
+        if result["status"] == "moved":
+            _on_object_moved(
+                result["bucket_name"],
+                result["source_key"],
+                result["dest_bucket_name"],
+                result["dest_key"],
+                result["etag"],
+                result["metadata"],
+            )
+        elif result["status"] == "delete_failed":
+            _on_object_written(result["dest_bucket_name"], result["dest_key"])
+
+    return [
+        {
+            "source_key": result["source_key"],
+            "dest_key": result["dest_key"],
+            "url": _get_object_url(
+                s3_client, result["dest_bucket_name"], result["dest_key"]
+            ),
+            "status": result["status"],
+            "error": result["error"],
+        }
+        for result in results
+    ]
 
 
 def delete_file(**params: dict):
@@ -254,12 +998,12 @@ def delete_file(**params: dict):
         **params (dict): Dictionary of parameters. Expected keys:
             - bucket_name (str): Name of the S3 bucket. Required.
             - object_key (str): Key of the object to delete. Required.
-            - client (boto3.Client, optional): S3 client instance. Defaults to result of get_s3_client().
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client().
 
     Returns:
         bool: True if the deletion request was sent successfully.
     """
-    s3_client = params.get("client", get_s3_client())
+    s3_client = resolve_client(params, get_s3_client)
 
     bucket_name = params.get("bucket_name", "")
     object_key = params.get("object_key", "")
@@ -272,5 +1016,6 @@ def delete_file(**params: dict):
     )
 
     s3_client.delete_object(Bucket=bucket_name, Key=object_key)
+    _on_object_deleted(bucket_name, object_key)
 
     return True
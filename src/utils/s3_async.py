@@ -0,0 +1,64 @@
+# Async variants of helpers in utils.s3. They take the same parameters
+# and run the blocking call on the shared AWS I/O executor (utils.aio),
+# so callers can `await` them and `asyncio.gather` independent calls.
+
+# Import from utils
+from utils import s3, s3_cache
+from utils.aio import run_blocking
+
+
+async def upload_fileobj(**params: dict):
+    """Async variant of utils.s3.upload_fileobj"""
+    return await run_blocking(s3.upload_fileobj, **params)
+
+
+async def upload_stream(**params: dict):
+    """Async variant of utils.s3.upload_stream"""
+    return await run_blocking(s3.upload_stream, **params)
+
+
+async def upload_file(**params: dict):
+    """Async variant of utils.s3.upload_file"""
+    return await run_blocking(s3.upload_file, **params)
+
+
+async def get_file_meta(**params: dict):
+    """Async variant of utils.s3.get_file_meta"""
+    return await run_blocking(s3.get_file_meta, **params)
+
+
+async def get_file(**params: dict):
+    """Async variant of utils.s3.get_file. The returned Body is a blocking
+    stream, use get_file_content to read the whole object off-loop.
+    """
+    return await run_blocking(s3.get_file, **params)
+
+
+async def get_file_content(**params: dict):
+    """Async variant of utils.s3.get_file_content"""
+    return await run_blocking(s3.get_file_content, **params)
+
+
+async def get_cached_file_content(**params: dict):
+    """Async variant of utils.s3_cache.get_file_content"""
+    return await run_blocking(s3_cache.get_file_content, **params)
+
+
+async def list_files(**params: dict):
+    """Async variant of utils.s3.list_files"""
+    return await run_blocking(s3.list_files, **params)
+
+
+async def move_file(**params: dict):
+    """Async variant of utils.s3.move_file"""
+    return await run_blocking(s3.move_file, **params)
+
+
+async def move_files(**params: dict):
+    """Async variant of utils.s3.move_files"""
+    return await run_blocking(s3.move_files, **params)
+
+
+async def delete_file(**params: dict):
+    """Async variant of utils.s3.delete_file"""
+    return await run_blocking(s3.delete_file, **params)
@@ -0,0 +1,346 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+# Import helpers
+from utils.aws_clients import get_s3_client, resolve_client
+from utils.cache import LRUCache
+from utils.constants import (
+    DATACONTRACT_DIR,
+    S3_CACHE_MAX_BYTES,
+    S3_CACHE_MAX_OBJECT_BYTES,
+    S3_CACHE_DISK_ENABLED,
+    S3_CACHE_DISK_MAX_BYTES,
+    S3_CACHE_FRESH_SECONDS,
+)
+from utils.helpers.boolean import check_empty_or_throw_error
+
+logger = logging.getLogger(__name__)
+
+# Read-through cache of small S3 documents (data contracts, rulesets).
+#   - memory tier: LRU bounded by bytes of content
+#   - disk tier (optional): files in DATACONTRACT_DIR, survives a restart
+# Cached entries are revalidated with If-None-Match, so an unchanged object
+# costs a 304 without body instead of a full download.
+_memory = LRUCache(S3_CACHE_MAX_BYTES, weigh=lambda entry: len(entry["body"]))
+_disk_dir = (
+    os.path.join(DATACONTRACT_DIR, ".s3-cache")
+    if S3_CACHE_DISK_ENABLED and DATACONTRACT_DIR
+    else None
+)
+_disk_lock = threading.Lock()
+_counters_lock = threading.Lock()
+_counters = {
+    "hits": 0,
+    "disk_hits": 0,
+    "revalidations": 0,
+    "misses": 0,
+    "bytes_from_cache": 0,
+    "bytes_downloaded": 0,
+    "invalidations": 0,
+}
+
+
+def _count(**increments):
+    with _counters_lock:
+        for name, value in increments.items():
+            _counters[name] += value
+
+
+def _is_not_modified(error: ClientError):
+    status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    code = error.response.get("Error", {}).get("Code")
+
+    return status == 304 or code in ("304", "NotModified")
+
+
+def _get_disk_path(key: tuple):
+    name = hashlib.sha256("/".join(key).encode("utf-8")).hexdigest()
+
+    return os.path.join(_disk_dir, name)
+
+
+def _read_disk(key: tuple):
+    if _disk_dir is None:
+        return None
+
+    path = _get_disk_path(key)
+
+    try:
+        with open(f"{path}.json", "r", encoding="utf-8") as file:
+            entry = json.load(file)
+        with open(f"{path}.body", "rb") as file:
+            entry["body"] = file.read()
+    except (OSError, ValueError):
+        return None
+
+    # Entries on disk must be revalidated before use
+    entry["checked_at"] = 0
+
+    return entry
+
+
+def _write_disk(key: tuple, entry: dict):
+    if _disk_dir is None:
+        return
+
+    path = _get_disk_path(key)
+    meta = {name: value for name, value in entry.items() if name != "body"}
+
+    try:
+        with _disk_lock:
+            os.makedirs(_disk_dir, exist_ok=True)
+
+            # Write to temporary files then rename, readers never see
+            # a partially written entry
+            for suffix, mode, content in (
+                (".body", "wb", entry["body"]),
+                (".json", "w", json.dumps(meta)),
+            ):
+                with open(f"{path}{suffix}.tmp", mode) as file:
+                    file.write(content)
+                os.replace(f"{path}{suffix}.tmp", f"{path}{suffix}")
+
+            _evict_disk()
+    except OSError as error:
+        logger.warning(f"Cannot write cache of {key} to disk: {error}")
+
+
+def _evict_disk():
+    files = []
+    total = 0
+
+    for file in os.scandir(_disk_dir):
+        if file.name.endswith(".body"):
+            stat = file.stat()
+            files.append((stat.st_mtime, stat.st_size, file.path[: -len(".body")]))
+            total += stat.st_size
+
+    # Oldest entries are removed first
+    for _, size, path in sorted(files):
+        if total <= S3_CACHE_DISK_MAX_BYTES:
+            break
+
+        _remove_disk_files(path)
+        total -= size
+
+
+def _remove_disk_files(path: str):
+    for suffix in (".json", ".body"):
+        try:
+            os.remove(f"{path}{suffix}")
+        except FileNotFoundError:
+            pass
+
+
+def _remove_disk(key: tuple):
+    if _disk_dir is None:
+        return
+
+    with _disk_lock:
+        _remove_disk_files(_get_disk_path(key))
+
+
+def _store(key: tuple, entry: dict):
+    _memory.set(key, entry)
+    _write_disk(key, entry)
+
+
+def _to_response(entry: dict, from_cache: bool):
+    return {
+        "Body": io.BytesIO(entry["body"]),
+        "ETag": entry["etag"],
+        "ContentType": entry.get("content_type"),
+        "ContentLength": len(entry["body"]),
+        "Metadata": entry.get("metadata", {}),
+        "FromCache": from_cache,
+    }
+
+
+def get_file(**params: dict):
+    """Get an object from S3 through the cache. A cached object is returned
+    when S3 answers 304 to If-None-Match (or it was checked less than
+    S3_CACHE_FRESH_SECONDS ago), otherwise it is downloaded and cached.
+    Objects bigger than S3_CACHE_MAX_OBJECT_BYTES are streamed as is.
+
+    Args:
+        **params (dict): Dictionary of parameters. Expected keys:
+            - bucket_name (str): Name of the S3 bucket. Required.
+            - object_key (str): Key of the object in the bucket. Required.
+            - client (boto3.Client, optional): S3 client instance. Defaults to the shared client from get_s3_client("latency").
+
+    Returns:
+        dict: Body (file-like), ETag, ContentType, ContentLength, Metadata and
+            FromCache (True if content wasn't downloaded).
+    """
+    s3_client = resolve_client(params, lambda: get_s3_client("latency"))
+
+    bucket_name = params.get("bucket_name", "")
+    object_key = params.get("object_key", "")
+
+    check_empty_or_throw_error(
+        bucket_name, "bucket_name", "Bucket name is required to get file"
+    )
+    check_empty_or_throw_error(
+        object_key, "object_key", "Object key is required to get file"
+    )
+
+    key = (bucket_name, object_key)
+    entry = _memory.get(key)
+    from_disk = False
+
+    if entry is None:
+        entry = _read_disk(key)
+        from_disk = entry is not None
+
+    get_args = {"Bucket": bucket_name, "Key": object_key}
+
+    if entry is not None:
+        if time.monotonic() - entry["checked_at"] < S3_CACHE_FRESH_SECONDS:
+            _count(hits=1, bytes_from_cache=len(entry["body"]))
+            return _to_response(entry, True)
+
+        get_args["IfNoneMatch"] = entry["etag"]
+
+    try:
+        response = s3_client.get_object(**get_args)
+    except ClientError as error:
+        if entry is None or not _is_not_modified(error):
+            raise
+
+        entry["checked_at"] = time.monotonic()
+        _count(
+            hits=1,
+            disk_hits=int(from_disk),
+            revalidations=1,
+            bytes_from_cache=len(entry["body"]),
+        )
+
+        if from_disk:
+            _memory.set(key, entry)
+
+        return _to_response(entry, True)
+
+    _count(misses=1)
+
+    if response.get("ContentLength", 0) > S3_CACHE_MAX_OBJECT_BYTES:
+        # The object outgrew the cache, drop its stale entry
+        if entry is not None:
+            _memory.pop(key)
+            _remove_disk(key)
+
+        return {**response, "FromCache": False}
+
+    body = response["Body"].read()
+    _count(bytes_downloaded=len(body))
+
+    entry = {
+        "body": body,
+        "etag": response.get("ETag"),
+        "content_type": response.get("ContentType"),
+        "metadata": response.get("Metadata", {}),
+        "checked_at": time.monotonic(),
+    }
+    _store(key, entry)
+
+    return _to_response(entry, False)
+
+
+def get_file_content(**params: dict):
+    """Get content of an object in S3 through the cache.
+
+    Args:
+        **params (dict): Same parameters as get_file.
+
+    Returns:
+        bytes: content of the object.
+    """
+    return get_file(**params)["Body"].read()
+
+
+def invalidate(bucket_name: str, object_key: str):
+    """Drop cached content of an object (call it after the object is
+    written or deleted).
+
+    Args:
+        bucket_name (str): Name of the S3 bucket.
+        object_key (str): Key of the object in the bucket.
+    """
+    key = (bucket_name, object_key)
+    _memory.pop(key)
+    _remove_disk(key)
+    _count(invalidations=1)
+
+
+def move(
+    bucket_name: str,
+    source_key: str,
+    dest_bucket_name: str,
+    dest_key: str,
+    etag: str | None = None,
+):
+    """Move cached content of a moved object to its new key, so reading it
+    right after the move doesn't download it again.
+
+    Args:
+        bucket_name (str): Name of the source S3 bucket.
+        source_key (str): Key of the source object.
+        dest_bucket_name (str): Name of the destination S3 bucket.
+        dest_key (str): Key of the destination object.
+        etag (str, optional): ETag of the destination object. Without it the
+            entry is only invalidated.
+    """
+    source = (bucket_name, source_key)
+    entry = _memory.pop(source)
+
+    if entry is None:
+        entry = _read_disk(source)
+
+    invalidate(bucket_name, source_key)
+    invalidate(dest_bucket_name, dest_key)
+
+    if entry is None or not etag:
+        return
+
+    # The destination is revalidated (with its own ETag) on next read
+    _store((dest_bucket_name, dest_key), {**entry, "etag": etag, "checked_at": 0})
+
+
+def clear():
+    """Drop every cached entry (memory and disk)"""
+    _memory.clear()
+
+    if _disk_dir is None or not os.path.isdir(_disk_dir):
+        return
+
+    with _disk_lock:
+        for file in os.scandir(_disk_dir):
+            os.remove(file.path)
+
+
+def get_stats():
+    """Get counters of the cache
+
+    Returns:
+        dict: hits, disk_hits, revalidations, misses, bytes_from_cache,
+            bytes_downloaded, invalidations and state of memory tier.
+    """
+    with _counters_lock:
+        stats = dict(_counters)
+
+    memory = _memory.stats()
+    stats.update(
+        memory_entries=memory["entries"],
+        memory_bytes=memory["weight"],
+        memory_max_bytes=memory["max_weight"],
+        memory_evictions=memory["evictions"],
+        disk_enabled=_disk_dir is not None,
+    )
+
+    return stats
@@ -0,0 +1,157 @@
+import bisect
+import logging
+import threading
+import time
+
+# Import helpers
+from utils import s3
+from utils.constants import S3_INDEX_MAX_AGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class PrefixIndex:
+    """In-process index of object names by state, for buckets laid out as
+    `<state prefix><name><suffix>` (e.g. `approved/orders.yaml`).
+
+    The first read of a state lists its prefix once. After that:
+        - objects written, moved or deleted by utils.s3 in this process are
+          applied directly
+        - objects written, moved or deleted by other processes are only seen
+          once the prefix is listed again in full, every
+          S3_INDEX_MAX_AGE_SECONDS (listing only keys after the last known
+          one would miss new names sorting before it)
+
+    Args:
+        bucket_name (str): name of the S3 bucket
+        prefixes (dict): state -> prefix of its objects, e.g. {"approved": "approved/"}
+        suffix (str, optional): suffix (extension) of objects. Defaults to "".
+        client (boto3.Client, optional): S3 client instance. Defaults to the shared client.
+    """
+
+    def __init__(self, bucket_name: str, prefixes: dict, suffix: str = "", client=None):
+        self.bucket_name = bucket_name
+        self.prefixes = dict(prefixes)
+        self.suffix = suffix
+        self._client = client
+        self._lock = threading.RLock()
+        self._names = {state: [] for state in self.prefixes}
+        self._loaded_at = {state: None for state in self.prefixes}
+
+        s3.add_object_listener(self._on_object_event)
+
+    def names(self, state: str, start_after: str = "", limit: int | None = None):
+        """Get sorted names of a state
+
+        Args:
+            state (str): state of objects
+            start_after (str, optional): only names after this one. Defaults to "".
+            limit (int, optional): maximum number of names. Defaults to all.
+
+        Returns:
+            list[str]: sorted names
+        """
+        self._ensure_fresh(state)
+
+        with self._lock:
+            names = self._names[state]
+            start = bisect.bisect_right(names, start_after) if start_after else 0
+            end = len(names) if limit is None else start + limit
+
+            return names[start:end]
+
+    def count(self, state: str):
+        self._ensure_fresh(state)
+
+        with self._lock:
+            return len(self._names[state])
+
+    def refresh(self, state: str):
+        """List the whole prefix of a state again
+
+        Args:
+            state (str): state of objects
+        """
+        self._check_state(state)
+        prefix = self.prefixes[state]
+        found = []
+
+        for file in s3.iter_files(
+            client=self._client, bucket_name=self.bucket_name, prefix=prefix
+        ):
+            name = self._get_name(state, file["Key"])
+
+            if name is not None:
+                found.append(name)
+
+        with self._lock:
+            self._names[state] = sorted(set(found))
+            self._loaded_at[state] = time.monotonic()
+
+        logger.debug(
+            f"Refreshed index of {self.bucket_name}/{prefix} ({len(found)} keys)"
+        )
+
+    def _ensure_fresh(self, state: str):
+        self._check_state(state)
+
+        with self._lock:
+            loaded_at = self._loaded_at[state]
+
+        if (
+            loaded_at is None
+            or time.monotonic() - loaded_at >= S3_INDEX_MAX_AGE_SECONDS
+        ):
+            self.refresh(state)
+
+    def _check_state(self, state: str):
+        if state not in self.prefixes:
+            raise KeyError(f"Unknown state of index: {state}")
+
+    def _get_name(self, state: str, object_key: str):
+        prefix = self.prefixes[state]
+
+        if not object_key.startswith(prefix) or not object_key.endswith(self.suffix):
+            return None
+
+        name = object_key[len(prefix) : len(object_key) - len(self.suffix)]
+
+        # Objects in sub-folders don't belong to the state
+        if not name or "/" in name:
+            return None
+
+        return name
+
+    def _insert(self, state: str, name: str):
+        names = self._names[state]
+        i = bisect.bisect_left(names, name)
+
+        if i == len(names) or names[i] != name:
+            names.insert(i, name)
+
+    def _remove(self, state: str, name: str):
+        names = self._names[state]
+        i = bisect.bisect_left(names, name)
+
+        if i < len(names) and names[i] == name:
+            del names[i]
+
+    def _on_object_event(self, event: str, bucket_name: str, object_key: str):
+        if bucket_name != self.bucket_name:
+            return
+
+        with self._lock:
+            for state in self.prefixes:
+                # States which aren't loaded yet are listed in full on first read
+                if self._loaded_at[state] is None:
+                    continue
+
+                name = self._get_name(state, object_key)
+
+                if name is None:
+                    continue
+
+                if event == "put":
+                    self._insert(state, name)
+                elif event == "delete":
+                    self._remove(state, name)
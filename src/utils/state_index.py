@@ -0,0 +1,256 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Import utils
+import utils.exceptions as Exps
+from utils.dynamodb import (
+    EnumComparisonOperator,
+    parallel_scan,
+    query_items_page,
+    query_item,
+    update_item,
+)
+from utils.helpers.boolean import check_empty_or_throw_error
+
+logger = logging.getLogger(__name__)
+
+# Composite attributes of the sparse GSIs of mapping tables (data contracts
+# and rulesets). Items without team (or owner) aren't in the matching index.
+TEAM_STATE_ATTRIBUTE = "team_state"
+OWNER_STATE_ATTRIBUTE = "owner_state"
+CREATED_AT_ATTRIBUTE = "created_at"
+ORDERS = ("asc", "desc")
+
+
+def build_state_index_attributes(team: str | None, owner: str | None, state: str):
+    """Build composite attributes of an item in a state
+
+    Args:
+        team (str | None): team of item
+        owner (str | None): owner of item
+        state (str): state of item
+
+    Returns:
+        dict: team_state and owner_state (only those with a value)
+    """
+    attributes = {}
+
+    if team:
+        attributes[TEAM_STATE_ATTRIBUTE] = f"{team}#{state}"
+
+    if owner:
+        attributes[OWNER_STATE_ATTRIBUTE] = f"{owner}#{state}"
+
+    return attributes
+
+
+def get_state_index_attributes(table_name: str, name: str, version: str, *states):
+    """Get composite attributes of an existing item in each of `states`
+    (e.g. its new state and the one restored if the change is rolled back).
+    Team and owner never change after upload, so the item is read once,
+    through the read cache of utils.dynamodb.
+
+    Args:
+        table_name (str): name of mapping table
+        name (str): name of item (partition key)
+        version (str): version of item (sort key)
+        *states (str): states of item
+
+    Returns:
+        list[dict]: team_state and owner_state of each state, in order
+    """
+    item = query_item(
+        table_name=table_name,
+        partition_query={"key": "name", "value": name},
+        sort_query={"key": "version", "value": version},
+        fields=["team", "owner"],
+    )
+
+    return [
+        build_state_index_attributes(item.get("team"), item.get("owner"), state)
+        for state in states
+    ]
+
+
+def query_by_state(**params):
+    """Query one page of items in a state, through the narrowest index:
+    `owner#state` if owner is set, else `team#state` if team is set, else
+    the state index. All of them are sorted by created_at. Owner and team
+    can't be set together.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of mapping table. This is required.
+            - state (str): State of items. This is required.
+            - state_index_name (str): Name of the state GSI. This is required.
+            - team (str, optional): Only items of this team.
+            - team_index_name (str, optional): Name of the team#state GSI, required with team.
+            - owner (str, optional): Only items of this owner.
+            - owner_index_name (str, optional): Name of the owner#state GSI, required with owner.
+            - since (str, optional): Only items created at or after this ISO timestamp.
+            - order (str, optional): "asc" (oldest first) or "desc" (newest first). Defaults to "asc".
+            - cursor (str, optional): Cursor of a previous page.
+            - max_items (int, optional): Maximum number of items of the page.
+            - fields (list[str], optional): Names of attributes to return.
+
+    Returns:
+        dict: items and cursor (None when there is nothing left)
+    """
+    table_name = params.get("table_name", "")
+    state = params.get("state", "")
+    team = params.get("team", "")
+    owner = params.get("owner", "")
+    since = params.get("since", "")
+    order = params.get("order", "") or "asc"
+
+    check_empty_or_throw_error(table_name, "table_name")
+    check_empty_or_throw_error(state, "state", "State is required to list items")
+
+    if order not in ORDERS:
+        raise Exps.BadRequestException(f"Order must be one of {', '.join(ORDERS)}")
+
+    # Each index is keyed by one of them, the other one can't be applied
+    if owner and team:
+        raise Exps.BadRequestException("Filter by either team or owner, not both")
+
+    if owner:
+        index_name = params.get("owner_index_name", "")
+        partition_query = {"key": OWNER_STATE_ATTRIBUTE, "value": f"{owner}#{state}"}
+    elif team:
+        index_name = params.get("team_index_name", "")
+        partition_query = {"key": TEAM_STATE_ATTRIBUTE, "value": f"{team}#{state}"}
+    else:
+        index_name = params.get("state_index_name", "")
+        partition_query = {"key": "state", "value": state}
+
+    check_empty_or_throw_error(
+        index_name, "index_name", "Index of this filter is not configured"
+    )
+
+    sort_query = None
+
+    if since:
+        sort_query = {
+            "key": CREATED_AT_ATTRIBUTE,
+            "value": since,
+            "op": EnumComparisonOperator.GreatThanOrEqual,
+        }
+
+    return query_items_page(
+        table_name=table_name,
+        index_name=index_name,
+        partition_query=partition_query,
+        sort_query=sort_query,
+        scan_forward=order == "asc",
+        cursor=params.get("cursor", None),
+        max_items=params.get("max_items", None),
+        fields=params.get("fields", None),
+    )
+
+
+def backfill_state_index(**params):
+    """Set missing or stale team_state / owner_state of every item of a
+    mapping table (parallel scan, rate limited in RCUs). Items are updated
+    without bumping their revision, clients holding one aren't affected.
+    An item is only updated if it still exists in its scanned state, items
+    changed (or deleted) since the scan are skipped.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of mapping table. This is required.
+            - total_segments (int, optional): Segments of the scan. Defaults to DYNAMODB_SCAN_SEGMENTS.
+            - max_rcu (float, optional): Maximum consumed RCUs per second. Defaults to DYNAMODB_SCAN_MAX_RCU.
+            - concurrency (int, optional): Number of updates running at the same time. Defaults to 4.
+            - dry_run (bool, optional): Only count items to update. Defaults to False.
+
+    Returns:
+        dict: scanned, updated (or to update when dry_run), skipped and failed counts
+    """
+    table_name = params.get("table_name", "")
+    concurrency = params.get("concurrency", 4)
+    dry_run = params.get("dry_run", False)
+
+    check_empty_or_throw_error(
+        table_name, "table_name", "Table name is required to back-fill index"
+    )
+
+    scan_params = {
+        "table_name": table_name,
+        "fields": [
+            "name",
+            "version",
+            "state",
+            "team",
+            "owner",
+            TEAM_STATE_ATTRIBUTE,
+            OWNER_STATE_ATTRIBUTE,
+        ],
+    }
+
+    for name in ("total_segments", "max_rcu"):
+        if params.get(name) is not None:
+            scan_params[name] = params.get(name)
+
+    stats = {"scanned": 0, "updated": 0, "skipped": 0, "failed": 0}
+    # Pending updates above it are drained before the scan goes on
+    max_pending = concurrency * 4
+
+    def update(item: dict, attributes: dict):
+        try:
+            update_item(
+                table_name=table_name,
+                partition_query={"key": "name", "value": item.get("name")},
+                sort_query={"key": "version", "value": item.get("version")},
+                data=attributes,
+                expected={"state": item.get("state")},
+                revision_attribute=None,
+            )
+            return "updated"
+        except Exps.ConflictException:
+            # Changed (its new state sets its attributes) or deleted since
+            return "skipped"
+        except Exception as error:
+            logger.warning(
+                f"Cannot back-fill {item.get('name')} {item.get('version')}: {error}"
+            )
+            return "failed"
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = set()
+
+        for item in parallel_scan(**scan_params):
+            stats["scanned"] += 1
+
+            if not item.get("state"):
+                continue
+
+            expected = build_state_index_attributes(
+                item.get("team"), item.get("owner"), item.get("state")
+            )
+            attributes = {
+                name: value
+                for name, value in expected.items()
+                if item.get(name) != value
+            }
+
+            if not attributes:
+                continue
+
+            if dry_run:
+                stats["updated"] += 1
+                continue
+
+            futures.add(executor.submit(update, item, attributes))
+
+            if len(futures) > max_pending:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    stats[future.result()] += 1
+
+        for future in futures:
+            stats[future.result()] += 1
+
+    logger.info(f"Back-filled state index of {table_name}: {stats}")
+
+    return stats
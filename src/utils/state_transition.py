@@ -0,0 +1,202 @@
+# Recovery of state transitions of data contracts and rulesets. The new
+# states are committed (DynamoDB) before objects are moved between state
+# prefixes (S3): failed moves are retried, then the states are restored by
+# a compensating transaction so the transition can be run again.
+
+# Import built-in libraries
+import logging
+
+# Import from utils
+import utils.exceptions as Exps
+from utils.aio import run_blocking
+from utils.dynamodb_async import transact_write_items
+from utils.s3_async import move_files
+from utils.state_index import get_state_index_attributes
+
+logger = logging.getLogger(__name__)
+
+# Retries of moves which failed after the new states are committed
+MOVE_MAX_RETRIES = 2
+
+
+async def move_with_retry(bucket_name: str, moves: list):
+    """Move objects, failed moves are retried (a move can be repeated: the
+    object is copied again, then its source deleted)
+
+    Args:
+        bucket_name (str): name of bucket
+        moves (list[dict]): source_key and dest_key of each object
+
+    Returns:
+        tuple: moves done and results of moves still failing
+    """
+    done = []
+    pending = moves
+    failed = []
+
+    for attempt in range(MOVE_MAX_RETRIES + 1):
+        if attempt > 0:
+            logger.warning(f"Retry {len(pending)} moves in {bucket_name} ({attempt})")
+
+        results = await move_files(bucket_name=bucket_name, moves=pending)
+        failed = [result for result in results if result["status"] != "moved"]
+        done += [
+            move
+            for move, result in zip(pending, results)
+            if result["status"] == "moved"
+        ]
+
+        if not failed:
+            return done, []
+
+        pending = [
+            {"source_key": result["source_key"], "dest_key": result["dest_key"]}
+            for result in failed
+        ]
+
+    return done, failed
+
+
+async def roll_back(bucket_name: str, operations: list, done_moves: list):
+    """Restore states committed by a transition whose objects can't be
+    moved, then move back objects already moved. The transaction only
+    commits if the items are still in the states set by the transition.
+
+    Args:
+        bucket_name (str): name of bucket
+        operations (list[dict]): operations of the compensating transaction
+        done_moves (list[dict]): moves to revert
+
+    Returns:
+        bool: True if the states are restored
+    """
+    try:
+        await transact_write_items(operations=operations)
+    except Exception:
+        logger.exception("Cannot roll back states of items")
+        return False
+
+    if done_moves:
+        results = await move_files(
+            bucket_name=bucket_name,
+            moves=[
+                {"source_key": move["dest_key"], "dest_key": move["source_key"]}
+                for move in done_moves
+            ],
+        )
+
+        for result in results:
+            if result["status"] != "moved":
+                logger.error(
+                    f"Cannot move back {result['source_key']}: {result['error']}"
+                )
+
+    return True
+
+
+async def move_or_roll_back(bucket_name: str, moves: list, rollback_operations: list):
+    """Move objects of a committed transition (with retries). If a move
+    still fails, the transition is rolled back and InternalException raised.
+
+    Args:
+        bucket_name (str): name of bucket
+        moves (list[dict]): source_key and dest_key of each object
+        rollback_operations (list[dict]): operations restoring the states
+
+    Returns:
+        list: moves done
+    """
+    done_moves, failed_moves = await move_with_retry(bucket_name, moves)
+
+    if not failed_moves:
+        return done_moves
+
+    rolled_back = await roll_back(bucket_name, rollback_operations, done_moves)
+    outcome = (
+        "the transition is rolled back"
+        if rolled_back
+        else "states of items can't be rolled back"
+    )
+
+    raise Exps.InternalException(
+        f"Cannot move {failed_moves[0]['source_key']}: "
+        f"{failed_moves[0]['error']}, {outcome}"
+    )
+
+
+async def transition_item(**params):
+    """Change the state of a mapping item and move its object to the prefix
+    of the new state. The item is only updated if it is still in the old
+    state (and at the revision of the client, if given), a concurrent change
+    gets ConflictException (HTTP 409) and nothing is moved. If the object
+    can't be moved, the item is set back to the old state.
+
+    Args:
+        **params: Dictionary of parameters:
+            - table_name (str): Name of mapping table. This is required.
+            - bucket_name (str): Name of bucket of objects. This is required.
+            - name (str): Name of item (partition key). This is required.
+            - version (str): Version of item (sort key). This is required.
+            - old_state (str): Current state of item. This is required.
+            - new_state (str): New state of item. This is required.
+            - ext (str): Extension of object, its key is `<state>/<name>.<ext>`. This is required.
+            - revision (int, optional): Revision read by the client. Defaults to no check.
+
+    Returns:
+        dict: name, version, new state (and new revision, if given) of item
+    """
+    table_name = params.get("table_name")
+    name = params.get("name")
+    version = params.get("version")
+    old_state = params.get("old_state")
+    new_state = params.get("new_state")
+    ext = params.get("ext")
+    revision = params.get("revision", None)
+
+    index_attributes, old_index_attributes = await run_blocking(
+        get_state_index_attributes, table_name, name, version, new_state, old_state
+    )
+    partition_query = {"key": "name", "value": name}
+    sort_query = {"key": "version", "value": version}
+
+    await transact_write_items(
+        operations=[
+            {
+                "action": "update",
+                "table_name": table_name,
+                "partition_query": partition_query,
+                "sort_query": sort_query,
+                "data": {"state": new_state, **index_attributes},
+                "expected": {"state": old_state},
+                "expected_revision": revision,
+            }
+        ]
+    )
+    updated_item = {"name": name, "version": version, "state": new_state}
+
+    if revision is not None:
+        updated_item["revision"] = revision + 1
+
+    # The rollback expects the revision written above
+    await move_or_roll_back(
+        params.get("bucket_name"),
+        [
+            {
+                "source_key": f"{old_state}/{name}.{ext}",
+                "dest_key": f"{new_state}/{name}.{ext}",
+            }
+        ],
+        [
+            {
+                "action": "update",
+                "table_name": table_name,
+                "partition_query": partition_query,
+                "sort_query": sort_query,
+                "data": {"state": old_state, **old_index_attributes},
+                "expected": {"state": new_state},
+                "expected_revision": updated_item.get("revision"),
+            }
+        ],
+    )
+
+    return updated_item
@@ -0,0 +1,96 @@
+import sys
+import os
+import timeit
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+sys.path.insert(1, os.path.join(BASE_DIR, "venv"))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+
+from utils import dynamodb
+from utils.dynamodb import Condition, EnumComparisonOperator, build_expression
+
+# Per-call overhead of building query and update parameters. No request is
+# sent to AWS.
+#   - query: key conditions built from Condition objects, as query_items did
+#     before QuerySpec (boto3 turns them into strings on every request),
+#     against the QuerySpec of the shape
+#   - update: build_update_expressions compiling the expression on every call
+#     (its cache bypassed), against the compiled expression of the shape
+
+NUMBER = 20000
+PARTITION_QUERY = {"key": "state", "value": "approved"}
+SORT_QUERY = {"key": "name", "value": "orders", "op": "begins_with"}
+UPDATE_DATA = {"state": "approved", "job_name": "orders-job", "owner": "alice"}
+
+
+def build_query_before():
+    key_condition_exp = None
+
+    for query in (PARTITION_QUERY, SORT_QUERY):
+        op = query.get("op") or EnumComparisonOperator.Equal
+
+        if not EnumComparisonOperator.validate(op):
+            raise AssertionError(f"Invalid comparison expression {op}")
+
+        condition = build_expression(
+            Condition(key=query["key"], value=query["value"], operator=op),
+            use_key=True,
+        )
+        key_condition_exp = (
+            condition if key_condition_exp is None else key_condition_exp & condition
+        )
+
+    return ConditionExpressionBuilder().build_expression(
+        key_condition_exp, is_key_condition=True
+    )
+
+
+def build_query_after():
+    return dynamodb._bind_query(
+        {
+            "table_name": "datacontract-mapping",
+            "index_name": "state-index",
+            "partition_query": PARTITION_QUERY,
+            "sort_query": SORT_QUERY,
+        }
+    )
+
+
+def build_update():
+    return dynamodb.build_update_expressions(UPDATE_DATA)
+
+
+def measure(name, func):
+    seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+    microseconds = seconds / NUMBER * 1e6
+    print(f"{name:<24} {microseconds:8.2f} µs/call")
+
+    return microseconds
+
+
+def main():
+    query_before = measure("query (before)", build_query_before)
+    query_after = measure("query (after)", build_query_after)
+
+    # Without its cache, the update expression is compiled on every call
+    compile_update_expression = dynamodb._compile_update_expression
+    dynamodb._compile_update_expression = compile_update_expression.__wrapped__
+    try:
+        update_before = measure("update (before)", build_update)
+    finally:
+        dynamodb._compile_update_expression = compile_update_expression
+
+    update_after = measure("update (after)", build_update)
+
+    print(f"query speed-up:  x{query_before / query_after:.1f}")
+    print(f"update speed-up: x{update_before / update_after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import asyncio
+import gc
+import importlib
+import sys
+import os
+import warnings
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+sys.path.insert(1, os.path.join(BASE_DIR, "venv"))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import utils.exceptions as Exps
+import utils.state_transition as state_transition
+
+# The package exports the function under the name of its module
+reject_module = importlib.import_module("services.data_contract.reject_datacontract")
+
+PARAMS = {
+    "path_params": {"datacontract_name": "check"},
+    "body": {"version": "1.0.0", "revision": 3},
+}
+
+
+def patch_module(conflict: bool, move_fails: bool = False):
+    """Replace the DynamoDB and S3 calls of utils.state_transition (used by
+    reject_datacontract) with fakes recording their calls"""
+    calls = []
+
+    async def transact_write_items(**params):
+        operation = params["operations"][0]
+        state = operation["data"]["state"]
+
+        if state == "pending":
+            # Rollback of the rejection, at the revision it wrote
+            assert operation["expected_revision"] == 4, operation
+            calls.append("rollback pending")
+            return
+
+        calls.append(f"update {state}")
+        if conflict:
+            raise Exps.RevisionConflictException()
+
+    async def move_files(**params):
+        calls.append("move")
+        return [
+            {
+                **move,
+                "status": "failed" if move_fails else "moved",
+                "error": "copy failed" if move_fails else None,
+            }
+            for move in params["moves"]
+        ]
+
+    async def run_blocking(func, table_name, name, version, *states):
+        # Team and owner are read once for the new and the old state
+        calls.append("read")
+        return [{} for _ in states]
+
+    state_transition.transact_write_items = transact_write_items
+    state_transition.move_files = move_files
+    state_transition.run_blocking = run_blocking
+
+    return calls
+
+
+async def main():
+    # A revision which isn't a non-negative integer is a bad request, sent
+    # before anything is updated
+    for revision in ("abc", 1.5, {}, -1):
+        calls = patch_module(conflict=False)
+
+        try:
+            await reject_module.reject_datacontract(
+                {**PARAMS, "body": {**PARAMS["body"], "revision": revision}}
+            )
+            raise AssertionError(f"revision {revision!r} was accepted")
+        except Exps.BadRequestException:
+            pass
+
+        assert calls == [], f"calls on bad revision: {calls}"
+
+    print("OK bad revision")
+
+    # A conflict stops the rejection before the object is moved, without
+    # leaving a coroutine never awaited
+    calls = patch_module(conflict=True)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+
+        try:
+            await reject_module.reject_datacontract(PARAMS)
+            raise AssertionError("the conflict wasn't raised")
+        except Exps.RevisionConflictException:
+            pass
+
+        gc.collect()
+
+    assert calls == ["read", "update rejected"], f"calls on conflict: {calls}"
+    assert not [w for w in caught if issubclass(w.category, RuntimeWarning)], [
+        str(w.message) for w in caught
+    ]
+    print("OK conflict")
+
+    # Otherwise the object is moved after the state is updated
+    calls = patch_module(conflict=False)
+    updated_item = await reject_module.reject_datacontract(PARAMS)
+
+    assert calls == ["read", "update rejected", "move"], f"calls: {calls}"
+    assert updated_item["revision"] == 4, updated_item
+    print("OK rejected")
+
+    # A move failing after its retries sets the contract back to pending
+    calls = patch_module(conflict=False, move_fails=True)
+
+    try:
+        await reject_module.reject_datacontract(PARAMS)
+        raise AssertionError("the failed move wasn't raised")
+    except Exps.InternalException:
+        pass
+
+    retries = state_transition.MOVE_MAX_RETRIES
+    expected = [
+        "read",
+        "update rejected",
+        *["move"] * (retries + 1),
+        "rollback pending",
+    ]
+    assert calls == expected, f"calls on failed move: {calls}"
+    print("OK rolled back")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,184 @@
+import sys
+import os
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+sys.path.insert(1, os.path.join(BASE_DIR, "venv"))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Requests are answered by Stubbers, no credentials or network are needed
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "check")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "check")
+os.environ.setdefault("COGNITO_USER_POOL_ID", "ap-southeast-1_check")
+os.environ.setdefault("RULESET_BUCKET_NAME", "check-bucket")
+
+import boto3
+from botocore.stub import Stubber
+
+import utils.s3 as s3
+import utils.glue as glue
+import utils.cognito as cognito
+import utils.ruleset_s3 as ruleset_s3
+from utils.constants import DEFAULT_REGION_NAME
+
+CALLS = int(os.getenv("CALLS", "1000"))
+# Building a client costs tens of ms or more, so the loop resolving the
+# default client on every call is sampled and scaled to CALLS
+EAGER_CALLS = min(CALLS, int(os.getenv("EAGER_CALLS", "20")))
+BUCKET_NAME = "check-bucket"
+OBJECT_KEY = "pending/check.yaml"
+
+
+def create_stubbed_client(service_name: str, operation: str, response: dict):
+    client = boto3.client(service_name, region_name=DEFAULT_REGION_NAME)
+    stubber = Stubber(client)
+    # Answered twice: once with the client passed, once with the default
+    stubber.add_response(operation, response)
+    stubber.add_response(operation, response)
+    stubber.activate()
+
+    return client, stubber
+
+
+def count_default_clients(module, factory_name: str, client):
+    """Replace the default client factory of a helper module with one
+    counting its calls (and returning the stubbed client)"""
+    calls = {"count": 0}
+
+    def counted_factory(*args, **kwargs):
+        calls["count"] += 1
+        return client
+
+    setattr(module, factory_name, counted_factory)
+
+    return calls
+
+
+CASES = [
+    (
+        "utils.s3.get_file_meta",
+        s3,
+        "get_s3_client",
+        ("s3", "head_object", {"ContentLength": 1}),
+        lambda **params: s3.get_file_meta(
+            bucket_name=BUCKET_NAME, object_key=OBJECT_KEY, **params
+        ),
+        "client",
+    ),
+    (
+        "utils.glue.get_job_run",
+        glue,
+        "get_glue_client",
+        ("glue", "get_job_run", {"JobRun": {"Id": "jr_check"}}),
+        lambda **params: glue.get_job_run(
+            job_name="check-job", job_run_id="jr_check", **params
+        ),
+        "client",
+    ),
+    (
+        "utils.cognito.get_user",
+        cognito,
+        "get_cognito_client",
+        ("cognito-idp", "admin_get_user", {"Username": "check"}),
+        lambda **params: cognito.get_user(username="check", **params),
+        "client",
+    ),
+    (
+        "utils.ruleset_s3.list_rulesets",
+        ruleset_s3,
+        "get_s3_client",
+        ("s3", "list_objects_v2", {"Contents": []}),
+        lambda **params: ruleset_s3.list_rulesets("pending", **params),
+        "s3_client",
+    ),
+]
+
+
+def create_default_client():
+    """Default client factory of the helpers before the client registry:
+    a new session and client on every call"""
+    return boto3.Session().client("s3", region_name=DEFAULT_REGION_NAME)
+
+
+def run_loop(client, resolve_default: bool, calls: int):
+    """Call utils.s3.get_file_meta `calls` times with the stubbed client. With
+    resolve_default, the default client is built on every call first, as
+    `params.get("client", get_s3_client())` did.
+
+    Returns:
+        tuple: elapsed seconds and number of default clients built
+    """
+    built = 0
+    start = time.perf_counter()
+
+    for _ in range(calls):
+        params = {"client": client}
+
+        if resolve_default:
+            params = {"client": params.get("client", create_default_client())}
+            built += 1
+
+        s3.get_file_meta(bucket_name=BUCKET_NAME, object_key=OBJECT_KEY, **params)
+
+    return time.perf_counter() - start, built
+
+
+def benchmark():
+    client = boto3.client("s3", region_name=DEFAULT_REGION_NAME)
+    stubber = Stubber(client)
+
+    for _ in range(EAGER_CALLS + CALLS):
+        stubber.add_response(
+            "head_object",
+            {"ContentLength": 1},
+            {"Bucket": BUCKET_NAME, "Key": OBJECT_KEY},
+        )
+
+    stubber.activate()
+    calls = count_default_clients(s3, "get_s3_client", client)
+
+    eager_elapsed, built = run_loop(client, True, EAGER_CALLS)
+    eager_elapsed = eager_elapsed / EAGER_CALLS * CALLS
+    lazy_elapsed, _ = run_loop(client, False, CALLS)
+
+    stubber.assert_no_pending_responses()
+    assert built == EAGER_CALLS, f"{built} default clients built"
+    assert calls["count"] == 0, f"helper resolved {calls['count']} default clients"
+
+    print(f"Calls: {CALLS}")
+    print(
+        f"Default client resolved per call (estimated from {EAGER_CALLS} calls): "
+        f"{eager_elapsed:.3f}s "
+        f"({eager_elapsed / CALLS * 1e6:.1f} us/call)"
+    )
+    print(
+        f"Passed client only: {lazy_elapsed:.3f}s "
+        f"({lazy_elapsed / CALLS * 1e6:.1f} us/call)"
+    )
+
+
+def main():
+    for name, module, factory_name, stub, call, client_key in CASES:
+        client, stubber = create_stubbed_client(*stub)
+        calls = count_default_clients(module, factory_name, client)
+
+        # A client passed by the caller is used as is
+        call(**{client_key: client})
+        assert calls["count"] == 0, f"{name} resolved the default client"
+
+        # Without one, the default client is resolved exactly once
+        call()
+        assert calls["count"] == 1, f"{name} resolved {calls['count']} default clients"
+
+        stubber.assert_no_pending_responses()
+        print(f"OK {name}")
+
+    benchmark()
+
+
+if __name__ == "__main__":
+    main()